@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compare the accuracy and speed of the available text measurers.
+
+Every measurer measures the same corpus of labels (ASCII words, version
+strings and the non-Latin samples used in the golden images). The error of
+each measurer is reported relative to PilMeasurer, which measures text using
+the font itself and was used to generate the precalculated tables.
+
+Throughput is reported cold, with a new measurer for each pass over the
+corpus, and warm, with every label already measured once, because some
+measurers (e.g. HarfBuzzMeasurer) cache the widths of the labels they measure.
+
+For information about the commands, run:
+$ python3 benchmark_measurers.py --help
+"""
+
+import argparse
+import json
+import os.path
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Mapping, Sequence
+
+from pybadges import fonts
+from pybadges import pil_text_measurer
+from pybadges import precalculated_text_measurer
+from pybadges import text_measurer
+from pybadges import width_table
+from pybadges.version import __version__
+
+_WORDS = [
+    'build', 'passing', 'failing', 'coverage', 'license', 'Apache 2.0', 'MIT',
+    'docs', 'python', 'pypi', 'downloads', 'tests', 'status', 'unknown',
+    'commits', 'AVAWAY', 'Typography', 'W3C', 'release', 'nightly', 'stable',
+    'security', 'quality gate', 'maintainability'
+]
+
+_NON_LATIN = [
+    'Всё прекрасно', 'Привет, мир', 'Пример', 'Γειά σου Κόσμε', 'هذا علم',
+    'مرحبا بالعالم', '你好，世界', '测试通过', 'こんにちは', '안녕하세요', 'שלום עולם', 'नमस्ते'
+]
+
+
+def generate_corpus(size: int, seed: int) -> Dict[str, List[str]]:
+    """Generates labels, grouped by category, to measure."""
+    rng = random.Random(seed)
+    test_badges_path = os.path.join(os.path.dirname(__file__), 'tests',
+                                    'test-badges.json')
+    with open(test_badges_path, encoding='utf-8') as f:
+        golden_text = [
+            text for example in json.load(f)
+            for text in (example.get('left_text'), example.get('right_text'))
+            if text
+        ]
+
+    ascii_words = [
+        ' '.join(rng.sample(_WORDS, rng.randint(1, 3))) for _ in range(size)
+    ]
+    versions = [
+        '{0}{1}.{2}.{3}{4}'.format(
+            rng.choice(['', 'v']), rng.randint(0, 20), rng.randint(0, 99),
+            rng.randint(0, 999),
+            rng.choice(['', '', '-rc.{0}'.format(rng.randint(1, 9)), '-dev']))
+        for _ in range(size)
+    ]
+    non_latin = [rng.choice(_NON_LATIN + golden_text) for _ in range(size)]
+    return {
+        'ascii': ascii_words,
+        'versions': versions,
+        'non-latin': non_latin,
+    }
+
+
+def _percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    return sorted_values[min(
+        len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def error_distribution(widths: Sequence[float],
+                       reference: Sequence[float]) -> Mapping[str, float]:
+    """Summarizes the absolute errors, in rendered pixels, of some widths."""
+    errors = sorted(abs(w - r) / fonts.SCALE for w, r in zip(widths, reference))
+    return {
+        'mean': statistics.mean(errors),
+        'p50': _percentile(errors, 0.5),
+        'p90': _percentile(errors, 0.9),
+        'p99': _percentile(errors, 0.99),
+        'max': errors[-1],
+        'exact': sum(1 for e in errors if e == 0) / len(errors),
+    }
+
+
+def throughput(create: Callable[[], text_measurer.TextMeasurer],
+               corpus: Sequence[str], min_seconds: float, warm: bool) -> float:
+    """Returns the number of strings measured per second.
+
+    Some measurers (e.g. HarfBuzzMeasurer) cache the widths of the strings
+    that they have measured. If `warm` is False then every pass over the
+    corpus uses a new measurer, so only repeats within the corpus are cached.
+    If `warm` is True then one measurer measures the corpus once before it is
+    timed, so every string is cached. Creating measurers is not timed.
+    """
+    measurer = create()
+    if warm:
+        for text in corpus:
+            measurer.text_width(text)
+    count = 0
+    elapsed = 0.0
+    while elapsed < min_seconds:
+        if not warm and count:
+            measurer = create()
+        start = time.perf_counter()
+        for text in corpus:
+            measurer.text_width(text)
+        elapsed += time.perf_counter() - start
+        count += len(corpus)
+    return count / elapsed
+
+
+def benchmark(measurers: Mapping[str, Callable[[], text_measurer.TextMeasurer]],
+              reference_name: str, corpus: Mapping[str, Sequence[str]],
+              min_seconds: float) -> dict:
+    """Measures the corpus with every measurer and summarizes the results."""
+    results = {}
+    reference = measurers[reference_name]()
+    reference_widths = {
+        category: [reference.text_width(text) for text in texts]
+        for category, texts in corpus.items()
+    }
+    for name, create in measurers.items():
+        start = time.perf_counter()
+        measurer = create()
+        load_seconds = time.perf_counter() - start
+        categories = {}
+        for category, texts in corpus.items():
+            widths = [measurer.text_width(text) for text in texts]
+            categories[category] = {
+                'error_px':
+                    error_distribution(widths, reference_widths[category]),
+                'cold_strings_per_second':
+                    throughput(create, texts, min_seconds, warm=False),
+                'warm_strings_per_second':
+                    throughput(create, texts, min_seconds, warm=True),
+            }
+        results[name] = {'load_seconds': load_seconds, 'corpus': categories}
+    return results
+
+
+def print_report(results: Mapping[str, dict]) -> None:
+    print('{0:<16} {1:<10} {2:>10} {3:>10} {4:>10} {5:>14} {6:>14}'.format(
+        'measurer', 'corpus', 'mean err', 'p99 err', 'max err', 'cold str/sec',
+        'warm str/sec'))
+    for name, result in results.items():
+        for category, r in result['corpus'].items():
+            print('{0:<16} {1:<10} {2:>10.3f} {3:>10.3f} {4:>10.3f} '
+                  '{5:>14,.0f} {6:>14,.0f}'.format(
+                      name, category, r['error_px']['mean'],
+                      r['error_px']['p99'], r['error_px']['max'],
+                      r['cold_strings_per_second'],
+                      r['warm_strings_per_second']))
+
+
+def write_table_file(json_path: str, table_path: str) -> None:
+    """Converts a JSON width table into a memory-mappable table file."""
+    with open(json_path, encoding='utf-8') as f:
+        o = json.load(f)
+    with open(table_path, 'wb') as f:
+        width_table.write_table(f, o['mean-character-length'],
+                                o['character-lengths'],
+                                width_table.json_kerning(o),
+                                o.get('units-per-pixel'))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='compare the accuracy and speed of text measurers')
+
+    parser.add_argument(
+        '--deja-vu-sans-path',
+        required=True,
+        help='the path to the ttf font file containing DejaVu Sans. If not ' +
+        'present on your system, you can download it from ' +
+        'https://www.fontsquirrel.com/fonts/dejavu-sans')
+    parser.add_argument('--corpus-size',
+                        type=int,
+                        default=1000,
+                        help='the number of labels of each kind to measure')
+    parser.add_argument('--seed',
+                        type=int,
+                        default=0,
+                        help='the seed used to generate the corpus')
+    parser.add_argument(
+        '--min-seconds',
+        type=float,
+        default=0.5,
+        help='the minimum time to spend measuring throughput per corpus')
+    parser.add_argument(
+        '--output-json-file',
+        default=None,
+        help='write the results as JSON to this path (use - for stdout)')
+
+    args = parser.parse_args()
+
+    measurer_class = precalculated_text_measurer.PrecalculatedTextMeasurer
+    measurers = {
+        'pil': lambda: pil_text_measurer.PilMeasurer(args.deja_vu_sans_path),
+        'precalculated': measurer_class.default,
+    }
+
+    temp_dir = tempfile.TemporaryDirectory()
+    table_path = os.path.join(temp_dir.name, 'widths.bin')
+    default_widths_path = os.path.join(os.path.dirname(__file__), 'pybadges',
+                                       'default-widths.json')
+    write_table_file(default_widths_path, table_path)
+    measurers['mapped-table'] = lambda: measurer_class.from_table_file(
+        table_path)
+
+    try:
+        from pybadges import harfbuzz_text_measurer
+    except ImportError:
+        pass
+    else:
+        measurers['harfbuzz'] = lambda: harfbuzz_text_measurer.HarfBuzzMeasurer(
+            args.deja_vu_sans_path)
+
+    corpus = generate_corpus(args.corpus_size, args.seed)
+    results = benchmark(measurers, 'pil', corpus, args.min_seconds)
+    temp_dir.cleanup()
+
+    report = {
+        'pybadges_version': __version__,
+        'python_version': platform.python_version(),
+        'corpus_size': args.corpus_size,
+        'seed': args.seed,
+        'reference': 'pil',
+        'measurers': results,
+    }
+    if args.output_json_file == '-':
+        json.dump(report, sys.stdout, indent=1, sort_keys=True)
+    else:
+        print_report(results)
+        if args.output_json_file:
+            with open(args.output_json_file, 'w') as f:
+                json.dump(report, f, indent=1, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -15,12 +15,11 @@
 # limitations under the License.
 
 import argparse
-import json
 import os
 import os.path
 import pkg_resources
 
-import pybadges
+from tests import golden
 from tests import image_server
 from tests import test_pybadges
 
@@ -30,17 +29,22 @@ def generate_images(source_json_path, target_directory):
     srv.start_server()
     try:
         os.makedirs(target_directory, exist_ok=True)
-        with open(source_json_path) as f:
-            examples = json.load(f)
-
-        for example in examples:
-            srv.fix_embedded_url_reference(example)
-            filename = os.path.join(target_directory, example.pop('file_name'))
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(pybadges.badge(**example))
+        cases = golden.load_cases(source_json_path)
+        for case in cases:
+            srv.fix_embedded_url_reference(case.kwargs)
+        # Rendered in parallel; the comparison with the old images is unused.
+        results = golden.run(cases, target_directory)
     finally:
         srv.stop_server()
 
+    for result in results:
+        if result.svg is None:
+            raise ValueError('could not render {0}: {1}'.format(
+                result.file_name, result.error))
+        filename = os.path.join(target_directory, result.file_name)
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(result.svg)
+
 
 def main():
     parser = argparse.ArgumentParser(
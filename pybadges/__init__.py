@@ -29,47 +29,85 @@ gh-badges library
 '<svg...</svg>'
 """
 
-import base64
-import imghdr
-import mimetypes
-from typing import Optional
-import urllib.parse
+import functools
+import hashlib
+import inspect
+import io
+import os
+from typing import (Any, BinaryIO, Dict, Iterable, NamedTuple, Optional, Tuple,
+                    Union)
 from xml.dom import minidom
 
 import jinja2
-import requests
 
+from pybadges import colors
+from pybadges.badge_spec import BadgeSpec
+from pybadges import embedding
+from pybadges import fonts
+from pybadges import layout
+from pybadges import logos
+from pybadges import profiling
+from pybadges import styles
+from pybadges import text_fitting
 from pybadges import text_measurer
-from pybadges import precalculated_text_measurer
 from pybadges.version import __version__
 
 _JINJA2_ENVIRONMENT = jinja2.Environment(
     trim_blocks=True,
     lstrip_blocks=True,
-    loader=jinja2.PackageLoader('pybadges', '.'),
-    autoescape=jinja2.select_autoescape(['svg']))
-
-# Use the same color scheme as describe in:
-# https://github.com/badges/shields/blob/master/lib/colorscheme.json
-
-_NAME_TO_COLOR = {
-    'brightgreen': '#4c1',
-    'green': '#97CA00',
-    'yellow': '#dfb317',
-    'yellowgreen': '#a4a61d',
-    'orange': '#fe7d37',
-    'red': '#e05d44',
-    'blue': '#007ec6',
-    'grey': '#555',
-    'gray': '#555',
-    'lightgrey': '#9f9f9f',
-    'lightgray': '#9f9f9f',
-    'critical': '#e05d44',
-    'important': '#fe7d37',
-    'success': '#4c1',
-    'informational': '#007ec6',
-    'inactive': '#9f9f9f',
-}
+    loader=jinja2.ChoiceLoader([
+        jinja2.PackageLoader('pybadges', '.'),
+        jinja2.DictLoader(styles._template_sources)
+    ]),
+    autoescape=jinja2.select_autoescape(['svg']),
+    auto_reload=False)
+
+
+def _format_number(number: float) -> str:
+    """Formats a number as briefly as possible for an optimized badge.
+
+    Numbers are rounded to two decimal places, which is far below what can be
+    seen, and redundant zeros are removed e.g. 61.0 => "61", 0.25 => ".25".
+    """
+    s = '{0:.2f}'.format(number).rstrip('0').rstrip('.')
+    if s.startswith('0.'):
+        s = s[1:]
+    elif s.startswith('-0.'):
+        s = '-' + s[2:]
+    return '0' if s == '-0' else s
+
+
+_JINJA2_ENVIRONMENT.filters['num'] = _format_number
+
+# If set, compiled templates are cached in this directory so that new
+# processes don't have to recompile them.
+_TEMPLATE_CACHE_DIR_ENV = 'PYBADGES_TEMPLATE_CACHE_DIR'
+
+
+def set_template_cache_dir(directory: Optional[str]) -> None:
+    """Cache compiled badge templates in the given directory.
+
+    Compiling a template is a significant part of the cost of rendering the
+    first badge in a process. When a cache directory is set, compiled
+    templates are stored there and reused by later processes (e.g. CLI
+    invocations or server workers). The cache directory can also be set using
+    the PYBADGES_TEMPLATE_CACHE_DIR environment variable.
+
+    Args:
+        directory: The directory to store compiled templates in. It is created
+            if it does not exist. If None then compiled templates are not
+            cached.
+    """
+    if directory is None:
+        _JINJA2_ENVIRONMENT.bytecode_cache = None
+    else:
+        os.makedirs(directory, exist_ok=True)
+        _JINJA2_ENVIRONMENT.bytecode_cache = jinja2.FileSystemBytecodeCache(
+            directory)
+
+
+if os.environ.get(_TEMPLATE_CACHE_DIR_ENV):
+    set_template_cache_dir(os.environ[_TEMPLATE_CACHE_DIR_ENV])
 
 
 def _remove_blanks(node):
@@ -82,43 +120,30 @@ def _remove_blanks(node):
 
 
 def _embed_image(url: str) -> str:
-    parsed_url = urllib.parse.urlparse(url)
-
-    if parsed_url.scheme == 'data':
-        return url
-    elif parsed_url.scheme.startswith('http'):
-        r = requests.get(url)
-        r.raise_for_status()
-        content_type = r.headers.get('content-type')
-        if content_type is None:
-            raise ValueError('no "Content-Type" header')
-        content_type, image_type = content_type.split('/')
-        if content_type != 'image':
-            raise ValueError(
-                'expected an image, got "{0}"'.format(content_type))
-        image_data = r.content
-    elif parsed_url.scheme:
-        raise ValueError('unsupported scheme "{0}"'.format(parsed_url.scheme))
-    else:
-        with open(url, 'rb') as f:
-            image_data = f.read()
-        image_type = imghdr.what(None, image_data)
-        if not image_type:
-            mime_type, _ = mimetypes.guess_type(url, strict=False)
-            if not mime_type:
-                raise ValueError('not able to determine file type')
-            else:
-                content_type, image_type = mime_type.split('/')
-                if content_type != 'image':
-                    raise ValueError('expected an image, got "{0}"'.format(
-                        content_type or 'unknown'))
-
-    encoded_image = base64.b64encode(image_data).decode('ascii')
-    return 'data:image/{};base64,{}'.format(image_type, encoded_image)
+    return embedding.default_embedder().embed(url)
+
+
+def _accepts_spec(render):
+    """Lets a function with the arguments of `badge` be given a BadgeSpec.
+
+    When the first argument is a BadgeSpec, the spec is rendered instead of
+    calling the function. Any argument except `measurer` that is given along
+    with the spec, even if it has its default value, raises TypeError.
+    """
+
+    @functools.wraps(render)
+    def wrapper(*args, **kwargs):
+        left_text = args[0] if args else kwargs.get('left_text')
+        if isinstance(left_text, BadgeSpec):
+            return _render(*_spec_from_args(args, kwargs))
+        return render(*args, **kwargs)
+
+    return wrapper
 
 
+@_accepts_spec
 def badge(
-    left_text: str,
+    left_text: Union[str, BadgeSpec],
     right_text: Optional[str] = None,
     left_link: Optional[str] = None,
     right_link: Optional[str] = None,
@@ -139,6 +164,13 @@ def badge(
     embed_right_image: bool = False,
     embed_center_image: bool = False,
     id_suffix: str = '',
+    font: Optional[str] = None,
+    font_size: float = fonts.DEFAULT_FONT_SIZE,
+    max_left_text_width: Optional[float] = None,
+    max_right_text_width: Optional[float] = None,
+    text_overflow: str = 'ellipsis',
+    optimize: bool = False,
+    style: str = styles.DEFAULT_STYLE,
 ) -> str:
     """Creates a github-style badge as an SVG image.
 
@@ -148,9 +180,14 @@ def badge(
     ...       whole_link="http://www.example.com/")
     '<svg...</svg>'
 
+    >>> spec = BadgeSpec(left_text='coverage', right_text='23%')
+    >>> badge(spec)
+    '<svg...</svg>'
+
     Args:
         left_text: The text that should appear on the left-hand-side of the
-            badge e.g. "coverage".
+            badge e.g. "coverage". Can also be a BadgeSpec, in which case no
+            other arguments except `measurer` may be given.
         right_text: The text that should appear on the right-hand-side of the
             badge e.g. "23%".
         left_link: The URL that should be redirected to when the left-hand text
@@ -161,6 +198,8 @@ def badge(
             selected. If set then left_link and right_right may not be set.
         logo: A url representing a logo that will be displayed inside the
             badge. Can be a data URL e.g. "data:image/svg+xml;utf8,<svg..."
+            or the name of a logo registered using the `logos` module e.g.
+            "python", which is always embedded.
         left_color: The color of the part of the badge containing the left-hand
             text. Can be an valid CSS color
             (see https://developer.mozilla.org/en-US/docs/Web/CSS/color) or a
@@ -172,7 +211,8 @@ def badge(
             color name defined here:
             https://github.com/badges/shields/blob/master/badge-maker/lib/color.js
         measurer: A text_measurer.TextMeasurer that can be used to measure the
-            width of left_text and right_text.
+            width of left_text and right_text at `font_size`. If not set then
+            the measurer registered for `font` is used.
         embed_logo: If True then embed the logo image directly in the badge.
             This can prevent an HTTP request and some browsers will not render
             external image referenced. When True, `logo` must be a HTTP/HTTPS
@@ -189,63 +229,359 @@ def badge(
         id_suffix: The suffix of the id attributes used in the SVG's elements.
             Use to prevent duplicate ids if several badges are embedded on the
             same page.
+        font: The name of the font used to render the text e.g. "Verdana".
+            Must have been registered using `fonts.register_font`. Defaults to
+            DejaVu Sans.
+        font_size: The size of the text, in tenths of a pixel (so the default
+            of 110 is 11px). The text is measured using the font's table for
+            the closest size, scaled to this size. The height of the badge
+            doesn't change, so text much larger than the default won't fit.
+        max_left_text_width: The maximum width, in pixels, of the left-hand
+            text. Wider text is made to fit according to `text_overflow`.
+        max_right_text_width: The maximum width, in pixels, of the right-hand
+            text. Wider text is made to fit according to `text_overflow`.
+        text_overflow: How text wider than its maximum width is made to fit.
+            Either "ellipsis", to truncate the text and append an ellipsis, or
+            "shrink", to reduce the font size of the text.
+        optimize: If True then produce a smaller SVG that renders identically,
+            by rounding numbers, moving shared attributes onto groups and
+            drawing each text's shadow and foreground from one <text> element.
+            Assumes a renderer that supports <use> (all browsers do).
+        style: The name of the style of the badge e.g. "flat-square" or
+            "for-the-badge". Must have been registered using
+            `styles.register_style`. Defaults to "flat".
     """
-    if measurer is None:
-        measurer = (
-            precalculated_text_measurer.PrecalculatedTextMeasurer.default())
+    spec = BadgeSpec(left_text,
+                     right_text=right_text,
+                     left_link=left_link,
+                     right_link=right_link,
+                     center_link=center_link,
+                     whole_link=whole_link,
+                     logo=logo,
+                     left_color=left_color,
+                     right_color=right_color,
+                     center_color=center_color,
+                     left_title=left_title,
+                     right_title=right_title,
+                     center_title=center_title,
+                     whole_title=whole_title,
+                     right_image=right_image,
+                     center_image=center_image,
+                     embed_logo=embed_logo,
+                     embed_right_image=embed_right_image,
+                     embed_center_image=embed_center_image,
+                     id_suffix=id_suffix,
+                     font=font,
+                     font_size=font_size,
+                     max_left_text_width=max_left_text_width,
+                     max_right_text_width=max_right_text_width,
+                     text_overflow=text_overflow,
+                     optimize=optimize,
+                     style=style)
+    return _render(spec, measurer)
+
+
+_BADGE_SIGNATURE = inspect.signature(badge)
+
+
+def _check_only_spec(names: Iterable[str]) -> None:
+    """Raises TypeError if arguments were given along with a BadgeSpec."""
+    names = sorted(names)
+    if names:
+        raise TypeError(
+            'only measurer may be given with a BadgeSpec, got {0}'.format(
+                ', '.join(names)))
+
+
+def _fit_text(measurer: text_measurer.TextMeasurer, text: str,
+              max_width: Optional[float],
+              text_overflow: str) -> text_fitting.FittedText:
+    if max_width is not None:
+        max_width *= fonts.SCALE
+    return text_fitting.fit(measurer, text, max_width, text_overflow)
+
+
+def _fit_texts(
+    measurer: text_measurer.TextMeasurer, style: styles.Style, left_text: str,
+    right_text: Optional[str], max_left_text_width: Optional[float],
+    max_right_text_width: Optional[float], text_overflow: str
+) -> Tuple[text_fitting.FittedText, Optional[text_fitting.FittedText]]:
+    """Fits the left-hand and right-hand text of a badge in a style."""
+    measurer = style.text_measurer(measurer)
+    if style.uppercase:
+        left_text = left_text.upper()
+        right_text = right_text.upper() if right_text else right_text
+    left = _fit_text(measurer, left_text, max_left_text_width, text_overflow)
+    right = None
+    if right_text:
+        right = _fit_text(measurer, right_text, max_right_text_width,
+                          text_overflow)
+    return left, right
 
-    if (left_link or right_link or center_link) and whole_link:
-        raise ValueError(
-            'whole_link may not bet set with left_link, right_link, or center_link'
-        )
 
-    if center_image and not (right_image or right_text):
-        raise ValueError('cannot have a center_image without a right element')
+def _font_size(spec: BadgeSpec,
+               fitted: Optional[text_fitting.FittedText]) -> Optional[float]:
+    """Returns the font size of text that was shrunk to fit, otherwise None."""
+    if fitted is None or fitted.scale is None:
+        return None
+    return spec.font_size * fitted.scale
 
-    if (center_image and not center_color) or (not center_image and
-                                               center_color):
-        raise ValueError('must have both a center_image and a center_color')
 
-    if logo and embed_logo:
-        logo = _embed_image(logo)
+def _render(spec: BadgeSpec,
+            measurer: Optional[text_measurer.TextMeasurer] = None) -> str:
+    """Renders a validated BadgeSpec as an SVG image."""
+    return _render_element(spec, measurer).toxml()
 
-    if right_image and embed_right_image:
+
+class _Images(NamedTuple):
+    """The images of a badge, embedded if requested."""
+    logo: Optional[str]
+    right_image: Optional[str]
+    center_image: Optional[str]
+
+
+def _embed_images(spec: BadgeSpec) -> _Images:
+    logo = spec.logo
+    if logo:
+        named_logo = logos.get(logo)
+        if named_logo is not None:
+            logo = named_logo
+        elif spec.embed_logo:
+            logo = _embed_image(logo)
+
+    right_image = spec.right_image
+    if right_image and spec.embed_right_image:
         right_image = _embed_image(right_image)
 
-    if center_image and embed_center_image:
+    center_image = spec.center_image
+    if center_image and spec.embed_center_image:
         center_image = _embed_image(center_image)
+    return _Images(logo, right_image, center_image)
 
-    if center_color:
-        center_color = _NAME_TO_COLOR.get(center_color, center_color)
 
-    right_text_width = None
-    if right_text:
-        right_text_width = measurer.text_width(right_text) / 10.0
+def _compute_layout(
+        spec: BadgeSpec, style: styles.Style, images: _Images,
+        left: text_fitting.FittedText,
+        right: Optional[text_fitting.FittedText]) -> layout.BadgeLayout:
+    """Computes the layout of a badge given its fitted text."""
+    return layout.compute(left.width / fonts.SCALE,
+                          right.width / fonts.SCALE if right else None,
+                          has_left_text=bool(spec.left_text),
+                          has_logo=bool(images.logo),
+                          has_center_image=bool(images.center_image),
+                          geometry=style.geometry)
+
 
-    template = _JINJA2_ENVIRONMENT.get_template('badge-template-full.svg')
+@functools.lru_cache(maxsize=None)
+def _template_fingerprint(name: str) -> str:
+    """Returns a digest of the source of a template.
 
-    svg = template.render(
-        left_text=left_text,
+    Like the templates themselves (auto_reload is off), the source is only
+    loaded once.
+    """
+    source, _, _ = _JINJA2_ENVIRONMENT.loader.get_source(
+        _JINJA2_ENVIRONMENT, name)
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+def _render_template(spec: BadgeSpec, style: styles.Style, images: _Images,
+                     badge_layout: layout.BadgeLayout,
+                     left: text_fitting.FittedText, right_text: Optional[str],
+                     right_font_size: Optional[float], right_color: str) -> str:
+    """Renders the template of a badge's style as an SVG image."""
+    # Compiled templates are cached by the environment. Templates can't
+    # change once registered (see styles.register_style) so, with
+    # auto_reload off, each one is only compiled once.
+    template = _JINJA2_ENVIRONMENT.get_template(
+        style.template_name(spec.optimize))
+
+    return template.render(
+        style=style,
+        left_text=left.text,
         right_text=right_text,
-        left_text_width=measurer.text_width(left_text) / 10.0,
-        right_text_width=right_text_width,
-        left_link=left_link,
-        right_link=right_link,
-        whole_link=whole_link,
-        center_link=center_link,
-        logo=logo,
-        left_color=_NAME_TO_COLOR.get(left_color, left_color),
-        right_color=_NAME_TO_COLOR.get(right_color, right_color),
-        center_color=center_color,
-        left_title=left_title,
-        right_title=right_title,
-        center_title=center_title,
-        whole_title=whole_title,
-        right_image=right_image,
-        center_image=center_image,
-        id_suffix=id_suffix,
+        layout=badge_layout,
+        left_font_size=_font_size(spec, left),
+        right_font_size=right_font_size,
+        left_link=spec.left_link,
+        right_link=spec.right_link,
+        whole_link=spec.whole_link,
+        center_link=spec.center_link,
+        logo=images.logo,
+        left_color=spec.left_color,
+        right_color=right_color,
+        center_color=spec.center_color,
+        left_title=spec.left_title,
+        right_title=spec.right_title,
+        center_title=spec.center_title,
+        whole_title=spec.whole_title,
+        right_image=images.right_image,
+        center_image=images.center_image,
+        id_suffix=spec.id_suffix,
+        font_family=fonts.font_family(spec.font),
+        font_size=spec.font_size,
     )
+
+
+def _clean_up(svg: str) -> minidom.Element:
+    """Parses a rendered template and removes insignificant whitespace."""
     xml = minidom.parseString(svg)
     _remove_blanks(xml)
     xml.normalize()
-    return xml.documentElement.toxml()
+    return xml.documentElement
+
+
+def _render_element(
+    spec: BadgeSpec,
+    measurer: Optional[text_measurer.TextMeasurer] = None,
+    timer: Optional['profiling.PhaseTimer'] = None,
+    images: Optional[_Images] = None,
+) -> minidom.Element:
+    """Renders a validated BadgeSpec as the root element of an SVG image.
+
+    If a profiling.PhaseTimer is given then the time spent in each phase of
+    rendering is added to it. If the badge's images are given then they are
+    used instead of embedding the spec's images again.
+    """
+    phase = (timer or profiling.NULL_TIMER).phase
+
+    if measurer is None:
+        with phase(profiling.MEASURER_LOAD):
+            measurer = fonts.measurer(spec.font, spec.font_size)
+
+    if images is None:
+        with phase(profiling.EMBED):
+            images = _embed_images(spec)
+
+    style = styles.get(spec.style)
+    with phase(profiling.MEASURE):
+        left, right = _fit_texts(measurer, style, spec.left_text,
+                                 spec.right_text, spec.max_left_text_width,
+                                 spec.max_right_text_width, spec.text_overflow)
+        badge_layout = _compute_layout(spec, style, images, left, right)
+
+    with phase(profiling.TEMPLATE_RENDER):
+        svg = _render_template(spec, style, images, badge_layout, left,
+                               right.text if right else spec.right_text,
+                               _font_size(spec, right), spec.right_color)
+
+    with phase(profiling.DOM_CLEANUP):
+        return _clean_up(svg)
+
+
+def _spec_from_args(
+    args: Tuple[Any, ...], kwargs: Dict[str, Any]
+) -> Tuple[BadgeSpec, Optional[text_measurer.TextMeasurer]]:
+    """Returns the BadgeSpec and measurer for the arguments of `badge`.
+
+    Raises:
+        TypeError: The arguments are not valid arguments of `badge`.
+    """
+    arguments = _BADGE_SIGNATURE.bind(*args, **kwargs).arguments
+    measurer = arguments.pop('measurer', None)
+    left_text = arguments.pop('left_text')
+    if isinstance(left_text, BadgeSpec):
+        _check_only_spec(arguments)
+        return left_text, measurer
+    return BadgeSpec(left_text, **arguments), measurer
+
+
+def badge_bytes(*args: Any, **kwargs: Any) -> bytes:
+    """Creates a github-style badge as a UTF-8 encoded SVG image.
+
+    Equivalent to `badge(...).encode('utf-8')` but the SVG is encoded while
+    it is serialized, so no intermediate str is created. Useful for servers,
+    which must send bytes.
+
+    >>> badge_bytes(left_text='coverage', right_text='23%', right_color='red')
+    b'<svg...</svg>'
+
+    Args:
+        The same as `badge`.
+    """
+    spec, measurer = _spec_from_args(args, kwargs)
+    return _render_element(spec, measurer).toxml(encoding='utf-8')
+
+
+def write_badge(f: BinaryIO, *args: Any, **kwargs: Any) -> None:
+    """Writes a github-style badge, as a UTF-8 encoded SVG image, to a file.
+
+    The SVG is serialized directly into `f` so, for large numbers of badges,
+    no str or bytes copy of each badge is created.
+
+    >>> import io
+    >>> f = io.BytesIO()
+    >>> write_badge(f, left_text='coverage', right_text='23%')
+    >>> f.getvalue()
+    b'<svg...</svg>'
+
+    Args:
+        f: A writable binary file-like object e.g. io.BytesIO or a file opened
+            in "wb" mode. It is not closed.
+        The remaining arguments are the same as `badge`.
+    """
+    spec, measurer = _spec_from_args(args, kwargs)
+    element = _render_element(spec, measurer)
+    writer = io.TextIOWrapper(f,
+                              encoding='utf-8',
+                              errors='xmlcharrefreplace',
+                              newline='\n')
+    try:
+        element.writexml(writer)
+        writer.flush()
+    finally:
+        writer.detach()
+
+
+def badge_size(*args: Any, **kwargs: Any) -> layout.BadgeLayout:
+    """Calculates the size and geometry of a badge without rendering it.
+
+    Only the text is measured; no template is rendered and no images are
+    fetched, so this is much faster than calling `badge` and can be used to
+    lay out many badges before they are rendered.
+
+    >>> badge_size(left_text='coverage', right_text='23%').width
+    95.5
+
+    Args:
+        The same as `badge`. Arguments that don't affect the size of the
+        badge (e.g. colors and links) are validated and otherwise ignored, so
+        that the same arguments can be passed to both functions.
+
+    Returns:
+        A layout.BadgeLayout containing the width of the badge and the
+        position and width of each of its parts.
+
+    Raises:
+        TypeError: The arguments are not valid arguments of `badge`.
+        ValueError: The arguments don't describe a valid badge e.g. both
+            `whole_link` and `left_link` are set.
+    """
+    spec, measurer = _spec_from_args(args, kwargs)
+    if measurer is None:
+        measurer = fonts.measurer(spec.font, spec.font_size)
+
+    badge_style = styles.get(spec.style)
+    left, right = _fit_texts(measurer, badge_style, spec.left_text,
+                             spec.right_text, spec.max_left_text_width,
+                             spec.max_right_text_width, spec.text_overflow)
+    # Only whether the images are present affects the layout, so they are
+    # not embedded.
+    images = _Images(spec.logo, spec.right_image, spec.center_image)
+    return _compute_layout(spec, badge_style, images, left, right)
+
+
+def warmup() -> None:
+    """Load everything needed to render badges.
+
+    The text width tables and the badge templates are loaded the first time
+    that they are used. Servers can call this function at startup, after
+    registering any styles, so that the first request is no slower than later
+    ones. The full and optimized templates of every registered style are
+    compiled.
+    """
+    fonts.measurer()
+    for name in styles.names():
+        style = styles.get(name)
+        for optimize in (False, True):
+            _JINJA2_ENVIRONMENT.get_template(style.template_name(optimize))
+    badge(left_text='warmup', right_text='warmup')
@@ -24,9 +24,32 @@ import webbrowser
 
 sys.path.append('/home/nick/git/pybadges/')
 import pybadges
+from pybadges import logos
+from pybadges import profiling
+from pybadges import styles
 from pybadges.version import __version__
 
 
+def _load_measurer(args):
+    if args.use_pil_text_measurer:
+        if args.deja_vu_sans_path is None:
+            print('argument --use-pil-text-measurer: must also set ' +
+                  '--deja-vu-sans-path',
+                  file=sys.stderr)
+            sys.exit(1)
+        from pybadges import pil_text_measurer
+        return pil_text_measurer.PilMeasurer(args.deja_vu_sans_path)
+    elif args.use_harfbuzz_text_measurer:
+        if args.deja_vu_sans_path is None:
+            print('argument --use-harfbuzz-text-measurer: must also set ' +
+                  '--deja-vu-sans-path',
+                  file=sys.stderr)
+            sys.exit(1)
+        from pybadges import harfbuzz_text_measurer
+        return harfbuzz_text_measurer.HarfBuzzMeasurer(args.deja_vu_sans_path)
+    return None
+
+
 def main():
     parser = argparse.ArgumentParser(
         'pybadges',
@@ -61,7 +84,13 @@ def main():
     parser.add_argument(
         '--logo',
         default=None,
-        help='a URI reference to a logo to display in the badge')
+        help='a URI reference to a logo to display in the badge or the name '
+        'of a logo in --logo-dir')
+    parser.add_argument(
+        '--logo-dir',
+        default=None,
+        help='a directory of images that --logo can refer to by name e.g. '
+        '--logo=python for python.svg')
     parser.add_argument(
         '--left-color',
         default='#555',
@@ -85,6 +114,13 @@ def main():
         help='use the PilMeasurer to measure the length of text (kerning may '
         'be more precise for non-Western languages. ' +
         '--deja-vu-sans-path must also be set.')
+    parser.add_argument(
+        '--use-harfbuzz-text-measurer',
+        action='store_true',
+        default=False,
+        help='use the HarfBuzzMeasurer to measure the length of text (text '
+        'is shaped so complex and right-to-left scripts are measured more '
+        'accurately). --deja-vu-sans-path must also be set.')
     parser.add_argument(
         '--deja-vu-sans-path',
         default=None,
@@ -151,6 +187,51 @@ def main():
         'the badge (this will prevent a URL fetch and may work around the '
         'fact that some browsers do not fetch external image references); '
         'only works if --logo is a HTTP/HTTPS URI or a file path')
+    parser.add_argument(
+        '--max-left-text-width',
+        type=float,
+        default=None,
+        help='the maximum width, in pixels, of the left-hand text; wider ' +
+        'text is made to fit according to --text-overflow')
+    parser.add_argument(
+        '--max-right-text-width',
+        type=float,
+        default=None,
+        help='the maximum width, in pixels, of the right-hand text; wider ' +
+        'text is made to fit according to --text-overflow')
+    parser.add_argument(
+        '--text-overflow',
+        choices=['ellipsis', 'shrink'],
+        default='ellipsis',
+        help='how text that is wider than its maximum width is made to fit: ' +
+        'truncated with an ellipsis or drawn with a smaller font')
+    parser.add_argument(
+        '--optimize',
+        nargs='?',
+        type=lambda x: x.lower() in ['y', 'yes', 't', 'true', '1', ''],
+        const='yes',
+        default='no',
+        help='produce a smaller SVG image that renders identically')
+    parser.add_argument('--style',
+                        choices=styles.names(),
+                        default=styles.DEFAULT_STYLE,
+                        help='the style of the badge')
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=1,
+        help='render the badge this many times e.g. to measure performance')
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        default=False,
+        help='print the time spent in each phase of rendering the badge ' +
+        '(e.g. text measurement and template rendering) to stderr')
+    parser.add_argument(
+        '--profile-output',
+        default=None,
+        help='with --profile, also write cProfile statistics for the ' +
+        'renders to this file (readable by the pstats module)')
     parser.add_argument(
         '-v',
         '--version',
@@ -165,36 +246,57 @@ def main():
               file=sys.stderr)
         sys.exit(1)
 
-    measurer = None
-    if args.use_pil_text_measurer:
-        if args.deja_vu_sans_path is None:
-            print('argument --use-pil-text-measurer: must also set ' +
-                  '--deja-vu-sans-path',
-                  file=sys.stderr)
-            sys.exit(1)
-        from pybadges import pil_text_measurer
-        measurer = pil_text_measurer.PilMeasurer(args.deja_vu_sans_path)
-
-    badge = pybadges.badge(left_text=args.left_text,
-                           right_text=args.right_text,
-                           left_link=args.left_link,
-                           right_link=args.right_link,
-                           center_link=args.center_link,
-                           whole_link=args.whole_link,
-                           logo=args.logo,
-                           left_color=args.left_color,
-                           right_color=args.right_color,
-                           center_color=args.center_color,
-                           measurer=measurer,
-                           left_title=args.left_title,
-                           right_title=args.right_title,
-                           center_title=args.center_title,
-                           whole_title=args.whole_title,
-                           right_image=args.right_image,
-                           center_image=args.center_image,
-                           embed_logo=args.embed_logo,
-                           embed_right_image=args.embed_right_image,
-                           embed_center_image=args.embed_center_image)
+    if args.repeat < 1:
+        print('argument --repeat: must be at least 1', file=sys.stderr)
+        sys.exit(1)
+
+    if args.profile_output and not args.profile:
+        print('argument --profile-output: can only be set with --profile',
+              file=sys.stderr)
+        sys.exit(1)
+
+    timer = profiling.PhaseTimer() if args.profile else profiling.NULL_TIMER
+    with timer.phase(profiling.MEASURER_LOAD):
+        measurer = _load_measurer(args)
+
+    if args.logo_dir:
+        logos.register_directory(args.logo_dir)
+
+    spec = pybadges.BadgeSpec(left_text=args.left_text,
+                              right_text=args.right_text,
+                              left_link=args.left_link,
+                              right_link=args.right_link,
+                              center_link=args.center_link,
+                              whole_link=args.whole_link,
+                              logo=args.logo,
+                              left_color=args.left_color,
+                              right_color=args.right_color,
+                              center_color=args.center_color,
+                              left_title=args.left_title,
+                              right_title=args.right_title,
+                              center_title=args.center_title,
+                              whole_title=args.whole_title,
+                              right_image=args.right_image,
+                              center_image=args.center_image,
+                              embed_logo=args.embed_logo,
+                              embed_right_image=args.embed_right_image,
+                              embed_center_image=args.embed_center_image,
+                              max_left_text_width=args.max_left_text_width,
+                              max_right_text_width=args.max_right_text_width,
+                              text_overflow=args.text_overflow,
+                              optimize=args.optimize,
+                              style=args.style)
+
+    if args.profile:
+        badge = profiling.render(spec,
+                                 measurer,
+                                 timer,
+                                 repeat=args.repeat,
+                                 profile_path=args.profile_output)
+        print(timer.report(), file=sys.stderr)
+    else:
+        for _ in range(args.repeat):
+            badge = pybadges.badge(spec, measurer=measurer)
 
     if args.browser:
         _, badge_path = tempfile.mkstemp(suffix='.svg')
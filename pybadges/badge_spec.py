@@ -0,0 +1,236 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""An immutable, validated description of a badge.
+
+A BadgeSpec holds every argument of pybadges.badge() except the measurer. It
+is validated once when it is created and is cheaply hashable, so it can be
+used as a key for caches, to deduplicate batches of badges or to generate
+HTTP ETags:
+
+>>> a = BadgeSpec(left_text='build', right_text='passing', right_color='green')
+>>> b = BadgeSpec(left_text='build', right_text='passing',
+...               right_color='#97ca00')
+>>> a == b and hash(a) == hash(b)
+True
+"""
+
+import hashlib
+from typing import Any, Dict, Optional, Tuple
+
+from pybadges import colors
+from pybadges import fonts
+from pybadges import styles
+from pybadges import text_fitting
+
+_FIELDS = (
+    'left_text',
+    'right_text',
+    'left_link',
+    'right_link',
+    'center_link',
+    'whole_link',
+    'logo',
+    'left_color',
+    'right_color',
+    'center_color',
+    'left_title',
+    'right_title',
+    'center_title',
+    'whole_title',
+    'right_image',
+    'center_image',
+    'embed_logo',
+    'embed_right_image',
+    'embed_center_image',
+    'id_suffix',
+    'font',
+    'font_size',
+    'max_left_text_width',
+    'max_right_text_width',
+    'text_overflow',
+    'optimize',
+    'style',
+)
+
+_COLOR_FIELDS = frozenset(['left_color', 'right_color', 'center_color'])
+
+
+def _color_key(color: Optional[str]) -> Optional[str]:
+    if color is None:
+        return None
+    try:
+        return colors.normalize(color)
+    except ValueError:
+        return color
+
+
+class BadgeSpec:
+    """A description of a badge that can be rendered using pybadges.badge().
+
+    The arguments are the same as those of pybadges.badge() (except for
+    `measurer`). Colors are resolved (e.g. "green" => "#97CA00") and defaults
+    are applied when the spec is created. Two specs are equal if they render
+    the same badge, even if their colors are spelled differently.
+    """
+
+    __slots__ = _FIELDS + ('_key', '_hash')
+
+    def __init__(self,
+                 left_text: str,
+                 right_text: Optional[str] = None,
+                 left_link: Optional[str] = None,
+                 right_link: Optional[str] = None,
+                 center_link: Optional[str] = None,
+                 whole_link: Optional[str] = None,
+                 logo: Optional[str] = None,
+                 left_color: str = '#555',
+                 right_color: str = '#007ec6',
+                 center_color: Optional[str] = None,
+                 left_title: Optional[str] = None,
+                 right_title: Optional[str] = None,
+                 center_title: Optional[str] = None,
+                 whole_title: Optional[str] = None,
+                 right_image: Optional[str] = None,
+                 center_image: Optional[str] = None,
+                 embed_logo: bool = False,
+                 embed_right_image: bool = False,
+                 embed_center_image: bool = False,
+                 id_suffix: str = '',
+                 font: Optional[str] = None,
+                 font_size: float = fonts.DEFAULT_FONT_SIZE,
+                 max_left_text_width: Optional[float] = None,
+                 max_right_text_width: Optional[float] = None,
+                 text_overflow: str = text_fitting.TEXT_OVERFLOW_ELLIPSIS,
+                 optimize: bool = False,
+                 style: str = styles.DEFAULT_STYLE):
+        if (left_link or right_link or center_link) and whole_link:
+            raise ValueError(
+                'whole_link may not bet set with left_link, right_link, or center_link'
+            )
+
+        if center_image and not (right_image or right_text):
+            raise ValueError(
+                'cannot have a center_image without a right element')
+
+        if (center_image and not center_color) or (not center_image and
+                                                   center_color):
+            raise ValueError('must have both a center_image and a center_color')
+
+        if text_overflow not in text_fitting.TEXT_OVERFLOWS:
+            raise ValueError('text_overflow must be one of {0}'.format(
+                ', '.join(sorted(text_fitting.TEXT_OVERFLOWS))))
+
+        if font_size <= 0:
+            raise ValueError('font_size must be positive')
+
+        for max_width in (max_left_text_width, max_right_text_width):
+            if max_width is not None and max_width <= 0:
+                raise ValueError('maximum text widths must be positive')
+
+        if font is None:
+            font = fonts.DEFAULT_FONT
+        else:
+            # Raises ValueError if the font is not registered.
+            fonts.font_family(font)
+
+        # Raises ValueError if the style is not registered.
+        styles.get(style)
+
+        values = dict(
+            left_text=left_text,
+            right_text=right_text,
+            left_link=left_link,
+            right_link=right_link,
+            center_link=center_link,
+            whole_link=whole_link,
+            logo=logo,
+            left_color=colors.resolve(left_color),
+            right_color=colors.resolve(right_color),
+            center_color=(colors.resolve(center_color)
+                          if center_color else center_color),
+            left_title=left_title,
+            right_title=right_title,
+            center_title=center_title,
+            whole_title=whole_title,
+            right_image=right_image,
+            center_image=center_image,
+            embed_logo=bool(embed_logo),
+            embed_right_image=bool(embed_right_image),
+            embed_center_image=bool(embed_center_image),
+            id_suffix=id_suffix,
+            font=font,
+            font_size=font_size,
+            max_left_text_width=max_left_text_width,
+            max_right_text_width=max_right_text_width,
+            text_overflow=text_overflow,
+            optimize=bool(optimize),
+            style=style,
+        )
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+        key = tuple(
+            _color_key(values[name]) if name in _COLOR_FIELDS else values[name]
+            for name in _FIELDS)
+        object.__setattr__(self, '_key', key)
+        object.__setattr__(self, '_hash', hash(key))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError('BadgeSpec is immutable')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError('BadgeSpec is immutable')
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, BadgeSpec):
+            return NotImplemented
+        return self._hash == other._hash and self._key == other._key
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return 'BadgeSpec({0})'.format(', '.join(
+            '{0}={1!r}'.format(name, value)
+            for name, value in self.as_dict().items()
+            if value is not None))
+
+    def __reduce__(self):
+        return (_from_dict, (self.as_dict(),))
+
+    @property
+    def key(self) -> Tuple[Any, ...]:
+        """A tuple that is equal for specs that render the same badge."""
+        return self._key
+
+    def fingerprint(self) -> str:
+        """Returns a stable hex digest of the spec e.g. for use as an ETag.
+
+        Unlike hash(), the fingerprint is the same in every process.
+        """
+        return hashlib.sha256(repr(self._key).encode('utf-8')).hexdigest()[:32]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the spec as keyword arguments for pybadges.badge()."""
+        return {name: getattr(self, name) for name in _FIELDS}
+
+    def replace(self, **changes: Any) -> 'BadgeSpec':
+        """Returns a new BadgeSpec with the given fields replaced."""
+        values = self.as_dict()
+        values.update(changes)
+        return BadgeSpec(**values)
+
+
+def _from_dict(values: Dict[str, Any]) -> BadgeSpec:
+    return BadgeSpec(**values)
@@ -0,0 +1,98 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Render badges, sharing the work between concurrent identical requests.
+
+When a server receives many simultaneous requests for the same badge, the
+functions in this module render it (and fetch any embedded images) once and
+return the result to every caller, instead of rendering it once per request.
+Requests are identical if they have equal BadgeSpecs and the same measurer.
+
+Threaded servers should use `badge` and `badge_bytes`:
+
+    svg = coalesce.badge(left_text='build', right_text='passing')
+
+asyncio servers should use `badge_async` and `badge_bytes_async`, which
+render in an executor so that the event loop is not blocked:
+
+    svg = await coalesce.badge_async(left_text='build', right_text='passing')
+
+Results are not cached once they have been returned; combine these functions
+with a cache (e.g. render_cache.RenderCache) for that.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+from typing import Any, Callable, Optional, Union
+
+import pybadges
+from pybadges import singleflight
+
+_group = singleflight.Group()
+_async_group = singleflight.AsyncGroup()
+
+
+def _coalesced(render: Callable[..., Union[str, bytes]], *args: Any,
+               **kwargs: Any) -> Any:
+    spec, measurer = pybadges._spec_from_args(args, kwargs)
+    return _group.do((render, spec, measurer),
+                     lambda: render(spec, measurer=measurer))
+
+
+async def _coalesced_async(render: Callable[..., Union[str, bytes]],
+                           executor: Optional[concurrent.futures.Executor],
+                           *args: Any, **kwargs: Any) -> Any:
+    spec, measurer = pybadges._spec_from_args(args, kwargs)
+    loop = asyncio.get_running_loop()
+    return await _async_group.do(
+        (render, spec, measurer), lambda: loop.run_in_executor(
+            executor, functools.partial(render, spec, measurer=measurer)))
+
+
+def badge(*args: Any, **kwargs: Any) -> str:
+    """Like pybadges.badge(), but shares work with identical calls."""
+    return _coalesced(pybadges.badge, *args, **kwargs)
+
+
+def badge_bytes(*args: Any, **kwargs: Any) -> bytes:
+    """Like pybadges.badge_bytes(), but shares work with identical calls."""
+    return _coalesced(pybadges.badge_bytes, *args, **kwargs)
+
+
+async def badge_async(*args: Any,
+                      executor: Optional[concurrent.futures.Executor] = None,
+                      **kwargs: Any) -> str:
+    """An awaitable pybadges.badge() that shares work with identical calls.
+
+    Args:
+        executor: The executor to render the badge in. Defaults to the event
+            loop's default executor.
+        The remaining arguments are the same as `pybadges.badge`.
+    """
+    return await _coalesced_async(pybadges.badge, executor, *args, **kwargs)
+
+
+async def badge_bytes_async(*args: Any,
+                            executor: Optional[
+                                concurrent.futures.Executor] = None,
+                            **kwargs: Any) -> bytes:
+    """An awaitable badge_bytes() that shares work with identical calls.
+
+    Args:
+        executor: The executor to render the badge in. Defaults to the event
+            loop's default executor.
+        The remaining arguments are the same as `pybadges.badge`.
+    """
+    return await _coalesced_async(pybadges.badge_bytes, executor, *args,
+                                  **kwargs)
@@ -0,0 +1,336 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Resolve, validate and normalize the colors used in badges.
+
+Colors can be given as a name defined by shields.io (e.g. "brightgreen"), a
+CSS named color (e.g. "rebeccapurple"), a hex color (e.g. "#4c1", "#97CA00"),
+an rgb()/rgba()/hsl()/hsla() function or one of the CSS keywords
+"transparent", "currentcolor" and "none".
+
+normalize() converts any of these into a canonical form, so that colors that
+render identically compare equal e.g.
+
+>>> normalize('green') == normalize('#97CA00') == normalize('#97ca00')
+True
+"""
+
+import colorsys
+import functools
+import math
+import re
+from typing import Optional
+
+# Use the same color scheme as describe in:
+# https://github.com/badges/shields/blob/master/lib/colorscheme.json
+
+NAME_TO_COLOR = {
+    'brightgreen': '#4c1',
+    'green': '#97CA00',
+    'yellow': '#dfb317',
+    'yellowgreen': '#a4a61d',
+    'orange': '#fe7d37',
+    'red': '#e05d44',
+    'blue': '#007ec6',
+    'grey': '#555',
+    'gray': '#555',
+    'lightgrey': '#9f9f9f',
+    'lightgray': '#9f9f9f',
+    'critical': '#e05d44',
+    'important': '#fe7d37',
+    'success': '#4c1',
+    'informational': '#007ec6',
+    'inactive': '#9f9f9f',
+}
+
+# The named colors defined in:
+# https://www.w3.org/TR/css-color-4/#named-colors
+_CSS_NAME_TO_COLOR = {
+    'aliceblue': '#f0f8ff',
+    'antiquewhite': '#faebd7',
+    'aqua': '#00ffff',
+    'aquamarine': '#7fffd4',
+    'azure': '#f0ffff',
+    'beige': '#f5f5dc',
+    'bisque': '#ffe4c4',
+    'black': '#000000',
+    'blanchedalmond': '#ffebcd',
+    'blue': '#0000ff',
+    'blueviolet': '#8a2be2',
+    'brown': '#a52a2a',
+    'burlywood': '#deb887',
+    'cadetblue': '#5f9ea0',
+    'chartreuse': '#7fff00',
+    'chocolate': '#d2691e',
+    'coral': '#ff7f50',
+    'cornflowerblue': '#6495ed',
+    'cornsilk': '#fff8dc',
+    'crimson': '#dc143c',
+    'cyan': '#00ffff',
+    'darkblue': '#00008b',
+    'darkcyan': '#008b8b',
+    'darkgoldenrod': '#b8860b',
+    'darkgray': '#a9a9a9',
+    'darkgreen': '#006400',
+    'darkgrey': '#a9a9a9',
+    'darkkhaki': '#bdb76b',
+    'darkmagenta': '#8b008b',
+    'darkolivegreen': '#556b2f',
+    'darkorange': '#ff8c00',
+    'darkorchid': '#9932cc',
+    'darkred': '#8b0000',
+    'darksalmon': '#e9967a',
+    'darkseagreen': '#8fbc8f',
+    'darkslateblue': '#483d8b',
+    'darkslategray': '#2f4f4f',
+    'darkslategrey': '#2f4f4f',
+    'darkturquoise': '#00ced1',
+    'darkviolet': '#9400d3',
+    'deeppink': '#ff1493',
+    'deepskyblue': '#00bfff',
+    'dimgray': '#696969',
+    'dimgrey': '#696969',
+    'dodgerblue': '#1e90ff',
+    'firebrick': '#b22222',
+    'floralwhite': '#fffaf0',
+    'forestgreen': '#228b22',
+    'fuchsia': '#ff00ff',
+    'gainsboro': '#dcdcdc',
+    'ghostwhite': '#f8f8ff',
+    'gold': '#ffd700',
+    'goldenrod': '#daa520',
+    'gray': '#808080',
+    'green': '#008000',
+    'greenyellow': '#adff2f',
+    'grey': '#808080',
+    'honeydew': '#f0fff0',
+    'hotpink': '#ff69b4',
+    'indianred': '#cd5c5c',
+    'indigo': '#4b0082',
+    'ivory': '#fffff0',
+    'khaki': '#f0e68c',
+    'lavender': '#e6e6fa',
+    'lavenderblush': '#fff0f5',
+    'lawngreen': '#7cfc00',
+    'lemonchiffon': '#fffacd',
+    'lightblue': '#add8e6',
+    'lightcoral': '#f08080',
+    'lightcyan': '#e0ffff',
+    'lightgoldenrodyellow': '#fafad2',
+    'lightgray': '#d3d3d3',
+    'lightgreen': '#90ee90',
+    'lightgrey': '#d3d3d3',
+    'lightpink': '#ffb6c1',
+    'lightsalmon': '#ffa07a',
+    'lightseagreen': '#20b2aa',
+    'lightskyblue': '#87cefa',
+    'lightslategray': '#778899',
+    'lightslategrey': '#778899',
+    'lightsteelblue': '#b0c4de',
+    'lightyellow': '#ffffe0',
+    'lime': '#00ff00',
+    'limegreen': '#32cd32',
+    'linen': '#faf0e6',
+    'magenta': '#ff00ff',
+    'maroon': '#800000',
+    'mediumaquamarine': '#66cdaa',
+    'mediumblue': '#0000cd',
+    'mediumorchid': '#ba55d3',
+    'mediumpurple': '#9370db',
+    'mediumseagreen': '#3cb371',
+    'mediumslateblue': '#7b68ee',
+    'mediumspringgreen': '#00fa9a',
+    'mediumturquoise': '#48d1cc',
+    'mediumvioletred': '#c71585',
+    'midnightblue': '#191970',
+    'mintcream': '#f5fffa',
+    'mistyrose': '#ffe4e1',
+    'moccasin': '#ffe4b5',
+    'navajowhite': '#ffdead',
+    'navy': '#000080',
+    'oldlace': '#fdf5e6',
+    'olive': '#808000',
+    'olivedrab': '#6b8e23',
+    'orange': '#ffa500',
+    'orangered': '#ff4500',
+    'orchid': '#da70d6',
+    'palegoldenrod': '#eee8aa',
+    'palegreen': '#98fb98',
+    'paleturquoise': '#afeeee',
+    'palevioletred': '#db7093',
+    'papayawhip': '#ffefd5',
+    'peachpuff': '#ffdab9',
+    'peru': '#cd853f',
+    'pink': '#ffc0cb',
+    'plum': '#dda0dd',
+    'powderblue': '#b0e0e6',
+    'purple': '#800080',
+    'rebeccapurple': '#663399',
+    'red': '#ff0000',
+    'rosybrown': '#bc8f8f',
+    'royalblue': '#4169e1',
+    'saddlebrown': '#8b4513',
+    'salmon': '#fa8072',
+    'sandybrown': '#f4a460',
+    'seagreen': '#2e8b57',
+    'seashell': '#fff5ee',
+    'sienna': '#a0522d',
+    'silver': '#c0c0c0',
+    'skyblue': '#87ceeb',
+    'slateblue': '#6a5acd',
+    'slategray': '#708090',
+    'slategrey': '#708090',
+    'snow': '#fffafa',
+    'springgreen': '#00ff7f',
+    'steelblue': '#4682b4',
+    'tan': '#d2b48c',
+    'teal': '#008080',
+    'thistle': '#d8bfd8',
+    'tomato': '#ff6347',
+    'turquoise': '#40e0d0',
+    'violet': '#ee82ee',
+    'wheat': '#f5deb3',
+    'white': '#ffffff',
+    'whitesmoke': '#f5f5f5',
+    'yellow': '#ffff00',
+    'yellowgreen': '#9acd32',
+}
+
+_KEYWORDS = {
+    'transparent': '#00000000',
+    'currentcolor': 'currentcolor',
+    'none': 'none',
+}
+
+_HEX_DIGITS = frozenset('0123456789abcdef')
+
+_NUMBER = r'\s*([+-]?(?:\d+\.?\d*|\.\d+)(?:e[+-]?\d+)?)(%|deg|grad|rad|turn)?\s*'
+
+# Matches both the legacy comma separated syntax e.g. "rgba(1, 2, 3, 0.5)" and
+# the space separated syntax e.g. "rgb(1 2 3 / 50%)".
+_FUNCTION_RE = re.compile(r'(rgba?|hsla?)\(' + _NUMBER + r'(?:,|\s)' + _NUMBER +
+                          r'(?:,|\s)' + _NUMBER + r'(?:(?:,|/)' + _NUMBER +
+                          r')?\)$')
+
+_ANGLE_UNITS_TO_DEGREES = {
+    None: 1,
+    'deg': 1,
+    'grad': 360 / 400,
+    'rad': 180 / math.pi,
+    'turn': 360,
+}
+
+
+def resolve(color: str) -> str:
+    """Returns the value used to render a color in a badge.
+
+    shields.io color names are replaced with their hex value, all other colors
+    are returned unchanged.
+    """
+    return NAME_TO_COLOR.get(color, color)
+
+
+def _clamp_byte(value: float) -> int:
+    return min(255, max(0, int(round(value))))
+
+
+def _channel(value: str, unit: Optional[str]) -> int:
+    if unit == '%':
+        return _clamp_byte(float(value) * 255 / 100)
+    elif unit is None:
+        return _clamp_byte(float(value))
+    raise ValueError('invalid color channel "{0}{1}"'.format(value, unit))
+
+
+def _percentage(value: str, unit: Optional[str]) -> float:
+    if unit not in (None, '%'):
+        raise ValueError('invalid percentage "{0}{1}"'.format(value, unit))
+    return min(1.0, max(0.0, float(value) / 100))
+
+
+def _alpha(value: Optional[str], unit: Optional[str]) -> int:
+    if value is None:
+        return 255
+    if unit == '%':
+        return _clamp_byte(float(value) * 255 / 100)
+    elif unit is None:
+        return _clamp_byte(float(value) * 255)
+    raise ValueError('invalid alpha "{0}{1}"'.format(value, unit))
+
+
+def _hex(red: int, green: int, blue: int, alpha: int) -> str:
+    if alpha == 255:
+        return '#{0:02x}{1:02x}{2:02x}'.format(red, green, blue)
+    return '#{0:02x}{1:02x}{2:02x}{3:02x}'.format(red, green, blue, alpha)
+
+
+def _normalize_hex(color: str) -> str:
+    digits = color[1:]
+    if not _HEX_DIGITS.issuperset(digits):
+        raise ValueError('invalid hex color "{0}"'.format(color))
+    if len(digits) in (3, 4):
+        digits = ''.join(d * 2 for d in digits)
+    if len(digits) == 8 and digits.endswith('ff'):
+        digits = digits[:6]
+    if len(digits) not in (6, 8):
+        raise ValueError('invalid hex color "{0}"'.format(color))
+    return '#' + digits
+
+
+def _normalize_function(color: str) -> str:
+    match = _FUNCTION_RE.match(color)
+    if not match:
+        raise ValueError('invalid color "{0}"'.format(color))
+    name, v1, u1, v2, u2, v3, u3, alpha, alpha_unit = match.groups()
+    if name.startswith('rgb'):
+        return _hex(_channel(v1, u1), _channel(v2, u2), _channel(v3, u3),
+                    _alpha(alpha, alpha_unit))
+
+    if u1 == '%':
+        raise ValueError('invalid hue "{0}{1}"'.format(v1, u1))
+    hue = (float(v1) * _ANGLE_UNITS_TO_DEGREES[u1]) % 360 / 360
+    red, green, blue = colorsys.hls_to_rgb(hue, _percentage(v3, u3),
+                                           _percentage(v2, u2))
+    return _hex(_clamp_byte(red * 255), _clamp_byte(green * 255),
+                _clamp_byte(blue * 255), _alpha(alpha, alpha_unit))
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize(color: str) -> str:
+    """Returns the canonical form of a color.
+
+    The canonical form of an opaque color is a lowercase "#rrggbb" hex color
+    and of a translucent color is a lowercase "#rrggbbaa" hex color. The
+    keywords "currentcolor" and "none" are returned as-is.
+
+    Raises:
+        ValueError: if the color is not valid.
+    """
+    if not isinstance(color, str):
+        raise ValueError('invalid color {0!r}'.format(color))
+    color = NAME_TO_COLOR.get(color, color).strip().lower()
+    if color.startswith('#'):
+        return _normalize_hex(color)
+    named = _CSS_NAME_TO_COLOR.get(color) or _KEYWORDS.get(color)
+    if named:
+        return named
+    return _normalize_function(color)
+
+
+def is_valid(color: str) -> bool:
+    """Returns True if the color can be used in a badge."""
+    try:
+        normalize(color)
+    except ValueError:
+        return False
+    return True
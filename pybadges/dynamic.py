@@ -0,0 +1,300 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Create badges showing a value taken from a JSON document.
+
+This covers the shields.io "dynamic badge" use case: a JSON document is
+fetched from a URL (or read from a file), a value is extracted from it using a
+JSONPath-like path and the value is rendered as the right-hand text of a
+badge.
+
+    dynamic_badges = dynamic.DynamicBadges(ttl=60)
+    svg = dynamic_badges.badge(url='https://pypi.org/pypi/pybadges/json',
+                               path='$.info.version',
+                               left_text='pypi',
+                               prefix='v')
+
+Fetched documents are cached for `ttl` seconds. After that, the cached
+document is still used for up to `stale_ttl` seconds while it is fetched
+again in the background. Concurrent requests for a URL that is not cached
+share a single fetch. Documents are fetched using an embedding.Embedder, so
+servers can limit their size and the hosts that they are fetched from in the
+same way as embedded images.
+
+Queries support a subset of JSONPath:
+
+>>> document = {'info': {'version': '3.0', 'tags': ['svg', 'badge']}}
+>>> query(document, '$.info.version')
+['3.0']
+>>> query(document, "$['info'].tags[*]")
+['svg', 'badge']
+>>> query(document, '$.info.tags[-1]')
+['badge']
+"""
+
+import collections
+import json
+import re
+import threading
+import time
+import urllib.parse
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+import pybadges
+from pybadges import embedding
+from pybadges import singleflight
+
+# A step of a query e.g. ".name", "['name']", "[0]" or "[*]".
+_QUERY_STEP = re.compile(r'\.(?P<name>[^.\[\]]+)'
+                         r'|\[(?:(?P<index>-?\d+)'
+                         r"|'(?P<single_quoted>[^']*)'"
+                         r'|"(?P<double_quoted>[^"]*)"'
+                         r'|(?P<wildcard>\*))\]')
+
+
+def _parse_query(q: str) -> List[Any]:
+    if not q.startswith('$'):
+        raise ValueError('query must start with "$": {0!r}'.format(q))
+    steps = []  # type: List[Any]
+    position = 1
+    while position < len(q):
+        match = _QUERY_STEP.match(q, position)
+        if match is None:
+            raise ValueError('invalid query at position {0}: {1!r}'.format(
+                position, q))
+        if match.group('name') == '*' or match.group('wildcard'):
+            steps.append(None)
+        elif match.group('index') is not None:
+            steps.append(int(match.group('index')))
+        else:
+            steps.append(
+                next(g for g in match.group('name', 'single_quoted',
+                                            'double_quoted') if g is not None))
+        position = match.end()
+    return steps
+
+
+def query(document: Any, q: str) -> List[Any]:
+    """Returns the values in a JSON document that match a JSONPath-like query.
+
+    Supported queries start with "$" (the whole document) followed by any
+    number of steps: `.name` or `['name']` select a member of an object,
+    `[n]` selects an element of an array (negative indices count from the
+    end) and `[*]` or `.*` select every member or element.
+
+    Raises:
+        ValueError: The query is not valid.
+    """
+    values = [document]
+    for step in _parse_query(q):
+        selected = []
+        for value in values:
+            if step is None:
+                if isinstance(value, dict):
+                    selected.extend(value.values())
+                elif isinstance(value, list):
+                    selected.extend(value)
+            elif isinstance(step, int):
+                if isinstance(value, list) and -len(value) <= step < len(value):
+                    selected.append(value[step])
+            elif isinstance(value, dict) and step in value:
+                selected.append(value[step])
+        values = selected
+    return values
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def load_document(url: str,
+                  timeout: Optional[float] = None,
+                  embedder: Optional[embedding.Embedder] = None) -> Any:
+    """Fetches and parses a JSON document from a HTTP/HTTPS URL or a file.
+
+    Args:
+        url: The HTTP/HTTPS URL or the path of the JSON document.
+        timeout: The number of seconds that fetching the document may take.
+            Ignored if `embedder` is set.
+        embedder: The embedding.Embedder used to fetch the document. Its
+            limits (e.g. `max_bytes` and `allowed_hosts`) apply to the
+            document and files are only read if it allows them. Defaults to
+            an Embedder with the default limits.
+
+    Raises:
+        embedding.NotAllowed: The URL or file is not allowed by the embedder.
+        embedding.TooLarge: The document is larger than the embedder allows.
+        requests.RequestException: The document could not be fetched.
+        OSError: The document could not be read from a file.
+        ValueError: The document is not valid JSON.
+    """
+    if embedder is None:
+        embedder = embedding.Embedder(
+            timeout=embedding.DEFAULT_TIMEOUT if timeout is None else timeout)
+    parsed_url = urllib.parse.urlparse(url)
+    if parsed_url.scheme in ('http', 'https'):
+        return json.loads(embedder.fetch(url))
+    elif parsed_url.scheme == 'file':
+        path = urllib.parse.unquote(parsed_url.path)
+    elif parsed_url.scheme and len(parsed_url.scheme) > 1:
+        raise ValueError('unsupported scheme "{0}"'.format(parsed_url.scheme))
+    else:
+        # No scheme or a Windows drive letter.
+        path = url
+    if not embedder.allow_files:
+        raise embedding.NotAllowed('reading files is not allowed')
+    with open(path, 'rb') as f:
+        return json.load(f)
+
+
+class DynamicBadges:
+    """Renders badges from values in fetched JSON documents.
+
+    A DynamicBadges can be used concurrently by many threads.
+    """
+
+    def __init__(self,
+                 ttl: float = 300,
+                 stale_ttl: float = 3600,
+                 timeout: float = 10,
+                 max_entries: int = 1024,
+                 clock: Callable[[], float] = time.monotonic,
+                 embedder: Optional[embedding.Embedder] = None):
+        """Initializer for DynamicBadges.
+
+        Args:
+            ttl: The number of seconds that a fetched document is used for
+                before it is fetched again.
+            stale_ttl: The number of seconds after `ttl` expires that the
+                cached document is still used while a new copy is fetched in
+                the background. If it has not been replaced by then (e.g.
+                because the URL cannot be fetched), the next request fetches
+                the document again and waits for it.
+            timeout: The number of seconds that fetching a document may take.
+                Ignored if `embedder` is set.
+            max_entries: The maximum number of cached documents. The least
+                recently used documents are removed when it is exceeded.
+            clock: A function returning the current time in seconds.
+            embedder: The embedding.Embedder used to fetch documents, which
+                limits their size and where they are fetched from. Servers
+                that fetch URLs chosen by clients should set this, with
+                `allowed_hosts` and `allow_files=False`. Defaults to an
+                Embedder with the default limits.
+        """
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        if embedder is None:
+            embedder = embedding.Embedder(timeout=timeout)
+        self._embedder = embedder
+        self._max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._documents = collections.OrderedDict(
+        )  # type: collections.OrderedDict[str, Tuple[Any, float]]
+        self._fetches = singleflight.Group()
+        # The URLs being revalidated in the background.
+        self._revalidating = set()  # type: Set[str]
+
+    def _load(self, url: str) -> Any:
+        document = load_document(url, embedder=self._embedder)
+        with self._lock:
+            self._documents[url] = (document, self._clock())
+            self._documents.move_to_end(url)
+            while len(self._documents) > self._max_entries:
+                self._documents.popitem(last=False)
+        return document
+
+    def _revalidate(self, url: str) -> None:
+        try:
+            self._fetches.do(url, lambda: self._load(url))
+        except Exception:  # pylint: disable=broad-except
+            # Keep serving the stale document until it expires.
+            pass
+        finally:
+            with self._lock:
+                self._revalidating.discard(url)
+
+    def fetch(self, url: str) -> Any:
+        """Returns the parsed JSON document at url, using the cache if possible.
+
+        Raises:
+            embedding.NotAllowed: The URL or file is not allowed by the
+                embedder.
+            embedding.TooLarge: The document is larger than the embedder
+                allows.
+            embedding.Overloaded: Too many URLs are already being fetched.
+            requests.RequestException: The document could not be fetched.
+            OSError: The document could not be read from a file.
+            ValueError: The document is not valid JSON.
+        """
+        with self._lock:
+            entry = self._documents.get(url)
+            if entry is not None:
+                self._documents.move_to_end(url)
+
+        if entry is not None:
+            document, fetched_at = entry
+            age = self._clock() - fetched_at
+            if age < self._ttl:
+                return document
+            if age < self._ttl + self._stale_ttl:
+                with self._lock:
+                    revalidate = url not in self._revalidating
+                    self._revalidating.add(url)
+                if revalidate:
+                    threading.Thread(target=self._revalidate,
+                                     args=(url,),
+                                     daemon=True).start()
+                return document
+
+        return self._fetches.do(url, lambda: self._load(url))
+
+    def value(self, url: str, path: str) -> str:
+        """Returns the value in the document at url that matches a path.
+
+        If the path matches several values then they are joined with ", ".
+
+        Raises:
+            ValueError: The path is not a valid query or matches nothing.
+        """
+        values = query(self.fetch(url), path)
+        if not values:
+            raise ValueError('{0!r} does not match any value'.format(path))
+        return ', '.join(_format_value(v) for v in values)
+
+    def badge(self,
+              url: str,
+              path: str,
+              prefix: str = '',
+              suffix: str = '',
+              **kwargs: Any) -> str:
+        """Returns a badge showing the value in a JSON document.
+
+        Args:
+            url: The HTTP/HTTPS URL or the path of the JSON document.
+            path: The JSONPath-like query that selects the value to show e.g.
+                "$.info.version".
+            prefix: Text to show before the value e.g. "v".
+            suffix: Text to show after the value e.g. "%".
+            **kwargs: Other arguments for pybadges.badge() e.g. `left_text`
+                and `right_color`. `right_text` is set to the value.
+        """
+        right_text = prefix + self.value(url, path) + suffix
+        return pybadges.badge(right_text=right_text, **kwargs)
+
+    def clear(self) -> None:
+        """Removes every cached document."""
+        with self._lock:
+            self._documents.clear()
@@ -0,0 +1,325 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Fetch the images embedded in badges, within limits suitable for servers.
+
+Embedding an image (e.g. `embed_logo=True`) fetches it from a URL that, in a
+server, is chosen by whoever requested the badge. An Embedder bounds what that
+can cost:
+
+- only allowed schemes and hosts are fetched and local files can be
+  disallowed; redirects are checked too
+- each fetch must finish within `timeout` seconds and return at most
+  `max_bytes` bytes
+- optionally, at most `max_in_flight` fetches run at once, and at most
+  `max_per_host` from any one host. Fetches beyond that fail immediately with
+  Overloaded rather than waiting, so a slow host can't hold up every worker
+
+`Embedder.fetch` fetches other content (e.g. the JSON documents used by
+pybadges.dynamic) within the same limits.
+
+Servers should configure the embedder used by pybadges.badge() at startup:
+
+    embedding.set_default_embedder(
+        embedding.Embedder(allowed_hosts=['img.shields.io'],
+                           allow_files=False,
+                           max_in_flight=16))
+
+Hosts are matched by name and are not resolved, so a denylist can't stop a
+name that resolves to an internal address; use `allowed_hosts` for that.
+"""
+
+import base64
+import collections
+import socket
+import threading
+import time
+import urllib.parse
+from typing import Collection, Optional, Tuple
+
+import requests
+
+from pybadges import logos
+
+DEFAULT_TIMEOUT = 10
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+DEFAULT_MAX_REDIRECTS = 5
+
+_HTTP_SCHEMES = ('http', 'https')
+_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+_CHUNK_SIZE = 64 * 1024
+
+
+class NotAllowed(ValueError):
+    """The image's URL is not allowed by the embedder's policy."""
+
+
+class TooLarge(ValueError):
+    """The fetched content is larger than the embedder's maximum size."""
+
+
+class Overloaded(RuntimeError):
+    """Too many URLs are being fetched; try again later."""
+
+
+def _host_matches(host: str, patterns: Collection[str]) -> bool:
+    """Returns True if host is, or is a subdomain of, one of the patterns."""
+    host = host.lower().rstrip('.')
+    return any(host == p or host.endswith('.' + p) for p in patterns)
+
+
+def _abort(r: requests.Response, aborted: threading.Event) -> None:
+    """Shuts down the connection that a streamed response is read from."""
+    aborted.set()
+    try:
+        # A duplicate of the socket, which shuts down the same connection.
+        with socket.fromfd(r.raw.fileno(), socket.AF_INET,
+                           socket.SOCK_STREAM) as sock:
+            sock.shutdown(socket.SHUT_RDWR)
+    except (OSError, ValueError):
+        # The response has already been read and closed.
+        pass
+
+
+def _image_type(content_type: str) -> str:
+    """Returns the type of image in a Content-Type header e.g. "png"."""
+    if not content_type:
+        raise ValueError('no "Content-Type" header')
+    content_type, image_type = content_type.split(';')[0].split('/')
+    if content_type != 'image':
+        raise ValueError('expected an image, got "{0}"'.format(content_type))
+    return image_type
+
+
+class Embedder:
+    """Converts image URLs and paths into data URLs.
+
+    An Embedder can be used concurrently by many threads.
+    """
+
+    def __init__(self,
+                 allowed_schemes: Collection[str] = _HTTP_SCHEMES,
+                 allowed_hosts: Optional[Collection[str]] = None,
+                 denied_hosts: Collection[str] = (),
+                 allow_files: bool = True,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_in_flight: Optional[int] = None,
+                 max_per_host: Optional[int] = None,
+                 max_redirects: int = DEFAULT_MAX_REDIRECTS):
+        """Initializer for Embedder.
+
+        Args:
+            allowed_schemes: The URL schemes that may be fetched, a subset of
+                "http" and "https". Data URLs are always allowed.
+            allowed_hosts: If set then only these hosts, and their
+                subdomains, may be fetched from e.g. ["example.com"] allows
+                "example.com" and "img.example.com".
+            denied_hosts: Hosts, and their subdomains, that may not be
+                fetched from. Takes precedence over `allowed_hosts`.
+            allow_files: If True then paths to local files may be embedded.
+                Servers should set this to False.
+            timeout: The number of seconds that fetching an image, including
+                any redirects, may take.
+            max_bytes: The maximum size of fetched content.
+            max_in_flight: The maximum number of concurrent fetches, or None
+                for no limit.
+            max_per_host: The maximum number of concurrent fetches from a
+                single host, or None for no limit.
+            max_redirects: The maximum number of redirects followed.
+        """
+        unsupported = set(allowed_schemes) - set(_HTTP_SCHEMES)
+        if unsupported:
+            raise ValueError('unsupported scheme "{0}"'.format(
+                sorted(unsupported)[0]))
+        self._allowed_schemes = frozenset(allowed_schemes)
+        self._allowed_hosts = (None if allowed_hosts is None else frozenset(
+            h.lower() for h in allowed_hosts))
+        self._denied_hosts = frozenset(h.lower() for h in denied_hosts)
+        self._allow_files = allow_files
+        self._timeout = timeout
+        self._max_bytes = max_bytes
+        self._max_in_flight = max_in_flight
+        self._max_per_host = max_per_host
+        self._max_redirects = max_redirects
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._host_in_flight = collections.Counter(
+        )  # type: collections.Counter[str]
+
+    @property
+    def allow_files(self) -> bool:
+        """Whether paths to local files may be embedded."""
+        return self._allow_files
+
+    def in_flight(self) -> int:
+        """Returns the number of fetches that are in progress."""
+        return self._in_flight
+
+    def _check_url(self, parsed_url: urllib.parse.ParseResult) -> None:
+        if parsed_url.scheme not in _HTTP_SCHEMES:
+            raise NotAllowed('unsupported scheme "{0}"'.format(
+                parsed_url.scheme))
+        if parsed_url.scheme not in self._allowed_schemes:
+            raise NotAllowed('scheme "{0}" is not allowed'.format(
+                parsed_url.scheme))
+        host = parsed_url.hostname or ''
+        if (_host_matches(host, self._denied_hosts) or
+            (self._allowed_hosts is not None and
+             not _host_matches(host, self._allowed_hosts))):
+            raise NotAllowed('host "{0}" is not allowed'.format(host))
+
+    def _acquire(self, host: str) -> None:
+        with self._lock:
+            if (self._max_in_flight is not None and
+                    self._in_flight >= self._max_in_flight):
+                raise Overloaded('too many URLs are being fetched')
+            if (self._max_per_host is not None and
+                    self._host_in_flight[host] >= self._max_per_host):
+                raise Overloaded(
+                    'too many URLs are being fetched from "{0}"'.format(host))
+            self._in_flight += 1
+            self._host_in_flight[host] += 1
+
+    def _release(self, host: str) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._host_in_flight[host] -= 1
+            if not self._host_in_flight[host]:
+                del self._host_in_flight[host]
+
+    def _get(self, url: str, deadline: float) -> requests.Response:
+        """Returns the streamed response for url, following redirects."""
+        for _ in range(self._max_redirects + 1):
+            parsed_url = urllib.parse.urlparse(url)
+            self._check_url(parsed_url)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise requests.Timeout('timed out fetching {0}'.format(url))
+            r = requests.get(url,
+                             stream=True,
+                             allow_redirects=False,
+                             timeout=remaining)
+            if (r.status_code not in _REDIRECT_STATUSES or
+                    'location' not in r.headers):
+                return r
+            r.close()
+            url = urllib.parse.urljoin(url, r.headers['location'])
+        raise requests.TooManyRedirects('exceeded {0} redirects'.format(
+            self._max_redirects))
+
+    def _read(self, r: requests.Response, deadline: float) -> bytes:
+        content_length = r.headers.get('content-length', '')
+        if content_length.isdigit() and int(content_length) > self._max_bytes:
+            raise TooLarge('{0} is larger than {1} bytes'.format(
+                r.url, self._max_bytes))
+        # The timeout passed to requests applies to each read from the
+        # socket, so a server sending a few bytes at a time could take much
+        # longer than the deadline. Shut the connection down at the deadline
+        # instead, which ends any read in progress.
+        aborted = threading.Event()
+        watchdog = threading.Timer(max(0.0, deadline - time.monotonic()),
+                                   _abort, [r, aborted])
+        watchdog.daemon = True
+        watchdog.start()
+        chunks = []
+        size = 0
+        try:
+            for chunk in r.iter_content(_CHUNK_SIZE):
+                size += len(chunk)
+                if size > self._max_bytes:
+                    raise TooLarge('{0} is larger than {1} bytes'.format(
+                        r.url, self._max_bytes))
+                chunks.append(chunk)
+        except requests.RequestException:
+            if not aborted.is_set():
+                raise
+        finally:
+            watchdog.cancel()
+        if aborted.is_set():
+            raise requests.Timeout('timed out fetching {0}'.format(r.url))
+        return b''.join(chunks)
+
+    def _fetch(self, url: str, image: bool) -> Tuple[str, bytes]:
+        """Returns the Content-Type header and content at a HTTP/HTTPS URL.
+
+        If `image` is True then content that isn't an image is not read.
+        """
+        parsed_url = urllib.parse.urlparse(url)
+        self._check_url(parsed_url)
+        # Limited by the host of the original URL, even if it redirects.
+        host = (parsed_url.hostname or '').lower()
+        self._acquire(host)
+        try:
+            deadline = time.monotonic() + self._timeout
+            r = self._get(url, deadline)
+            with r:
+                r.raise_for_status()
+                content_type = r.headers.get('content-type', '')
+                if image:
+                    _image_type(content_type)
+                return content_type, self._read(r, deadline)
+        finally:
+            self._release(host)
+
+    def fetch(self, url: str) -> bytes:
+        """Returns the content at a HTTP/HTTPS URL.
+
+        Raises:
+            NotAllowed: The URL, or a URL that it redirects to, is not
+                allowed.
+            TooLarge: The content is larger than `max_bytes`.
+            Overloaded: Too many URLs are already being fetched.
+            requests.RequestException: The content could not be fetched e.g.
+                it timed out.
+        """
+        return self._fetch(url, image=False)[1]
+
+    def embed(self, url: str) -> str:
+        """Returns a data URL containing the image at a URL or path.
+
+        Raises:
+            NotAllowed: The URL, a URL that it redirects to or the path is not
+                allowed.
+            TooLarge: The image is larger than `max_bytes`.
+            Overloaded: Too many URLs are already being fetched.
+            requests.RequestException: The image could not be fetched e.g. it
+                timed out.
+            ValueError: The URL or file is not an image.
+        """
+        parsed_url = urllib.parse.urlparse(url)
+        if parsed_url.scheme == 'data':
+            return url
+        if not parsed_url.scheme:
+            if not self._allow_files:
+                raise NotAllowed('embedding files is not allowed')
+            return logos.encode_file(url)
+
+        content_type, image_data = self._fetch(url, image=True)
+        image_type = _image_type(content_type)
+        encoded_image = base64.b64encode(image_data).decode('ascii')
+        return 'data:image/{};base64,{}'.format(image_type, encoded_image)
+
+
+_default_embedder = Embedder()
+
+
+def default_embedder() -> Embedder:
+    """Returns the Embedder used by pybadges.badge() to embed images."""
+    return _default_embedder
+
+
+def set_default_embedder(embedder: Embedder) -> None:
+    """Sets the Embedder used by pybadges.badge() to embed images."""
+    global _default_embedder
+    _default_embedder = embedder
@@ -0,0 +1,164 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A registry of fonts and the precalculated tables used to measure them.
+
+Each font is registered with the CSS font-family used when rendering it and
+one or more precalculated text width tables, keyed by font size. Tables are
+loaded the first time that they are needed and then cached. Widths for sizes
+without their own table (e.g. `pybadges.badge(..., font_size=90)`) are derived
+by scaling the closest table.
+
+    fonts.register_font('Verdana', 'Verdana,Geneva,DejaVu Sans,sans-serif',
+                        {110: '/path/to/verdana-widths.json'})
+    pybadges.badge(left_text='coverage', right_text='23%', font='Verdana')
+
+Tables can be generated using precalculate_text.py e.g.
+$ python3 -m pybadges.precalculate_text --font-path=/path/to/verdana.ttf \
+    --output-json-file=/path/to/verdana-widths.json
+"""
+
+import threading
+from typing import Callable, cast, Dict, List, Mapping, TextIO, Tuple, Union
+
+from pybadges import precalculated_text_measurer
+from pybadges import text_measurer
+
+DEFAULT_FONT = 'DejaVu Sans'
+DEFAULT_FONT_SIZE = 110
+
+# Font sizes, and so the widths returned by measurers, are in tenths of a
+# pixel e.g. text in the default font size is 11px high and the width of "W"
+# at that size is about 110. Divide widths by SCALE to get pixels.
+SCALE = 10
+
+TableSource = Union[str, Callable[[], text_measurer.TextMeasurer]]
+
+
+class _ScaledTextMeasurer(text_measurer.TextMeasurer):
+    """Measures text at one size using a measurer for another size."""
+
+    def __init__(self, measurer: text_measurer.TextMeasurer, scale: float):
+        self._measurer = measurer
+        self._scale = scale
+
+    def text_width(self, text: str) -> float:
+        return self._measurer.text_width(text) * self._scale
+
+    def cumulative_widths(self, text: str) -> List[float]:
+        return [
+            width * self._scale
+            for width in self._measurer.cumulative_widths(text)
+        ]
+
+    def fingerprint(self) -> str:
+        return '{0}*{1!r}'.format(self._measurer.fingerprint(), self._scale)
+
+
+class _Font:
+
+    def __init__(self, font_family: str, tables: Mapping[float, TableSource]):
+        self.font_family = font_family
+        self.tables = dict(tables)
+
+
+_fonts = {}  # type: Dict[str, _Font]
+_measurers = {}  # type: Dict[Tuple[str, float], text_measurer.TextMeasurer]
+_lock = threading.Lock()
+
+
+def _load_table_file(path: str) -> text_measurer.TextMeasurer:
+    """Load a table generated by precalculate_text.py or width_table.py."""
+    measurer_class = precalculated_text_measurer.PrecalculatedTextMeasurer
+    if path.endswith('.json.xz'):
+        import lzma
+        with lzma.open(path, 'rt', encoding='utf-8') as f:
+            return measurer_class.from_json(cast(TextIO, f))
+    elif path.endswith('.json'):
+        with open(path, 'rt', encoding='utf-8') as f:
+            return measurer_class.from_json(f)
+    else:
+        return measurer_class.from_table_file(path)
+
+
+def register_font(name: str, font_family: str,
+                  tables: Mapping[float, TableSource]) -> None:
+    """Register a font that can be used to render badges.
+
+    Args:
+        name: The name used to refer to the font e.g. "Verdana".
+        font_family: The value of the SVG font-family attribute used when
+            rendering text in this font e.g. "Verdana,Geneva,sans-serif".
+        tables: A mapping between font sizes and either the path to a table
+            generated by precalculate_text.py (or width_table.py), or a
+            callable that returns a text_measurer.TextMeasurer for that size.
+            Tables are not loaded until they are first used.
+    """
+    if not tables:
+        raise ValueError('at least one table must be provided')
+    with _lock:
+        _fonts[name] = _Font(font_family, tables)
+        for key in [k for k in _measurers if k[0] == name]:
+            del _measurers[key]
+
+
+def font_family(name: str) -> str:
+    """Returns the SVG font-family used to render the named font."""
+    try:
+        return _fonts[name].font_family
+    except KeyError:
+        raise ValueError('unknown font "{0}"'.format(name)) from None
+
+
+def _table_measurer(name: str, table_size: float,
+                    source: TableSource) -> text_measurer.TextMeasurer:
+    """Returns the measurer for one of a font's tables, loading it once."""
+    key = (name, table_size)
+    m = _measurers.get(key)
+    if m is not None:
+        return m
+
+    with _lock:
+        m = _measurers.get(key)
+        if m is None:
+            if isinstance(source, str):
+                m = _load_table_file(source)
+            else:
+                m = source()
+            _measurers[key] = m
+        return m
+
+
+def measurer(name: str = DEFAULT_FONT,
+             size: float = DEFAULT_FONT_SIZE) -> text_measurer.TextMeasurer:
+    """Returns a TextMeasurer for the named font at the given size."""
+    try:
+        font = _fonts[name]
+    except KeyError:
+        raise ValueError('unknown font "{0}"'.format(name)) from None
+
+    if size in font.tables:
+        return _table_measurer(name, size, font.tables[size])
+    table_size = min(font.tables, key=lambda s: abs(s - size))
+    # Only the tables are cached, so that sizes chosen by callers (e.g. from
+    # a request) don't grow the cache. Scaling is cheap to set up.
+    return _ScaledTextMeasurer(
+        _table_measurer(name, table_size, font.tables[table_size]),
+        size / table_size)
+
+
+register_font(
+    DEFAULT_FONT, 'DejaVu Sans,Verdana,Geneva,sans-serif', {
+        DEFAULT_FONT_SIZE:
+            precalculated_text_measurer.PrecalculatedTextMeasurer.default
+    })
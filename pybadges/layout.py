@@ -0,0 +1,124 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Calculate the geometry of a badge.
+
+The geometry only depends on the width of the badge's text and on which
+optional elements (logo, center image, right-hand text) are present, so it
+can be calculated without rendering the badge.
+
+All values are in pixels except for the text positions and lengths, which are
+in the units used by the scaled <text> elements (1/10 of a pixel).
+"""
+
+import functools
+from typing import NamedTuple, Optional
+
+HEIGHT = 20
+LOGO_WIDTH = 14
+LOGO_PADDING = 3
+CENTER_IMAGE_WIDTH = 107
+TEXT_MARGIN = 10
+IMAGE_HEIGHT = 14
+
+
+class Geometry(NamedTuple):
+    """The fixed dimensions of a badge style, in pixels."""
+    height: int = HEIGHT
+    # The horizontal space around each text.
+    text_margin: float = TEXT_MARGIN
+    logo_width: int = LOGO_WIDTH
+    # The space between the logo and the left-hand text.
+    logo_padding: int = LOGO_PADDING
+    center_image_width: int = CENTER_IMAGE_WIDTH
+    image_height: int = IMAGE_HEIGHT
+
+    @property
+    def image_y(self) -> int:
+        """The y position of images, which are vertically centered."""
+        return (self.height - self.image_height) // 2
+
+
+DEFAULT_GEOMETRY = Geometry()
+
+
+class BadgeLayout(NamedTuple):
+    """The geometry of a badge."""
+    width: float
+    height: int
+    left_width: float
+    center_x: float
+    center_width: float
+    right_x: float
+    right_width: float
+    logo_width: int
+    logo_padding: int
+    left_text_x: float
+    left_text_length: float
+    right_text_x: Optional[float]
+    right_text_length: Optional[float]
+
+
+@functools.lru_cache(maxsize=4096)
+def compute(left_text_width: float,
+            right_text_width: Optional[float],
+            has_left_text: bool = True,
+            has_logo: bool = False,
+            has_center_image: bool = False,
+            geometry: Geometry = DEFAULT_GEOMETRY) -> BadgeLayout:
+    """Calculate the geometry of a badge.
+
+    Layouts are cached, so badges with the same text widths share one
+    (immutable) BadgeLayout.
+
+    Args:
+        left_text_width: The width, in pixels, of the left-hand text.
+        right_text_width: The width, in pixels, of the right-hand text or None
+            if the badge has no right-hand text.
+        has_left_text: True if the badge has left-hand text.
+        has_logo: True if the badge has a logo.
+        has_center_image: True if the badge has a center image.
+        geometry: The fixed dimensions of the badge's style.
+    """
+    text_margin = geometry.text_margin
+    logo_width = geometry.logo_width if has_logo else 0
+    logo_padding = geometry.logo_padding if (has_logo and has_left_text) else 0
+    image_width = geometry.center_image_width if has_center_image else 0
+    left_width = left_text_width + text_margin + logo_width + logo_padding
+    center_width = image_width + text_margin if has_center_image else 0
+    if right_text_width is not None:
+        right_width = center_width + right_text_width + text_margin
+        right_text_x = (left_width + center_width / 2 + right_width / 2 -
+                        1) * 10
+        right_text_length = (right_width - center_width - text_margin) * 10
+    else:
+        right_width = 0
+        right_text_x = None
+        right_text_length = None
+
+    return BadgeLayout(
+        width=left_width + right_width,
+        height=geometry.height,
+        left_width=left_width,
+        center_x=left_width,
+        center_width=center_width,
+        right_x=left_width + center_width,
+        right_width=right_width,
+        logo_width=logo_width,
+        logo_padding=logo_padding,
+        left_text_x=(((left_width + logo_width + logo_padding) / 2) + 1) * 10,
+        left_text_length=(left_width -
+                          (text_margin + logo_width + logo_padding)) * 10,
+        right_text_x=right_text_x,
+        right_text_length=right_text_length,
+    )
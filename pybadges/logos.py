@@ -0,0 +1,279 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A registry of named logos, stored as pre-encoded data URLs.
+
+Logos are registered from a directory of images or from a bundle built by
+this module, and are then used by name:
+
+    logos.register_directory('/path/to/logos')  # Contains python.svg.
+    pybadges.badge(left_text='python', right_text='3.12', logo='python')
+
+Directories and bundles are not read until a logo is first looked up. After
+that, using a named logo costs a dict lookup, with no filesystem or network
+access, and the logo is always embedded in the badge.
+
+A bundle is a JSON object mapping names to data URLs, optionally compressed
+using lzma. If a bundle named logos.json.xz is installed in the package
+directory then it is registered automatically (pybadges itself doesn't ship
+one). To build a bundle from a directory of images, run:
+$ python3 -m pybadges.logos --input-dir=/path/to/logos \
+    --output-file=/path/to/logos.json.xz
+"""
+
+import argparse
+import base64
+import json
+import mimetypes
+import os
+import sys
+import threading
+from typing import Callable, cast, Dict, List, Mapping, Optional, TextIO
+
+import pkg_resources
+
+_PACKAGED_BUNDLE = 'logos.json.xz'
+
+_Loader = Callable[[], Mapping[str, str]]
+
+# The types of images that are recognized by their first bytes, as used in
+# data URLs e.g. "data:image/png;base64,...".
+_IMAGE_SIGNATURES = [
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpeg'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+    (b'II*\0', 'tiff'),
+    (b'MM\0*', 'tiff'),
+    (b'BM', 'bmp'),
+]
+
+_logos = {}  # type: Dict[str, str]
+# Registered sources that have not been loaded yet, in registration order.
+_pending = []  # type: List[_Loader]
+_lock = threading.Lock()
+
+
+def encode_file(path: str) -> str:
+    """Returns a data URL containing the image file at the given path.
+
+    Raises:
+        OSError: The file could not be read.
+        ValueError: The file is not an image.
+    """
+    with open(path, 'rb') as f:
+        image_data = f.read()
+    image_type = _image_type(image_data)
+    if not image_type:
+        mime_type, _ = mimetypes.guess_type(path, strict=False)
+        if not mime_type:
+            raise ValueError('not able to determine file type')
+        else:
+            content_type, image_type = mime_type.split('/')
+            if content_type != 'image':
+                raise ValueError('expected an image, got "{0}"'.format(
+                    content_type or 'unknown'))
+
+    encoded_image = base64.b64encode(image_data).decode('ascii')
+    return 'data:image/{};base64,{}'.format(image_type, encoded_image)
+
+
+def _image_type(image_data: bytes) -> Optional[str]:
+    """Returns the type of an image, determined by its first bytes."""
+    for signature, image_type in _IMAGE_SIGNATURES:
+        if image_data.startswith(signature):
+            return image_type
+    if image_data[:4] == b'RIFF' and image_data[8:12] == b'WEBP':
+        return 'webp'
+    return None
+
+
+def is_name(logo: str) -> bool:
+    """Returns True if logo could be the name of a logo.
+
+    URLs, data URLs and paths are not names, so they are used as they are
+    without looking them up.
+    """
+    return not any(c in logo for c in ':/\\')
+
+
+def _logo_name(file_name: str) -> str:
+    return os.path.splitext(file_name)[0].lower()
+
+
+def _load_directory(directory: str) -> Dict[str, str]:
+    logos = {}
+    for file_name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, file_name)
+        if not os.path.isfile(path):
+            continue
+        try:
+            logos[_logo_name(file_name)] = encode_file(path)
+        except ValueError:
+            # Not an image e.g. a README.
+            pass
+    return logos
+
+
+def _read_bundle(f: TextIO) -> Dict[str, str]:
+    logos = json.load(f)
+    if not isinstance(logos, dict):
+        raise ValueError('a logo bundle must be a JSON object')
+    return logos
+
+
+def _load_bundle(path: str) -> Dict[str, str]:
+    if path.endswith('.xz'):
+        import lzma
+        with lzma.open(path, 'rt', encoding='utf-8') as f:
+            return _read_bundle(cast(TextIO, f))
+    with open(path, 'rt', encoding='utf-8') as f:
+        return _read_bundle(f)
+
+
+def _load_packaged_bundle() -> Dict[str, str]:
+    if not pkg_resources.resource_exists(__name__, _PACKAGED_BUNDLE):
+        return {}
+    import lzma
+    with pkg_resources.resource_stream(__name__, _PACKAGED_BUNDLE) as f:
+        with lzma.open(f, 'rt', encoding='utf-8') as g:
+            return _read_bundle(cast(TextIO, g))
+
+
+def _register(loader: _Loader) -> None:
+    with _lock:
+        _pending.append(loader)
+
+
+def register_logo(name: str, data_url: str) -> None:
+    """Register a logo, given as a data URL, with the given name.
+
+    Logos registered later replace earlier logos with the same name.
+
+    Raises:
+        ValueError: The name contains ":", "/" or "\\", so it can't be told
+            apart from a URL or path.
+    """
+    if not is_name(name):
+        raise ValueError('invalid logo name "{0}"'.format(name))
+    _register(lambda: {name: data_url})
+
+
+def register_directory(directory: str) -> None:
+    """Register every image in a directory as a logo.
+
+    Each logo is named after its file, in lower case and without its
+    extension e.g. "Python.svg" => "python". Files that are not images are
+    ignored. The directory is not read until a logo is first looked up.
+    """
+    _register(lambda: _load_directory(directory))
+
+
+def register_bundle(path: str) -> None:
+    """Register the logos in a bundle built by `write_bundle`.
+
+    The bundle is not read until a logo is first looked up.
+
+    Args:
+        path: The path of the bundle. If it ends with ".xz" then it is
+            decompressed using lzma.
+    """
+    _register(lambda: _load_bundle(path))
+
+
+def _load_pending() -> None:
+    with _lock:
+        while _pending:
+            # A source that can't be loaded is dropped, so the error is only
+            # raised once rather than by every later lookup.
+            _logos.update(_pending.pop(0)())
+
+
+def get(name: str) -> Optional[str]:
+    """Returns the data URL of the named logo or None if it is not registered.
+
+    Returns None, without loading any registered logos, for URLs and paths
+    (see `is_name`).
+
+    Raises:
+        OSError, ValueError: A registered directory or bundle could not be
+            loaded. The error is only raised by the first lookup after it was
+            registered; its logos are then not available.
+    """
+    if not is_name(name):
+        return None
+    if _pending:
+        _load_pending()
+    return _logos.get(name)
+
+
+def data_url(name: str) -> str:
+    """Returns the data URL of the named logo."""
+    url = get(name)
+    if url is None:
+        raise ValueError('unknown logo "{0}"'.format(name))
+    return url
+
+
+def names() -> List[str]:
+    """Returns the names of every registered logo, sorted."""
+    if _pending:
+        _load_pending()
+    return sorted(_logos)
+
+
+def write_bundle(f: TextIO, directory: str) -> List[str]:
+    """Write a bundle containing every image in a directory to a stream.
+
+    Returns:
+        The names of the logos in the bundle.
+    """
+    logos = _load_directory(directory)
+    json.dump(logos, f, sort_keys=True, separators=(',', ':'))
+    return sorted(logos)
+
+
+_register(_load_packaged_bundle)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='build a bundle of pre-encoded logos from a directory of '
+        'images')
+
+    parser.add_argument('--input-dir',
+                        required=True,
+                        help='the directory containing the images; each logo '
+                        'is named after its file e.g. python.svg => python')
+
+    parser.add_argument(
+        '--output-file',
+        required=True,
+        help='the path where the bundle will be placed. If the filename ends '
+        'with .xz then the bundle will be compressed using lzma.')
+
+    args = parser.parse_args()
+
+    if args.output_file.endswith('.xz'):
+        import lzma
+        f = lzma.open(args.output_file, 'wt', encoding='utf-8')
+    else:
+        f = open(args.output_file, 'wt', encoding='utf-8')
+    with f:
+        logo_names = write_bundle(cast(TextIO, f), args.input_dir)
+    print('wrote {0} logos: {1}'.format(len(logo_names), ', '.join(logo_names)),
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
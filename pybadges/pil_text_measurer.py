@@ -24,16 +24,21 @@ from pybadges import text_measurer
 class PilMeasurer(text_measurer.TextMeasurer):
     """Measures the width of a string using PIL/Pillow."""
 
-    def __init__(self, deja_vu_sans_path: str):
+    def __init__(self, deja_vu_sans_path: str, font_size: int = 110):
         """Initializer for PilMeasurer.
 
         Args:
             deja_vu_sans_path: The path to the DejaVu Sans TrueType (.ttf) font
                 file.
+            font_size: The size of the font, in pixels.
         """
-        self._font = ImageFont.truetype(deja_vu_sans_path, 110)
+        self._font = ImageFont.truetype(deja_vu_sans_path, font_size)
 
     def text_width(self, text: str) -> float:
         """Returns the width, in pixels, of a string in DejaVu Sans 110pt."""
-        width, _ = self._font.getsize(text)
-        return width
+        if hasattr(self._font, 'getsize'):
+            width, _ = self._font.getsize(text)
+            return width
+        # getsize was removed in Pillow 10. The right edge of the bounding box
+        # is the same width that getsize returned.
+        return self._font.getbbox(text)[2]
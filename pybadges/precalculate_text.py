@@ -36,21 +36,61 @@ The output JSON object is formatted like:
                       distance between them is zero.
 }
 
+With --kerning-classes, 'kerning-pairs' is replaced by:
+    'kerning-classes': {
+        'first-classes': <List[str]: classes of characters that kern
+                          identically when they are the first of a pair>,
+        'second-classes': <List[str]: classes of characters that kern
+                           identically when they are the second of a pair>,
+        'kernings': <List[List[float]]: the kerning distance between every
+                     pair of first and second classes>
+    }
+(see width_table.KerningClasses). This is much smaller than 'kerning-pairs'
+when kerning is included for many characters.
+
+With --units-per-pixel=N, the table is quantized: 'units-per-pixel': N is
+added and every length and kerning distance is an integer number of 1/N
+pixels, which PrecalculatedTextMeasurer sums using integer arithmetic. See
+precalculated_text_measurer.py for how much this changes measured widths.
+
+By default, kerning is calculated for every pair of characters that can be
+encoded using --kerning-pair-encodings (cp1252), since the number of pairs
+grows quadratically with the number of characters. With
+--kerning-pairs-from-font, only the pairs listed in the font's kerning tables
+("kern" and GPOS) are measured, so kerning can be included for every
+character that the font supports e.g. Cyrillic and Greek.
+
+The table is measured and written incrementally, so the kerning pairs are
+never held in memory (except with --kerning-classes, which needs every pair to
+find the classes). The JSON is written without whitespace; with
+--output-table-file, the table is written in the binary format read by
+width_table.WidthTable instead.
+
+Measuring every pair can take hours for large fonts. With --checkpoint-file,
+progress is recorded periodically and an interrupted run that is started
+again with the same arguments continues from the last checkpoint.
+
 For information about the commands, run:
 $ python3 - m pybadges.precalculate_text --help
 """
 
 import argparse
+import collections
+import hashlib
+import heapq
 import itertools
 import json
+import os
 import os.path
 import statistics
-from typing import Iterable, Mapping, TextIO
+from typing import (Any, BinaryIO, Collection, Dict, Iterable, Iterator, List,
+                    Mapping, Optional, Set, TextIO, Tuple)
 
 from fontTools import ttLib
 
 from pybadges import pil_text_measurer
 from pybadges import text_measurer
+from pybadges import width_table
 
 
 def generate_supported_characters(deja_vu_sans_path: str) -> Iterable[str]:
@@ -83,6 +123,156 @@ def generate_encodeable_characters(characters: Iterable[str],
                 pass
 
 
+def _glyph_pair_classes(
+        font: ttLib.TTFont
+) -> Iterable[Tuple[Collection[str], Collection[str]]]:
+    """Generates (first glyphs, second glyphs) for every kerned glyph pair.
+
+    Every glyph in first glyphs may be kerned with every glyph in second
+    glyphs.
+    """
+    if 'kern' in font:
+        for table in font['kern'].kernTables:
+            for (first, second), value in table.kernTable.items():
+                if value:
+                    yield [first], [second]
+
+    if 'GPOS' not in font or not font['GPOS'].table.LookupList:
+        return
+    for lookup in font['GPOS'].table.LookupList.Lookup:
+        for subtable in lookup.SubTable:
+            lookup_type = lookup.LookupType
+            if lookup_type == 9:  # Extension.
+                lookup_type = subtable.ExtensionLookupType
+                subtable = subtable.ExtSubTable
+            if lookup_type != 2:  # Not pair adjustment.
+                continue
+            if subtable.Format == 1:
+                for first, pair_set in zip(subtable.Coverage.glyphs,
+                                           subtable.PairSet):
+                    for record in pair_set.PairValueRecord:
+                        yield [first], [record.SecondGlyph]
+            elif subtable.Format == 2:
+                first_classes = collections.defaultdict(
+                    list)  # type: Dict[int, List[str]]
+                for glyph in subtable.Coverage.glyphs:
+                    first_classes[subtable.ClassDef1.classDefs.get(
+                        glyph, 0)].append(glyph)
+                second_classes = collections.defaultdict(
+                    list)  # type: Dict[int, List[str]]
+                for glyph in font.getGlyphOrder():
+                    second_classes[subtable.ClassDef2.classDefs.get(
+                        glyph, 0)].append(glyph)
+                for i, record in enumerate(subtable.Class1Record):
+                    for j, class2_record in enumerate(record.Class2Record):
+                        value = class2_record.Value1
+                        if value and (getattr(value, 'XAdvance', 0) or
+                                      getattr(value, 'XPlacement', 0)):
+                            yield first_classes[i], second_classes[j]
+
+
+def generate_kerning_pairs(deja_vu_sans_path: str,
+                           characters: Iterable[str]) -> Iterable[str]:
+    """Generates the pairs of characters that the font at the path kerns.
+
+    The pairs are found using the font's "kern" and GPOS tables, so only pairs
+    that may have non-zero kerning are generated, rather than every pair of
+    characters.
+
+    Args:
+        deja_vu_sans_path: The path to the font.
+        characters: Only pairs of these characters are generated.
+
+    Returns:
+        The pairs of characters e.g. ['AV', 'To'], without duplicates and
+        sorted by codepoint.
+    """
+    font = ttLib.TTFont(deja_vu_sans_path)
+    characters = set(characters)
+    glyph_to_characters = collections.defaultdict(
+        list)  # type: Dict[str, List[str]]
+    for code, glyph in font.getBestCmap().items():
+        if chr(code) in characters:
+            glyph_to_characters[glyph].append(chr(code))
+
+    first_to_seconds = collections.defaultdict(set)  # type: Dict[str, Set[str]]
+    for first_glyphs, second_glyphs in _glyph_pair_classes(font):
+        seconds = [
+            c for g in second_glyphs for c in glyph_to_characters.get(g, ())
+        ]
+        if not seconds:
+            continue
+        for g in first_glyphs:
+            for a in glyph_to_characters.get(g, ()):
+                first_to_seconds[a].update(seconds)
+
+    for a in sorted(first_to_seconds):
+        for b in sorted(first_to_seconds[a]):
+            yield a + b
+
+
+def generate_overhanging_characters(measurer: text_measurer.TextMeasurer,
+                                    char_to_length: Mapping[str, float],
+                                    characters: Iterable[str]) -> Iterable[str]:
+    """Generates the characters that are measured as wider than they advance.
+
+    Some measurers (e.g. PilMeasurer) measure the ink of a character, so a
+    character whose ink extends past its advance (e.g. "í" or "_") is
+    measured as wider than the space that it takes up when followed by
+    another character. Such characters appear to be kerned with every
+    character that follows them, whether or not the font kerns them.
+    """
+    reference = 'H'
+    for c in characters:
+        kerning = (char_to_length[c] + char_to_length[reference] -
+                   measurer.text_width(c + reference))
+        if abs(kerning) > 0.05:
+            yield c
+
+
+def generate_character_lengths(
+        measurer: text_measurer.TextMeasurer,
+        characters: Iterable[str]) -> Iterator[Tuple[str, float]]:
+    """Generates (character, length in pixels) for each given character."""
+    for c in characters:
+        yield c, measurer.text_width(c)
+
+
+def _pair_kerning(measurer: text_measurer.TextMeasurer,
+                  char_to_length: Mapping[str, float],
+                  pair: str,
+                  units_per_pixel: Optional[int] = None) -> float:
+    """Returns the kerning of a pair of characters, or 0 if negligible.
+
+    If units_per_pixel is set then the kerning is returned as a whole number
+    of units of 1/units_per_pixel pixels.
+    """
+    kerned_width = measurer.text_width(pair)
+    unkerned_width = char_to_length[pair[0]] + char_to_length[pair[1]]
+    kerning = unkerned_width - kerned_width
+    if abs(kerning) <= 0.05:
+        return 0
+    if units_per_pixel:
+        return width_table.quantize(kerning, units_per_pixel)
+    return round(kerning, 3)
+
+
+def generate_pair_kernings(
+        measurer: text_measurer.TextMeasurer,
+        char_to_length: Mapping[str, float],
+        pairs: Iterable[str],
+        units_per_pixel: Optional[int] = None) -> Iterator[Tuple[str, float]]:
+    """Generates (pair, kerning) for the given pairs that have kerning.
+
+    See calculate_pair_to_kern_mapping for the meaning of the kerning. If
+    units_per_pixel is set then the kerning is quantized (see write_json).
+    """
+    for pair in pairs:
+        kerning = _pair_kerning(measurer, char_to_length, pair, units_per_pixel)
+        if kerning:
+            yield pair, kerning
+
+
 def calculate_character_to_length_mapping(
         measurer: text_measurer.TextMeasurer,
         characters: Iterable[str]) -> Mapping[str, float]:
@@ -97,11 +287,7 @@ def calculate_character_to_length_mapping(
         A mapping from the given characters to their length in pixels, as
         determined by 'measurer' e.g. {'m': 5.2, 'l', 1.2}.
     """
-    char_to_length = {}
-
-    for c in characters:
-        char_to_length[c] = measurer.text_width(c)
-    return char_to_length
+    return dict(generate_character_lengths(measurer, characters))
 
 
 def calculate_pair_to_kern_mapping(measurer: text_measurer.TextMeasurer,
@@ -127,38 +313,317 @@ def calculate_pair_to_kern_mapping(measurer: text_measurer.TextMeasurer,
         length is less than using the sum of 'char_to_length'. Zero values are
         excluded from the map e.g. {'hl': 3.1, 'ee': -0.5}.
     """
-    pair_to_kerning = {}
-    for a, b in itertools.permutations(characters, 2):
-        kerned_width = measurer.text_width(a + b)
-        unkerned_width = char_to_length[a] + char_to_length[b]
-        kerning = unkerned_width - kerned_width
-        if abs(kerning) > 0.05:
-            pair_to_kerning[a + b] = round(kerning, 3)
-    return pair_to_kerning
+    return calculate_pairs_to_kern_mapping(
+        measurer, char_to_length,
+        (a + b for a, b in itertools.product(characters, repeat=2)))
+
 
+def calculate_pairs_to_kern_mapping(
+        measurer: text_measurer.TextMeasurer,
+        char_to_length: Mapping[str, float],
+        pairs: Iterable[str],
+        units_per_pixel: Optional[int] = None) -> Mapping[str, float]:
+    """Returns a mapping between the given pairs of characters and their kerning.
+
+    Like calculate_pair_to_kern_mapping but only the given pairs (e.g. those
+    found by generate_kerning_pairs) are measured.
+    """
+    return dict(
+        generate_pair_kernings(measurer, char_to_length, pairs,
+                               units_per_pixel))
+
+
+def _unique(sorted_pairs: Iterable[str]) -> Iterator[str]:
+    return (pair for pair, _ in itertools.groupby(sorted_pairs))
+
+
+def _measure_characters(
+    deja_vu_sans_path: str, measurer: text_measurer.TextMeasurer,
+    encodings: Iterable[str], kerning_pairs_from_font: bool
+) -> Tuple[Dict[str, float], str, Iterator[str]]:
+    """Measures every character that the font supports.
+
+    Returns:
+        (character to length mapping, the kerning characters, the pairs of
+         characters to measure the kerning of). The pairs are generated
+        lazily, in a deterministic order that is sorted by codepoint.
+    """
+    supported_characters = sorted(
+        set(generate_supported_characters(deja_vu_sans_path)))
+    char_to_length = dict(
+        generate_character_lengths(measurer, supported_characters))
+    if kerning_pairs_from_font:
+        kerning_characters = ''.join(supported_characters)
+        overhanging_characters = list(
+            generate_overhanging_characters(measurer, char_to_length,
+                                            supported_characters))
+        pairs = _unique(
+            heapq.merge(
+                generate_kerning_pairs(deja_vu_sans_path, supported_characters),
+                (a + b
+                 for a in overhanging_characters
+                 for b in supported_characters)))
+    else:
+        kerning_characters = ''.join(
+            generate_encodeable_characters(supported_characters, encodings))
+        pairs = (
+            a + b for a, b in itertools.product(kerning_characters, repeat=2))
+    return char_to_length, kerning_characters, pairs
+
+
+class _JsonWriter:
+    """Writes the JSON read by PrecalculatedTextMeasurer incrementally."""
+
+    def __init__(self, f: TextIO, units_per_pixel: Optional[int] = None):
+        self._f = f
+        self._units_per_pixel = units_per_pixel
+        self._pair_count = 0
+
+    def begin(self, char_to_length: Mapping[str, float],
+              kerning_characters: str) -> None:
+        header = _table_header(char_to_length, kerning_characters,
+                               self._units_per_pixel)
+        self._f.write(
+            json.dumps(header, separators=(',', ':'))[:-1] +
+            ',"kerning-pairs":{')
+
+    def add(self, pair: str, kerning: float) -> None:
+        self._f.write('{0}{1}:{2}'.format(',' if self._pair_count else '',
+                                          json.dumps(pair),
+                                          json.dumps(kerning)))
+        self._pair_count += 1
+
+    def state(self) -> Dict[str, Any]:
+        self._f.flush()
+        return {'offset': self._f.tell(), 'pair-count': self._pair_count}
+
+    def resume(self, state: Mapping[str, Any]) -> None:
+        self._f.seek(state['offset'])
+        self._f.truncate()
+        self._pair_count = state['pair-count']
+
+    def close(self) -> None:
+        self._f.write('}}')
+
+
+def _table_header(char_to_length: Mapping[str, float], kerning_characters: str,
+                  units_per_pixel: Optional[int]) -> Dict[str, Any]:
+    """Returns every part of the JSON table except the kerning."""
+    o = {
+        'mean-character-length': statistics.mean(char_to_length.values()),
+        'character-lengths': char_to_length,
+        'kerning-characters': kerning_characters,
+    }  # type: Dict[str, Any]
+    if units_per_pixel:
+        o = width_table.quantize_json(dict(o, **{'kerning-pairs': {}}),
+                                      units_per_pixel)
+        del o['kerning-pairs']
+    return o
+
+
+class _BinaryWriter:
+    """Adapts width_table.TableWriter to the interface of _JsonWriter."""
+
+    def __init__(self, f: BinaryIO, kernings_file: Optional[BinaryIO]):
+        self._writer = width_table.TableWriter(f, kernings_file)
+        self.add = self._writer.add
+        self.state = self._writer.state
+        self.resume = self._writer.resume
+        self.close = self._writer.close
+
+    def begin(self, char_to_length: Mapping[str, float],
+              kerning_characters: str) -> None:
+        self._writer.begin(statistics.mean(char_to_length.values()),
+                           char_to_length)
+
+
+class Checkpoint:
+    """Records the progress of a run so that it can be resumed if interrupted.
+
+    A checkpoint is a small JSON file containing the number of pairs that have
+    been measured and how much of the output had been written at that point.
+    It is replaced atomically, so an interrupted run leaves either the
+    previous checkpoint or the new one. The output file must be a regular
+    file that can be truncated, so checkpoints can't be used with compressed
+    output.
+    """
 
-def write_json(f: TextIO, deja_vu_sans_path: str,
+    def __init__(self, path: str, interval: int = 100000):
+        """Initializer for Checkpoint.
+
+        Args:
+            path: The path of the checkpoint file.
+            interval: The number of pairs measured between checkpoints.
+        """
+        self.path = path
+        self.interval = interval
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def load(self, run: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+        """Returns the progress recorded by `save` or None if there is none.
+
+        Raises:
+            ValueError: The checkpoint was saved by a different run.
+        """
+        try:
+            with open(self.path, 'rt', encoding='utf-8') as f:
+                o = json.load(f)
+        except FileNotFoundError:
+            return None
+        if o.get('run') != run:
+            raise ValueError(
+                'checkpoint "{0}" was saved by a different run; delete it to '
+                'start again'.format(self.path))
+        return o['state']
+
+    def save(self, run: Mapping[str, Any], state: Mapping[str, Any]) -> None:
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'wt', encoding='utf-8') as f:
+            json.dump({'run': run, 'state': state}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def remove(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _run_description(deja_vu_sans_path: str, encodings: Iterable[str],
+                     kerning_pairs_from_font: bool, output_format: str,
+                     units_per_pixel: Optional[int],
+                     char_to_length: Mapping[str, float]) -> Dict[str, Any]:
+    """Describes a run, so that it is only resumed by an identical run."""
+    lengths = json.dumps(char_to_length, sort_keys=True).encode('utf-8')
+    return {
+        'font': os.path.abspath(deja_vu_sans_path),
+        'encodings': [] if kerning_pairs_from_font else sorted(encodings),
+        'kerning-pairs-from-font': kerning_pairs_from_font,
+        'format': output_format,
+        'units-per-pixel': units_per_pixel,
+        'character-lengths': hashlib.sha256(lengths).hexdigest(),
+    }
+
+
+def _write_incrementally(writer, deja_vu_sans_path: str,
+                         measurer: text_measurer.TextMeasurer,
+                         encodings: Iterable[str],
+                         kerning_pairs_from_font: bool, output_format: str,
+                         units_per_pixel: Optional[int],
+                         checkpoint: Optional[Checkpoint]) -> None:
+    char_to_length, kerning_characters, pairs = _measure_characters(
+        deja_vu_sans_path, measurer, encodings, kerning_pairs_from_font)
+
+    run = _run_description(deja_vu_sans_path, encodings,
+                           kerning_pairs_from_font, output_format,
+                           units_per_pixel, char_to_length)
+    state = checkpoint.load(run) if checkpoint else None
+    pairs_measured = 0
+    if state:
+        writer.resume(state['writer'])
+        pairs_measured = state['pairs-measured']
+        pairs = itertools.islice(pairs, pairs_measured, None)
+    else:
+        writer.begin(char_to_length, kerning_characters)
+
+    for pair in pairs:
+        kerning = _pair_kerning(measurer, char_to_length, pair, units_per_pixel)
+        if kerning:
+            writer.add(pair, kerning)
+        pairs_measured += 1
+        if checkpoint and pairs_measured % checkpoint.interval == 0:
+            checkpoint.save(run, {
+                'pairs-measured': pairs_measured,
+                'writer': writer.state()
+            })
+    writer.close()
+    if checkpoint:
+        checkpoint.remove()
+
+
+def write_json(f: TextIO,
+               deja_vu_sans_path: str,
                measurer: text_measurer.TextMeasurer,
-               encodings: Iterable[str]) -> None:
-    """Write the data required by PrecalculatedTextMeasurer to a stream."""
-    supported_characters = list(
-        generate_supported_characters(deja_vu_sans_path))
-    kerning_characters = ''.join(
-        generate_encodeable_characters(supported_characters, encodings))
-    char_to_length = calculate_character_to_length_mapping(
-        measurer, supported_characters)
-    pair_to_kerning = calculate_pair_to_kern_mapping(measurer, char_to_length,
-                                                     kerning_characters)
-    json.dump(
-        {
-            'mean-character-length': statistics.mean(char_to_length.values()),
-            'character-lengths': char_to_length,
-            'kerning-characters': kerning_characters,
-            'kerning-pairs': pair_to_kerning
-        },
-        f,
-        sort_keys=True,
-        indent=1)
+               encodings: Iterable[str],
+               kerning_pairs_from_font: bool = False,
+               kerning_classes: bool = False,
+               units_per_pixel: Optional[int] = None,
+               checkpoint: Optional[Checkpoint] = None) -> None:
+    """Write the data required by PrecalculatedTextMeasurer to a stream.
+
+    The JSON is written without whitespace and the kerning pairs are written
+    as they are measured.
+
+    Args:
+        f: The stream to write to. If `checkpoint` is set then it must be
+            opened for reading and writing, positioned at the start of the
+            file.
+        deja_vu_sans_path: The path to the font.
+        measurer: The TextMeasurer used to measure text in the font.
+        encodings: Kerning is calculated for the characters that can be
+            encoded using these encodings e.g. ['cp1252']. Ignored if
+            kerning_pairs_from_font is True.
+        kerning_pairs_from_font: If True then kerning is calculated for the
+            pairs listed in the font's kerning tables (and the pairs starting
+            with overhanging characters), for every character that the font
+            supports.
+        kerning_classes: If True then the kerning is written as classes of
+            characters (see width_table.KerningClasses) rather than pairs.
+            Every pair is held in memory to find the classes.
+        units_per_pixel: If set then the table is quantized: every width and
+            kerning distance is written as a whole number of units of
+            1/units_per_pixel pixels, and "units-per-pixel" is added to the
+            JSON object.
+        checkpoint: If set then progress is recorded in the checkpoint and,
+            if the checkpoint was saved by an interrupted run, the run is
+            continued. Can't be used with kerning_classes.
+    """
+    if not kerning_classes:
+        _write_incrementally(_JsonWriter(f, units_per_pixel), deja_vu_sans_path,
+                             measurer, encodings, kerning_pairs_from_font,
+                             'json', units_per_pixel, checkpoint)
+        return
+    if checkpoint:
+        raise ValueError('checkpoints can\'t be used with kerning classes')
+
+    char_to_length, kerning_characters, pairs = _measure_characters(
+        deja_vu_sans_path, measurer, encodings, kerning_pairs_from_font)
+    o = _table_header(char_to_length, kerning_characters, units_per_pixel)
+    o['kerning-classes'] = width_table.KerningClasses.from_mapping(
+        calculate_pairs_to_kern_mapping(measurer, char_to_length, pairs,
+                                        units_per_pixel)).to_json()
+    json.dump(o, f, separators=(',', ':'))
+
+
+def write_table(f: BinaryIO,
+                deja_vu_sans_path: str,
+                measurer: text_measurer.TextMeasurer,
+                encodings: Iterable[str],
+                kerning_pairs_from_font: bool = False,
+                kernings_file: Optional[BinaryIO] = None,
+                checkpoint: Optional[Checkpoint] = None) -> None:
+    """Write a table in the binary format read by width_table.WidthTable.
+
+    The kerning pairs are written as they are measured.
+
+    Args:
+        f: The stream to write to. Must be seekable. If `checkpoint` is set
+            then it must be opened for reading and writing, positioned at the
+            start of the file.
+        kernings_file: A stream to keep the kernings in until every pair has
+            been measured (see width_table.TableWriter). Must be a real file
+            that persists between runs if `checkpoint` is set.
+        checkpoint: As for write_json.
+
+    See write_json for the other arguments.
+    """
+    _write_incrementally(_BinaryWriter(f, kernings_file), deja_vu_sans_path,
+                         measurer, encodings, kerning_pairs_from_font, 'table',
+                         None, checkpoint)
 
 
 def main():
@@ -167,17 +632,42 @@ def main():
 
     parser.add_argument(
         '--deja-vu-sans-path',
+        '--font-path',
+        dest='deja_vu_sans_path',
         required=True,
-        help='the path to the ttf font file containing DejaVu Sans. If not ' +
-        'present on your system, you can download it from ' +
+        help='the path to the ttf font file containing DejaVu Sans (or the ' +
+        'font to generate a table for). If not present on your system, you ' +
+        'can download DejaVu Sans from ' +
         'https://www.fontsquirrel.com/fonts/dejavu-sans')
 
+    parser.add_argument(
+        '--font-size',
+        type=int,
+        default=110,
+        help='the font size, in pixels, to generate the table for. Tables ' +
+        'for other sizes can be derived by scaling (see fonts.py)')
+
     parser.add_argument(
         '--kerning-pair-encodings',
         action='append',
         default=['cp1252'],
         help='only include kerning pairs for the given encodings')
 
+    parser.add_argument(
+        '--kerning-pairs-from-font',
+        action='store_true',
+        default=False,
+        help='include kerning for every character supported by the font, ' +
+        'measuring only the pairs listed in the font\'s kerning tables ' +
+        '(overrides --kerning-pair-encodings)')
+
+    parser.add_argument(
+        '--kerning-classes',
+        action='store_true',
+        default=False,
+        help='store kerning as classes of characters that kern alike, ' +
+        'which is much smaller than storing every pair')
+
     parser.add_argument(
         '--output-json-file',
         default=os.path.join(os.path.dirname(__file__), 'default-widths.json'),
@@ -185,20 +675,82 @@ def main():
         'provided filename extension ends with .xz then the output' +
         'will be compressed using lzma.')
 
+    parser.add_argument(
+        '--output-table-file',
+        help='if set then the table is written to this path in the binary ' +
+        'format read by width_table.WidthTable, instead of as JSON')
+
+    parser.add_argument(
+        '--units-per-pixel',
+        type=int,
+        help='write a quantized table, where every width and kerning ' +
+        'distance is a whole number of units of 1/N pixels e.g. 64')
+
+    parser.add_argument(
+        '--checkpoint-file',
+        help='record progress in this file so that, if the run is ' +
+        'interrupted, running the same command again continues it')
+
+    parser.add_argument('--checkpoint-interval',
+                        type=int,
+                        default=100000,
+                        help='the number of pairs measured between checkpoints')
+
     args = parser.parse_args()
 
-    measurer = pil_text_measurer.PilMeasurer(args.deja_vu_sans_path)
+    output_file = args.output_table_file or args.output_json_file
+    if args.checkpoint_file and output_file.endswith('.xz'):
+        parser.error('--checkpoint-file can\'t be used with compressed output')
+    if args.checkpoint_file and args.kerning_classes:
+        parser.error('--checkpoint-file can\'t be used with --kerning-classes')
+    if args.output_table_file and args.units_per_pixel:
+        parser.error('--units-per-pixel can\'t be used with ' +
+                     '--output-table-file')
+    if args.output_table_file and args.kerning_classes:
+        parser.error('--kerning-classes can\'t be used with ' +
+                     '--output-table-file')
+
+    measurer = pil_text_measurer.PilMeasurer(args.deja_vu_sans_path,
+                                             args.font_size)
+    checkpoint = None
+    if args.checkpoint_file:
+        checkpoint = Checkpoint(args.checkpoint_file, args.checkpoint_interval)
+    # Resumed runs continue writing the existing output.
+    resume = checkpoint is not None and checkpoint.exists()
+
+    if args.output_table_file:
+        kernings_path = args.output_table_file + '.kernings'
+        mode = 'r+b' if resume else 'w+b'
+        with open(args.output_table_file, mode) as f, \
+                open(kernings_path, mode) as kernings_file:
+            write_table(f,
+                        args.deja_vu_sans_path,
+                        measurer,
+                        args.kerning_pair_encodings,
+                        kerning_pairs_from_font=args.kerning_pairs_from_font,
+                        kernings_file=kernings_file,
+                        checkpoint=checkpoint)
+        os.remove(kernings_path)
+        return
 
     def create_file():
         if args.output_json_file.endswith('.xz'):
             import lzma
-            return lzma.open(args.output_json_file, 'wt')
+            return lzma.open(args.output_json_file, 'wt', encoding='utf-8')
         else:
-            return open(args.output_json_file, 'wt')
+            return open(args.output_json_file,
+                        'r+t' if resume else 'w+t',
+                        encoding='utf-8')
 
     with create_file() as f:
-        write_json(f, args.deja_vu_sans_path, measurer,
-                   args.kerning_pair_encodings)
+        write_json(f,
+                   args.deja_vu_sans_path,
+                   measurer,
+                   args.kerning_pair_encodings,
+                   kerning_pairs_from_font=args.kerning_pairs_from_font,
+                   kerning_classes=args.kerning_classes,
+                   units_per_pixel=args.units_per_pixel,
+                   checkpoint=checkpoint)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,313 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Re-render badges whose right-hand text changes frequently.
+
+Badges that show a live value (e.g. a download count or the status of a
+build) are rendered again and again with only the right-hand text and color
+changed. A PreparedBadge does everything that depends on the rest of the
+badge once: embedding its images, measuring its left-hand text, rendering
+its template and cleaning up the SVG. Rendering a new value then only
+measures the new text and substitutes it, and the numbers that depend on its
+width, into the prepared SVG:
+
+    prepared_badge = prepared.PreparedBadge(
+        BadgeSpec(left_text='downloads', right_text='0', logo='python'))
+    svg = prepared_badge.render(right_text='1.2M', right_color='green')
+
+The result is identical to rendering the badge in full i.e. to
+`pybadges.badge(spec.replace(right_text='1.2M', right_color='green'))`.
+Badges that can't be prepared (e.g. those whose style's template does
+arithmetic with the width of the right-hand text) are rendered in full,
+but their images are still only embedded once.
+"""
+
+import html
+import re
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from xml.dom import minidom
+
+import pybadges
+from pybadges import colors
+from pybadges import fonts
+from pybadges import styles
+from pybadges import text_fitting
+from pybadges import text_measurer
+from pybadges.badge_spec import BadgeSpec
+
+# The values that change with the right-hand text, in the order that they
+# are numbered in markers.
+_WIDTH = 0
+_RIGHT_WIDTH = 1
+_RIGHT_TEXT_X = 2
+_RIGHT_TEXT_LENGTH = 3
+_RIGHT_FONT_SIZE = 4
+_RIGHT_TEXT = 5
+_RIGHT_COLOR = 6
+
+# A marker is rendered into the SVG in place of a changing value. It is made
+# of private use characters, so it is unchanged by escaping and by the DOM
+# cleanup. "n" marks a number formatted by the "num" filter and "s" a value
+# formatted by str().
+_MARKER_START = '\ue000'
+_MARKER = re.compile('\ue000([0-9])([ns])\ue001')
+
+# Characters that can't appear in an XML document, so that text containing
+# them must be rendered in full (which raises an error).
+_INVALID_XML = re.compile(
+    '[^\t\n\r\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]')
+
+
+def _marker(value: int, kind: str) -> str:
+    return '\ue000{0}{1}\ue001'.format(value, kind)
+
+
+class _Number(float):
+    """A stand-in, rendered as a marker, for a number that changes."""
+
+    def __new__(cls, value: int) -> '_Number':
+        number = super().__new__(cls, 1.0)
+        number.value = value
+        return number
+
+    def __format__(self, format_spec: str) -> str:
+        # The "num" filter formats with ".2f". Any other format is left as a
+        # number, which fails the check against a full render in _template.
+        if format_spec == '.2f':
+            return _marker(self.value, 'n')
+        return format(float(self), format_spec)
+
+    def __str__(self) -> str:
+        return _marker(self.value, 's')
+
+
+def _escapes() -> Tuple[Dict[int, str], Dict[int, str]]:
+    """Returns how characters in text and attributes end up in a badge.
+
+    Templates escape their values, which are then parsed and serialized again
+    by the DOM cleanup. The returned str.translate tables map each character
+    that this changes to how it appears in text and attribute values.
+    """
+    text_table = {}
+    attribute_table = {}
+    for c in '&<>"\'\t\n\r':
+        xml = minidom.parseString('<a b="{0}">{0}</a>'.format(
+            html.escape(c))).documentElement.toxml()
+        attribute_end = xml.index('"', len('<a b="'))
+        attribute_table[ord(c)] = xml[len('<a b="'):attribute_end]
+        text_table[ord(c)] = xml[attribute_end + len('">'):-len('</a>')]
+    return text_table, attribute_table
+
+
+_TEXT_ESCAPES, _ATTRIBUTE_ESCAPES = _escapes()
+
+
+class _Slot(NamedTuple):
+    """Where a changing value is substituted into a prepared badge."""
+    value: int
+    kind: str
+    in_attribute: bool
+
+
+class _Template(NamedTuple):
+    """A rendered badge split around the values that change."""
+    # One more part than slots; the slots go between the parts.
+    parts: List[str]
+    slots: List[_Slot]
+
+
+def _split(svg: str) -> Optional[_Template]:
+    """Splits a badge rendered with markers into a _Template.
+
+    Returns None if a changing value is not in a form that can be
+    substituted.
+    """
+    parts = []
+    slots = []
+    start = 0
+    for match in _MARKER.finditer(svg):
+        prefix = svg[:match.start()]
+        # Markup characters are escaped in values, so the marker is in a tag
+        # if the last one before it opened a tag.
+        in_attribute = prefix.rfind('<') > prefix.rfind('>')
+        if not in_attribute and not (prefix.endswith('>') and
+                                     svg.startswith('<', match.end())):
+            # The DOM cleanup strips text, which is only substituted correctly
+            # if the value is the whole text.
+            return None
+        parts.append(svg[start:match.start()])
+        slots.append(_Slot(int(match.group(1)), match.group(2), in_attribute))
+        start = match.end()
+    parts.append(svg[start:])
+    if any(_MARKER_START in part for part in parts):
+        return None
+    return _Template(parts, slots)
+
+
+class PreparedBadge:
+    """A badge that can be rendered quickly with different right-hand text.
+
+    A PreparedBadge can be used concurrently by many threads.
+    """
+
+    def __init__(self,
+                 spec: BadgeSpec,
+                 measurer: Optional[text_measurer.TextMeasurer] = None):
+        """Initializer for PreparedBadge.
+
+        The badge's images are embedded here, so this may raise the same
+        exceptions as pybadges.badge().
+
+        Args:
+            spec: The badge. Its right-hand text and color are used when
+                `render` is not given others.
+            measurer: A text_measurer.TextMeasurer that can be used to measure
+                the width of the badge's text. If not set then the measurer
+                registered for the spec's font is used.
+        """
+        if measurer is None:
+            measurer = fonts.measurer(spec.font, spec.font_size)
+        self._spec = spec
+        self._measurer = measurer
+        self._images = pybadges._embed_images(spec)
+        self._style = styles.get(spec.style)
+        self._text_measurer = self._style.text_measurer(measurer)
+        self._left, _ = pybadges._fit_texts(measurer, self._style,
+                                            spec.left_text, None,
+                                            spec.max_left_text_width, None,
+                                            spec.text_overflow)
+        # Templates that can't be prepared are rendered in full. Markers are
+        # only found reliably if values are escaped and don't contain them.
+        autoescape = pybadges._JINJA2_ENVIRONMENT.autoescape
+        if callable(autoescape):
+            autoescape = autoescape(self._style.template_name(spec.optimize))
+        self._preparable = bool(autoescape) and not any(
+            isinstance(value, str) and _MARKER_START in value
+            for value in spec.as_dict().values())
+        # Keyed by whether the right-hand text has a font size, which changes
+        # the badge's elements.
+        self._templates = {}  # type: Dict[bool, Optional[_Template]]
+        self._lock = threading.Lock()
+
+    @property
+    def spec(self) -> BadgeSpec:
+        """The badge that was prepared."""
+        return self._spec
+
+    def _fit(self, right_text: str) -> text_fitting.FittedText:
+        if self._style.uppercase:
+            right_text = right_text.upper()
+        return pybadges._fit_text(self._text_measurer, right_text,
+                                  self._spec.max_right_text_width,
+                                  self._spec.text_overflow)
+
+    def _render_in_full(self, right_text: Optional[str],
+                        right_color: str) -> str:
+        spec = self._spec.replace(right_text=right_text,
+                                  right_color=right_color)
+        return pybadges._render_element(spec,
+                                        self._measurer,
+                                        images=self._images).toxml()
+
+    def _substitute(self, template: _Template, right: text_fitting.FittedText,
+                    right_color: str) -> str:
+        badge_layout = pybadges._compute_layout(self._spec, self._style,
+                                                self._images, self._left, right)
+        values = (badge_layout.width, badge_layout.right_width,
+                  badge_layout.right_text_x, badge_layout.right_text_length,
+                  pybadges._font_size(self._spec,
+                                      right), right.text, right_color)
+        parts = template.parts
+        pieces = [parts[0]]
+        for slot, part in zip(template.slots, parts[1:]):
+            value = values[slot.value]
+            if slot.kind == 'n':
+                s = pybadges._format_number(value)
+            else:
+                s = str(value).replace('\r\n', '\n')
+            if slot.in_attribute:
+                s = s.translate(_ATTRIBUTE_ESCAPES)
+            else:
+                s = s.strip().translate(_TEXT_ESCAPES)
+            pieces.append(s)
+            pieces.append(part)
+        return ''.join(pieces)
+
+    def _prepare_template(self, has_font_size: bool) -> Optional[_Template]:
+        """Renders the badge with markers in place of the changing values."""
+        badge_layout = pybadges._compute_layout(
+            self._spec, self._style, self._images, self._left,
+            text_fitting.FittedText('', 0, None))._replace(
+                width=_Number(_WIDTH),
+                right_width=_Number(_RIGHT_WIDTH),
+                right_text_x=_Number(_RIGHT_TEXT_X),
+                right_text_length=_Number(_RIGHT_TEXT_LENGTH))
+        svg = pybadges._render_template(
+            self._spec, self._style, self._images, badge_layout, self._left,
+            _marker(_RIGHT_TEXT, 's'),
+            _Number(_RIGHT_FONT_SIZE) if has_font_size else None,
+            _marker(_RIGHT_COLOR, 's'))
+        return _split(pybadges._clean_up(svg).toxml())
+
+    def _template(self, right: text_fitting.FittedText,
+                  right_text: str) -> Optional[_Template]:
+        has_font_size = right.scale is not None
+        if has_font_size in self._templates:
+            return self._templates[has_font_size]
+        with self._lock:
+            if has_font_size not in self._templates:
+                template = self._prepare_template(has_font_size)
+                # Check the template against a full render, with this text and
+                # with wider text, to catch templates that use the changing
+                # values in ways that can't be substituted.
+                for text in (right_text, right_text + 'W'):
+                    fitted = self._fit(text)
+                    if (template is not None and
+                        (fitted.scale is not None) == has_font_size and
+                            self._substitute(
+                                template, fitted,
+                                self._spec.right_color) != self._render_in_full(
+                                    text, self._spec.right_color)):
+                        template = None
+                self._templates[has_font_size] = template
+            return self._templates[has_font_size]
+
+    def render(self,
+               right_text: Optional[str] = None,
+               right_color: Optional[str] = None) -> str:
+        """Renders the badge with the given right-hand text and color.
+
+        Args:
+            right_text: The text that should appear on the right-hand-side of
+                the badge e.g. "23%". Defaults to the spec's right-hand text.
+            right_color: The color of the part of the badge containing the
+                right-hand text. Defaults to the spec's right-hand color.
+
+        Returns:
+            The same SVG image as pybadges.badge() for the spec with
+            `right_text` and `right_color` replaced.
+        """
+        if right_text is None:
+            right_text = self._spec.right_text
+        right_color = colors.resolve(
+            right_color if right_color is not None else self._spec.right_color)
+        # Text that is stripped to nothing by the DOM cleanup becomes an empty
+        # element e.g. <text/>, which can't be substituted.
+        if (self._preparable and right_text and right_text.strip() and
+                not _INVALID_XML.search(right_text)):
+            right = self._fit(right_text)
+            template = self._template(right, right_text)
+            if template is not None:
+                return self._substitute(template, right, right_color)
+        return self._render_in_full(right_text, right_color)
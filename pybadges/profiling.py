@@ -0,0 +1,136 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure the time spent in each phase of rendering a badge.
+
+Used by the --profile and --repeat flags of `python -m pybadges`:
+
+    timer = profiling.PhaseTimer()
+    svg = profiling.render(spec, timer=timer, repeat=100)
+    print(timer.report())
+"""
+
+import contextlib
+import cProfile
+import platform
+import time
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional
+
+import pybadges
+from pybadges import text_measurer
+from pybadges.badge_spec import BadgeSpec
+from pybadges.version import __version__
+
+# The phases of rendering a badge, in the order that they happen.
+MEASURER_LOAD = 'measurer load'
+EMBED = 'embed'
+MEASURE = 'measure'
+TEMPLATE_RENDER = 'template render'
+DOM_CLEANUP = 'dom cleanup'
+SERIALIZE = 'serialize'
+PHASES = (MEASURER_LOAD, EMBED, MEASURE, TEMPLATE_RENDER, DOM_CLEANUP,
+          SERIALIZE)
+
+
+class PhaseTimer:
+    """Accumulates the time spent in named phases."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self.seconds = {}  # type: Dict[str, float]
+        self.renders = 0
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """A context manager that adds the time spent in it to phase `name`."""
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.seconds[name] = (self.seconds.get(name, 0.0) + self._clock() -
+                                  start)
+
+    def report(self) -> str:
+        """Returns a human-readable table of the time spent in each phase.
+
+        Times are shown as the total and as the mean per render. The versions
+        of pybadges and Python are included so that reports from different
+        machines and releases can be compared.
+        """
+        renders = max(self.renders, 1)
+        total = sum(self.seconds.values())
+        names = [p for p in PHASES if p in self.seconds
+                ] + [p for p in sorted(self.seconds) if p not in PHASES]
+        lines = [
+            'pybadges {0}, {1} {2}, {3} render(s)'.format(
+                __version__, platform.python_implementation(),
+                platform.python_version(), self.renders),
+            '{0:<16} {1:>12} {2:>14} {3:>6}'.format('phase', 'total ms',
+                                                    'ms per render', '%'),
+        ]  # type: List[str]
+        for name in names + ['total']:
+            seconds = total if name == 'total' else self.seconds[name]
+            lines.append('{0:<16} {1:>12.3f} {2:>14.4f} {3:>6.1f}'.format(
+                name, seconds * 1000, seconds * 1000 / renders,
+                100 * seconds / total if total else 0))
+        return '\n'.join(lines)
+
+
+class _NullTimer:
+    """A PhaseTimer that does nothing, used when rendering isn't profiled."""
+
+    _NULL_CONTEXT = contextlib.nullcontext()
+
+    def phase(self, name: str) -> ContextManager[None]:
+        return self._NULL_CONTEXT
+
+
+NULL_TIMER = _NullTimer()
+
+
+def render(spec: BadgeSpec,
+           measurer: Optional[text_measurer.TextMeasurer] = None,
+           timer: Optional[PhaseTimer] = None,
+           repeat: int = 1,
+           profile_path: Optional[str] = None) -> str:
+    """Renders a badge `repeat` times, timing each phase.
+
+    Args:
+        spec: The badge to render.
+        measurer: The measurer to use, as for pybadges.badge().
+        timer: The PhaseTimer to record the time spent in each phase in.
+        repeat: The number of times to render the badge.
+        profile_path: If set then the renders are also profiled using
+            cProfile and the statistics are written to this path, in the
+            format read by the pstats module.
+
+    Returns:
+        The rendered badge.
+    """
+    if timer is None:
+        timer = PhaseTimer()
+    profiler = cProfile.Profile() if profile_path else None
+    svg = ''
+    if profiler:
+        profiler.enable()
+    try:
+        for _ in range(repeat):
+            element = pybadges._render_element(spec, measurer, timer)
+            with timer.phase(SERIALIZE):
+                svg = element.toxml()
+            timer.renders += 1
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+    return svg
@@ -0,0 +1,338 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A persistent cache of rendered badges that can be shared by processes.
+
+Rendered badges are stored in an SQLite database so that short-lived
+processes (e.g. CI jobs or cron jobs) benefit from badges rendered by earlier
+processes. Entries are keyed on the normalized badge arguments, the pybadges
+version, a fingerprint of the text width tables, the badge's style and
+template and the content of its named logo, so upgrading pybadges or changing
+the tables, styles or logos never returns stale badges. When the cache grows
+beyond its maximum size, the least recently used badges are removed.
+
+    cache = render_cache.RenderCache('/var/cache/pybadges.sqlite')
+    svg = cache.badge(left_text='coverage', right_text='23%')
+
+To inspect or prune the cache from the command line, run:
+$ python3 -m pybadges.render_cache --help
+"""
+
+import argparse
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Union
+
+import pybadges
+from pybadges import fonts
+from pybadges import logos
+from pybadges import styles
+from pybadges import text_measurer
+from pybadges.badge_spec import BadgeSpec
+from pybadges.version import __version__
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TOUCH_INTERVAL = 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS badges (
+    key TEXT PRIMARY KEY,
+    svg BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS badges_last_used ON badges (last_used);
+BEGIN IMMEDIATE;
+-- The total size of the badges, kept up to date by triggers so that it
+-- doesn't have to be summed for every write.
+CREATE TABLE IF NOT EXISTS badges_size (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    total INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO badges_size (id, total)
+    SELECT 0, COALESCE(SUM(size), 0) FROM badges;
+CREATE TRIGGER IF NOT EXISTS badges_inserted AFTER INSERT ON badges BEGIN
+    UPDATE badges_size SET total = total + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS badges_updated AFTER UPDATE OF size ON badges
+BEGIN
+    UPDATE badges_size SET total = total - OLD.size + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS badges_deleted AFTER DELETE ON badges BEGIN
+    UPDATE badges_size SET total = total - OLD.size;
+END;
+COMMIT;
+"""
+
+# The number of least recently used badges considered for eviction at once.
+_EVICTION_BATCH = 16
+
+
+def _spec_from_args(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> BadgeSpec:
+    spec, measurer = pybadges._spec_from_args(args, kwargs)
+    if measurer is not None:
+        raise TypeError("measurer may not be given, the cache's is used")
+    return spec
+
+
+class CacheStats(NamedTuple):
+    """Statistics about the contents of a RenderCache."""
+    entries: int
+    total_bytes: int
+
+
+class RenderCache:
+    """A persistent, size-bounded cache of rendered badges.
+
+    A RenderCache can be used concurrently by many threads and processes.
+    """
+
+    def __init__(self,
+                 path: str,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 measurer: Optional[text_measurer.TextMeasurer] = None,
+                 timeout: float = 30,
+                 touch_interval: float = DEFAULT_TOUCH_INTERVAL):
+        """Initializer for RenderCache.
+
+        Args:
+            path: The path of the SQLite database file. It is created if it
+                does not exist.
+            max_bytes: The maximum total size of the cached badges. The least
+                recently used badges are removed when it is exceeded.
+            measurer: The text_measurer.TextMeasurer used to render badges. It
+                must have a `fingerprint` method. If None then the measurer
+                registered for each badge's font is used.
+            timeout: The number of seconds to wait for another process to
+                release the database before failing.
+            touch_interval: A badge's last use is only recorded if it was
+                last recorded at least this many seconds ago, so that reading
+                popular badges rarely writes to the database. Eviction is
+                only this precise.
+        """
+        self._path = path
+        self._max_bytes = max_bytes
+        self._measurer = measurer
+        self._timeout = timeout
+        self._touch_interval = touch_interval
+        self._local = threading.local()
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self._path,
+                                         timeout=self._timeout,
+                                         isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+        return connection
+
+    def _key(self, spec: BadgeSpec) -> str:
+        measurer = self._measurer or fonts.measurer(spec.font, spec.font_size)
+        try:
+            measurer_fingerprint = measurer.fingerprint()
+        except AttributeError:
+            raise ValueError(
+                '{0} cannot be used with a RenderCache because it has no '
+                'fingerprint method'.format(type(measurer).__name__)) from None
+        style = styles.get(spec.style)
+        template_fingerprint = pybadges._template_fingerprint(
+            style.template_name(spec.optimize))
+        logo = logos.get(spec.logo) if spec.logo else None
+        logo_fingerprint = (hashlib.sha256(logo.encode('utf-8')).hexdigest()
+                            if logo is not None else '')
+        key = '\0'.join([
+            __version__, measurer_fingerprint,
+            spec.fingerprint(),
+            repr(style), template_fingerprint, logo_fingerprint
+        ])
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def get(self, spec: BadgeSpec) -> Optional[str]:
+        """Returns the cached rendering of a badge or None if not cached."""
+        data = self.get_bytes(spec)
+        if data is None:
+            return None
+        return data.decode('utf-8')
+
+    def get_bytes(self, spec: BadgeSpec) -> Optional[bytes]:
+        """Returns the cached, UTF-8 encoded rendering of a badge or None.
+
+        Badges are stored encoded, so they are returned without any decoding
+        or re-encoding.
+        """
+        key = self._key(spec)
+        connection = self._connection()
+        row = connection.execute(
+            'SELECT svg, last_used FROM badges WHERE key = ?',
+            (key,)).fetchone()
+        if row is None:
+            return None
+        data, last_used = row
+        now = time.time()
+        if now - last_used >= self._touch_interval:
+            connection.execute('UPDATE badges SET last_used = ? WHERE key = ?',
+                               (now, key))
+        return bytes(data)
+
+    def put(self, spec: BadgeSpec, svg: Union[str, bytes]) -> None:
+        """Stores the rendering of a badge, evicting old badges if needed.
+
+        Args:
+            spec: The badge that was rendered.
+            svg: The rendered badge, either as a str or UTF-8 encoded.
+        """
+        data = svg.encode('utf-8') if isinstance(svg, str) else bytes(svg)
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            # Not INSERT OR REPLACE, whose deletion doesn't fire triggers.
+            connection.execute(
+                'INSERT INTO badges (key, svg, size, last_used) '
+                'VALUES (?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET '
+                'svg = excluded.svg, size = excluded.size, '
+                'last_used = excluded.last_used',
+                (self._key(spec), data, len(data), time.time()))
+            self._evict(connection, self._max_bytes)
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def badge(self, *args: Any, **kwargs: Any) -> str:
+        """Returns a badge from the cache, rendering it if necessary.
+
+        Accepts the same arguments as pybadges.badge() except `measurer`.
+        """
+        spec = _spec_from_args(args, kwargs)
+        svg = self.get(spec)
+        if svg is None:
+            svg = pybadges.badge(spec, measurer=self._measurer)
+            self.put(spec, svg)
+        return svg
+
+    def badge_bytes(self, *args: Any, **kwargs: Any) -> bytes:
+        """Returns a UTF-8 encoded badge from the cache, rendering if needed.
+
+        Accepts the same arguments as pybadges.badge() except `measurer`.
+        """
+        spec = _spec_from_args(args, kwargs)
+        data = self.get_bytes(spec)
+        if data is None:
+            data = pybadges.badge_bytes(spec, measurer=self._measurer)
+            self.put(spec, data)
+        return data
+
+    @staticmethod
+    def _evict(connection: sqlite3.Connection, max_bytes: int) -> int:
+        removed = 0
+        total, = connection.execute('SELECT total FROM badges_size').fetchone()
+        while total > max_bytes:
+            sizes = connection.execute(
+                'SELECT size FROM badges ORDER BY last_used LIMIT ?',
+                (_EVICTION_BATCH,)).fetchall()
+            if not sizes:
+                break
+            # Only remove as many of the batch as are needed to fit.
+            count = 0
+            excess = total - max_bytes
+            for size, in sizes:
+                count += 1
+                excess -= size
+                if excess <= 0:
+                    break
+            removed += connection.execute(
+                'DELETE FROM badges WHERE key IN '
+                '(SELECT key FROM badges ORDER BY last_used LIMIT ?)',
+                (count,)).rowcount
+            total, = connection.execute(
+                'SELECT total FROM badges_size').fetchone()
+        return removed
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """Removes least recently used badges until the cache fits max_bytes.
+
+        Returns:
+            The number of badges removed.
+        """
+        if max_bytes is None:
+            max_bytes = self._max_bytes
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            removed = self._evict(connection, max_bytes)
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+        return removed
+
+    def clear(self) -> None:
+        """Removes every badge from the cache."""
+        self._connection().execute('DELETE FROM badges')
+
+    def stats(self) -> CacheStats:
+        """Returns the number and total size of the cached badges."""
+        entries, total_bytes = self._connection().execute(
+            'SELECT (SELECT COUNT(*) FROM badges), total FROM badges_size'
+        ).fetchone()
+        return CacheStats(entries, total_bytes)
+
+    def close(self) -> None:
+        """Closes the calling thread's connection to the database."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='inspect or prune a persistent cache of rendered badges')
+
+    parser.add_argument('--cache-path',
+                        required=True,
+                        help='the path of the SQLite cache database')
+
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+    subparsers.add_parser('stats',
+                          help='show the number and size of cached badges')
+    prune_parser = subparsers.add_parser(
+        'prune', help='remove least recently used badges')
+    prune_parser.add_argument(
+        '--max-bytes',
+        type=int,
+        default=DEFAULT_MAX_BYTES,
+        help='remove badges until the cache is no larger than this')
+    subparsers.add_parser('clear', help='remove every cached badge')
+
+    args = parser.parse_args()
+
+    cache = RenderCache(args.cache_path)
+    if args.command == 'stats':
+        stats = cache.stats()
+        print('entries: {0}\nbytes: {1}'.format(stats.entries,
+                                                stats.total_bytes))
+    elif args.command == 'prune':
+        print('removed: {0}'.format(cache.prune(args.max_bytes)))
+    elif args.command == 'clear':
+        cache.clear()
+    cache.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Coalesce concurrent calls that compute the same value.
+
+When several threads ask for the same key at the same time, only the first
+one calls the function; the others wait for it and receive the same result
+(or exception). AsyncGroup does the same for coroutines.
+
+>>> group = Group()
+>>> group.do('answer', lambda: 42)
+42
+"""
+
+import asyncio
+import threading
+from typing import (Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple)
+
+_AsyncCallKey = Tuple[asyncio.AbstractEventLoop, Hashable]
+
+
+class _Call:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None  # type: Any
+        self.error = None  # type: Optional[BaseException]
+
+
+class Group:
+    """Coalesces concurrent calls with the same key into one call."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # type: Dict[Hashable, _Call]
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Returns fn(), sharing the call with concurrent callers of key.
+
+        If another thread is already running a call for key then this waits
+        for it to finish and returns its result, or raises its exception,
+        instead of calling fn.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Returns True if a call for key is currently running."""
+        with self._lock:
+            return key in self._calls
+
+
+class _AsyncCall:
+
+    def __init__(self, task: 'asyncio.Future[Any]'):
+        self.task = task
+        # The number of tasks awaiting the call.
+        self.callers = 0
+
+
+class AsyncGroup:
+    """Coalesces concurrent coroutine calls with the same key into one call.
+
+    An AsyncGroup may be used from several event loops; calls are only
+    coalesced with other calls in the same loop.
+    """
+
+    def __init__(self):
+        self._calls = {}  # type: Dict[_AsyncCallKey, _AsyncCall]
+
+    def _remove(self, call_key: _AsyncCallKey, call: _AsyncCall) -> None:
+        if self._calls.get(call_key) is call:
+            del self._calls[call_key]
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Returns await fn(), sharing the call with concurrent callers of key.
+
+        If another task is already awaiting a call for key then this waits
+        for it to finish and returns its result, or raises its exception,
+        instead of calling fn. The call runs in its own task, so cancelling
+        a waiting task, including the one that started the call, does not
+        cancel it for the others. The call is only cancelled once every task
+        waiting for it has been cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        call_key = (loop, key)
+        call = self._calls.get(call_key)
+        if call is None:
+            call = self._calls[call_key] = _AsyncCall(
+                asyncio.ensure_future(fn()))
+            call.task.add_done_callback(
+                lambda _, call=call: self._remove(call_key, call))
+
+        call.callers += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.callers -= 1
+            if not call.callers and not call.task.done():
+                # Nobody wants the result any more. Later callers start a new
+                # call rather than joining one that is being cancelled.
+                self._remove(call_key, call)
+                call.task.cancel()
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Returns True if a call for key is running in the current loop."""
+        return (asyncio.get_running_loop(), key) in self._calls
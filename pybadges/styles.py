@@ -0,0 +1,190 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A registry of badge styles e.g. "flat" and "for-the-badge".
+
+A style declares the geometry of a badge (its height, margins, etc.), how its
+text is drawn and the templates used to render it. The built-in styles are
+those offered by shields.io: "flat" (the default), "flat-square", "plastic"
+and "for-the-badge".
+
+    pybadges.badge(left_text='build', right_text='passing', style='plastic')
+
+New styles can reuse the built-in templates with different parameters or
+provide their own Jinja2 templates, which are passed the same variables as
+badge-template-full.svg:
+
+    styles.register_style(
+        styles.Style(name='tall', template='tall.svg',
+                     geometry=layout.Geometry(height=30)),
+        template_sources={'tall.svg': '<svg ...'})
+
+Templates are compiled once and layouts are cached per geometry, so rendering
+a badge in any style costs the same as rendering it in the default style.
+"""
+
+import threading
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from pybadges import fonts
+from pybadges import layout
+from pybadges import text_measurer
+
+DEFAULT_STYLE = 'flat'
+
+FULL_TEMPLATE = 'badge-template-full.svg'
+OPTIMIZED_TEMPLATE = 'badge-template-optimized.svg'
+
+# A stop of the gradient drawn over the badge: (offset, color, opacity). If
+# color is None then the SVG default (black) is used.
+GradientStop = Tuple[str, Optional[str], str]
+
+
+class Style(NamedTuple):
+    """How a badge is drawn."""
+    name: str
+    # The name of the template used to render the badge.
+    template: str = FULL_TEMPLATE
+    # The name of the template used when `optimize=True` or None to use
+    # `template`.
+    optimized_template: Optional[str] = None
+    geometry: layout.Geometry = layout.DEFAULT_GEOMETRY
+    # The radius of the badge's corners, in pixels.
+    corner_radius: float = 3
+    # The gradient drawn over the badge. If empty then no gradient is drawn.
+    gradient: Tuple[GradientStop,
+                    ...] = (('0', '#bbb', '.1'), ('1', None, '.1'))
+    # If True then a shadow is drawn beneath the text.
+    text_shadow: bool = True
+    # The baseline of the text, in tenths of a pixel. The shadow is drawn one
+    # pixel lower.
+    text_y: int = 140
+    # If True then the text is shown in upper case.
+    uppercase: bool = False
+    # The space added after every character, in pixels.
+    letter_spacing: float = 0
+    # The SVG font-weight of the text e.g. "bold" or None for the default.
+    font_weight: Optional[str] = None
+
+    def template_name(self, optimize: bool) -> str:
+        """Returns the name of the template used to render the badge."""
+        if optimize and self.optimized_template:
+            return self.optimized_template
+        return self.template
+
+    def text_measurer(
+            self,
+            measurer: text_measurer.TextMeasurer) -> text_measurer.TextMeasurer:
+        """Returns a measurer for text in this style, based on `measurer`."""
+        if not self.letter_spacing:
+            return measurer
+        return _LetterSpacedTextMeasurer(measurer,
+                                         self.letter_spacing * fonts.SCALE)
+
+
+class _LetterSpacedTextMeasurer(text_measurer.TextMeasurer):
+    """Measures text with extra space after every character."""
+
+    def __init__(self, measurer: text_measurer.TextMeasurer, spacing: float):
+        self._measurer = measurer
+        self._spacing = spacing
+
+    def text_width(self, text: str) -> float:
+        return self._measurer.text_width(text) + self._spacing * len(text)
+
+    def cumulative_widths(self, text: str) -> List[float]:
+        return [
+            width + self._spacing * (i + 1)
+            for i, width in enumerate(self._measurer.cumulative_widths(text))
+        ]
+
+    def fingerprint(self) -> str:
+        return '{0}+{1!r}'.format(self._measurer.fingerprint(), self._spacing)
+
+
+_styles = {}  # type: Dict[str, Style]
+# The source of every template registered with a style, keyed by name. Read
+# by pybadges' Jinja2 loader.
+_template_sources = {}  # type: Dict[str, str]
+_lock = threading.Lock()
+
+
+def register_style(
+        style: Style,
+        template_sources: Optional[Mapping[str, str]] = None) -> None:
+    """Register a style that can be used to render badges.
+
+    Registering a style with the same name as an existing one replaces it.
+
+    Args:
+        style: The style to register.
+        template_sources: A mapping between template names and the Jinja2
+            source of the templates used by the style. Not needed if the
+            style uses the built-in templates or templates registered by
+            another style.
+
+    Raises:
+        ValueError: A template with the same name but different source has
+            already been registered. Compiled templates are cached, so
+            templates can't be changed once registered.
+    """
+    with _lock:
+        for name, source in (template_sources or {}).items():
+            if name in (FULL_TEMPLATE,
+                        OPTIMIZED_TEMPLATE) or (_template_sources.get(
+                            name, source) != source):
+                raise ValueError(
+                    'template "{0}" is already registered'.format(name))
+        _template_sources.update(template_sources or {})
+        _styles[style.name] = style
+
+
+def get(name: str) -> Style:
+    """Returns the named style."""
+    try:
+        return _styles[name]
+    except KeyError:
+        raise ValueError('unknown style "{0}"'.format(name)) from None
+
+
+def names() -> List[str]:
+    """Returns the names of every registered style, sorted."""
+    return sorted(_styles)
+
+
+register_style(Style(name='flat', optimized_template=OPTIMIZED_TEMPLATE))
+register_style(
+    Style(name='flat-square',
+          optimized_template=OPTIMIZED_TEMPLATE,
+          corner_radius=0,
+          gradient=(),
+          text_shadow=False))
+register_style(
+    Style(name='plastic',
+          optimized_template=OPTIMIZED_TEMPLATE,
+          geometry=layout.Geometry(height=18),
+          corner_radius=4,
+          gradient=(('0', '#fff', '.7'), ('.1', '#aaa', '.1'),
+                    ('.9', '#000', '.3'), ('1', '#000', '.5')),
+          text_y=130))
+register_style(
+    Style(name='for-the-badge',
+          optimized_template=OPTIMIZED_TEMPLATE,
+          geometry=layout.Geometry(height=28, text_margin=24),
+          corner_radius=0,
+          gradient=(),
+          text_shadow=False,
+          text_y=175,
+          uppercase=True,
+          letter_spacing=1.25,
+          font_weight='bold'))
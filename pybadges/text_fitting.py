@@ -0,0 +1,77 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Fit text into a maximum width by truncating it or shrinking its font.
+
+All widths are in the units returned by text_measurer.TextMeasurer i.e.
+pixels of DejaVu Sans 110pt.
+"""
+
+import bisect
+from typing import NamedTuple, Optional
+
+from pybadges import text_measurer
+
+ELLIPSIS = '…'
+
+# The ways that text that is too wide can be made to fit.
+TEXT_OVERFLOW_ELLIPSIS = 'ellipsis'
+TEXT_OVERFLOW_SHRINK = 'shrink'
+TEXT_OVERFLOWS = frozenset([TEXT_OVERFLOW_ELLIPSIS, TEXT_OVERFLOW_SHRINK])
+
+
+class FittedText(NamedTuple):
+    """Text that has been fitted into a maximum width."""
+    text: str
+    width: float
+    # The factor that the font size must be multiplied by or None if the text
+    # is rendered at its normal size.
+    scale: Optional[float] = None
+
+
+def truncate(measurer: text_measurer.TextMeasurer, text: str,
+             max_width: float) -> FittedText:
+    """Truncate text with an ellipsis so that it is at most max_width wide.
+
+    The widths of every prefix of the text are calculated in one pass, so the
+    truncation point is found using a binary search rather than by measuring
+    ever shorter prefixes.
+    """
+    width = measurer.text_width(text)
+    if width <= max_width:
+        return FittedText(text, width)
+
+    available = max_width - measurer.text_width(ELLIPSIS)
+    prefix_widths = measurer.cumulative_widths(text)
+    length = bisect.bisect_right(prefix_widths, available)
+    truncated = text[:length].rstrip() + ELLIPSIS
+    return FittedText(truncated, measurer.text_width(truncated))
+
+
+def shrink(measurer: text_measurer.TextMeasurer, text: str,
+           max_width: float) -> FittedText:
+    """Shrink the font size of text so that it is at most max_width wide."""
+    width = measurer.text_width(text)
+    if width <= max_width:
+        return FittedText(text, width)
+    return FittedText(text, max_width, max_width / width)
+
+
+def fit(measurer: text_measurer.TextMeasurer, text: str,
+        max_width: Optional[float], text_overflow: str) -> FittedText:
+    """Fit text into max_width using the given TEXT_OVERFLOW_* strategy."""
+    if max_width is None:
+        return FittedText(text, measurer.text_width(text))
+    if text_overflow == TEXT_OVERFLOW_SHRINK:
+        return shrink(measurer, text, max_width)
+    return truncate(measurer, text, max_width)
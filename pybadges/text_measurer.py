@@ -16,6 +16,8 @@
 Contains only an abstract base class.
 """
 
+from typing import List
+
 
 class TextMeasurer:
     """The abstract base class for text measuring classes."""
@@ -23,3 +25,12 @@ class TextMeasurer:
     def text_width(self, text: str) -> float:
         """Returns the width, in pixels, of a string in DejaVu Sans 110pt."""
         raise NotImplementedError('text_width not implemented')
+
+    def cumulative_widths(self, text: str) -> List[float]:
+        """Returns the width of every prefix of a string in DejaVu Sans 110pt.
+
+        The i-th element of the returned list is the width of text[:i+1].
+        Subclasses should override this method if they can calculate the
+        widths more efficiently than by measuring every prefix.
+        """
+        return [self.text_width(text[:i + 1]) for i in range(len(text))]
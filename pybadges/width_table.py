@@ -0,0 +1,650 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Read and write text width tables in a binary, memory-mappable format.
+
+The tables used by precalculated_text_measurer.PrecalculatedTextMeasurer are
+normally loaded from JSON into Python dicts, which costs several MB per
+process. A table file written by this module can instead be memory-mapped
+read-only, so every process using the same file shares one copy of the data
+through the operating system's page cache.
+
+The file is formatted as (all values little-endian):
+
+    header:      magic b'PBWT', uint32 version, float64 default width,
+                 uint32 character count, uint32 kerning pair count,
+                 uint32 units per pixel (0 if the table is not quantized)
+    codepoints:  uint32[character count], sorted, padded to 8 bytes
+    widths:      float64[character count]
+    pair keys:   uint64[kerning pair count], sorted, where the key of the pair
+                 "ab" is (ord("a") << 21) | ord("b")
+    kernings:    float64[kerning pair count]
+
+The widths and kernings of a quantized table (see quantize_json) are whole
+numbers of units of 1/units-per-pixel pixels. Version 1 tables, which have no
+units per pixel, can still be loaded.
+
+CharacterWidthRanges and KerningPairs.from_mapping() provide the same compact,
+read-only mappings for tables that are held in memory rather than mapped from
+a file. KerningClasses stores kerning by classes of characters, like OpenType
+fonts do, which is much smaller for fonts that kern many scripts.
+
+TableWriter writes a table incrementally, so that tables with very many
+kerning pairs can be generated without holding them in memory.
+
+To convert a JSON file generated by precalculate_text.py, run:
+$ python3 -m pybadges.width_table --help
+"""
+
+import argparse
+import array
+import bisect
+import io
+import json
+import mmap
+import struct
+import sys
+import tempfile
+from typing import (Any, BinaryIO, Dict, FrozenSet, Iterator, List, Mapping,
+                    NamedTuple, Optional, Sequence, Tuple)
+
+_MAGIC = b'PBWT'
+_VERSION = 2
+_HEADER = struct.Struct('<4sIdIII')
+_VERSION_1_HEADER = struct.Struct('<4sIdII')
+_MAGIC_AND_VERSION = struct.Struct('<4sI')
+
+
+def _pair_key(pair: str) -> int:
+    return (ord(pair[0]) << 21) | ord(pair[1])
+
+
+class CharacterWidths(Mapping[str, float]):
+    """A read-only mapping from single characters to their width.
+
+    The mapping is backed by two parallel sequences (e.g. arrays or
+    memoryviews) and looked up using binary search.
+    """
+
+    def __init__(self, codepoints: Sequence[int], widths: Sequence[float]):
+        self._codepoints = codepoints
+        self._widths = widths
+
+    def get(self, c, default=None):
+        if not isinstance(c, str) or len(c) != 1:
+            return default
+        code = ord(c)
+        index = bisect.bisect_left(self._codepoints, code)
+        if index != len(self._codepoints) and self._codepoints[index] == code:
+            return self._widths[index]
+        return default
+
+    def __getitem__(self, c: str) -> float:
+        width = self.get(c)
+        if width is None:
+            raise KeyError(c)
+        return width
+
+    def __iter__(self) -> Iterator[str]:
+        return (chr(code) for code in self._codepoints)
+
+    def __len__(self) -> int:
+        return len(self._codepoints)
+
+
+class CharacterWidthRanges(Mapping[str, float]):
+    """A compact, read-only mapping from single characters to their width.
+
+    Runs of consecutive codepoints with the same width are stored as a single
+    range, and each range refers to one of a small number of distinct widths,
+    so the mapping needs a few bytes per range rather than a Python str and
+    float per character.
+    """
+
+    def __init__(self, char_to_width: Mapping[str, float]):
+        starts = array.array('I')
+        ends = array.array('I')
+        width_indices = array.array('I')
+        widths = []  # type: List[float]
+        # Keyed on the type as well as the value so that e.g. 6 and 6.0 are
+        # kept distinct and lookups return exactly the original values.
+        width_to_index = {}  # type: Dict[Tuple[type, float], int]
+
+        for code in sorted(ord(c) for c in char_to_width):
+            width = char_to_width[chr(code)]
+            index = width_to_index.setdefault((type(width), width), len(widths))
+            if index == len(widths):
+                widths.append(width)
+            elif ends and ends[-1] == code - 1 and width_indices[-1] == index:
+                ends[-1] = code
+                continue
+            starts.append(code)
+            ends.append(code)
+            width_indices.append(index)
+
+        self._starts = starts
+        self._ends = ends
+        self._width_indices = width_indices
+        self._widths = tuple(widths)
+        self._len = len(char_to_width)
+        # Most badge text is ASCII so avoid the binary search for it.
+        self._ascii = tuple(char_to_width.get(chr(code)) for code in range(128))
+
+    def get(self, c, default=None):
+        if not isinstance(c, str) or len(c) != 1:
+            return default
+        code = ord(c)
+        if code < 128:
+            width = self._ascii[code]
+            return default if width is None else width
+        index = bisect.bisect_right(self._starts, code) - 1
+        if index >= 0 and code <= self._ends[index]:
+            return self._widths[self._width_indices[index]]
+        return default
+
+    def __getitem__(self, c: str) -> float:
+        width = self.get(c)
+        if width is None:
+            raise KeyError(c)
+        return width
+
+    def __iter__(self) -> Iterator[str]:
+        for start, end in zip(self._starts, self._ends):
+            for code in range(start, end + 1):
+                yield chr(code)
+
+    def __len__(self) -> int:
+        return self._len
+
+
+class KerningPairs(Mapping[str, float]):
+    """A read-only mapping from two-character strings to their kerning.
+
+    The mapping is backed by a sorted sequence of packed pair keys and a
+    parallel sequence of kerning distances, and looked up using binary search.
+    """
+
+    def __init__(self, keys: Sequence[int], kernings: Sequence[float]):
+        self._keys = keys
+        self._kernings = kernings
+        self._first_codes = None  # type: Optional[FrozenSet[int]]
+
+    @classmethod
+    def from_mapping(cls, pair_to_kern: Mapping[str, float]) -> 'KerningPairs':
+        """Returns KerningPairs, backed by compact arrays, for a mapping."""
+        pairs = sorted(pair_to_kern, key=_pair_key)
+        kernings = array.array('d', (pair_to_kern[p] for p in pairs))
+        if all(type(pair_to_kern[p]) is int for p in pairs):
+            kernings = array.array('l', (pair_to_kern[p] for p in pairs))
+        return cls(array.array('Q', (_pair_key(p) for p in pairs)), kernings)
+
+    def get(self, pair, default=None):
+        if not isinstance(pair, str) or len(pair) != 2:
+            return default
+        if self._first_codes is None:
+            self._first_codes = frozenset(key >> 21 for key in self._keys)
+        if ord(pair[0]) not in self._first_codes:
+            return default
+        key = (ord(pair[0]) << 21) | ord(pair[1])
+        index = bisect.bisect_left(self._keys, key)
+        if index != len(self._keys) and self._keys[index] == key:
+            return self._kernings[index]
+        return default
+
+    def __getitem__(self, pair: str) -> float:
+        kerning = self.get(pair)
+        if kerning is None:
+            raise KeyError(pair)
+        return kerning
+
+    def __iter__(self) -> Iterator[str]:
+        return (chr(key >> 21) + chr(key & 0x1FFFFF) for key in self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class KerningClasses(Mapping[str, float]):
+    """A read-only mapping from two-character strings to their kerning.
+
+    Fonts kern whole classes of glyphs alike (e.g. "A", "À" and "Á" before
+    "V") so, like the class-based kerning of OpenType fonts, characters that
+    kern identically when they come first (or second) in a pair share a class
+    and the kerning of each pair of classes is stored once. Looking up a pair
+    costs two dict lookups, however many pairs there are. Pairs with zero
+    kerning are not included in the mapping.
+    """
+
+    def __init__(self, first_classes: Sequence[str],
+                 second_classes: Sequence[str],
+                 kernings: Sequence[Sequence[float]]):
+        """Initializer for KerningClasses.
+
+        Args:
+            first_classes: The characters in each class of first characters.
+            second_classes: The characters in each class of second characters.
+            kernings: The kerning between each pair of classes i.e.
+                kernings[i][j] is the kerning between each character in
+                first_classes[i] and each character in second_classes[j].
+        """
+        if len(kernings) != len(first_classes) or any(
+                len(row) != len(second_classes) for row in kernings):
+            raise ValueError('kernings must have a row for each first class '
+                             'and a column for each second class')
+        self._first_classes = tuple(first_classes)
+        self._second_classes = tuple(second_classes)
+        self._kernings = tuple(tuple(row) for row in kernings)
+        # Map each first character directly to its row of kernings, which
+        # saves a lookup per pair.
+        self._rows = {
+            c: row for chars, row in zip(first_classes, self._kernings)
+            for c in chars
+        }
+        self._second = {
+            c: j for j, chars in enumerate(second_classes) for c in chars
+        }
+        self._len = sum(
+            len(first_classes[i]) * len(second_classes[j])
+            for i, row in enumerate(self._kernings)
+            for j, kerning in enumerate(row)
+            if kerning)
+
+    @classmethod
+    def from_mapping(cls, pair_to_kern: Mapping[str,
+                                                float]) -> 'KerningClasses':
+        """Returns KerningClasses for a mapping from pairs to their kerning."""
+        rows = {}  # type: Dict[str, Dict[str, float]]
+        for pair, kerning in pair_to_kern.items():
+            if kerning:
+                rows.setdefault(pair[0], {})[pair[1]] = kerning
+
+        first_classes = {}  # type: Dict[FrozenSet[Tuple[str, float]], str]
+        for c in sorted(rows):
+            row = frozenset(rows[c].items())
+            first_classes[row] = first_classes.get(row, '') + c
+        firsts = list(first_classes.values())
+
+        second_classes = {}  # type: Dict[Tuple[float, ...], str]
+        for c in sorted({c for row in rows.values() for c in row}):
+            column = tuple(rows[chars[0]].get(c, 0) for chars in firsts)
+            second_classes[column] = second_classes.get(column, '') + c
+        columns = list(second_classes)
+
+        return cls(
+            firsts, list(second_classes.values()),
+            [[column[i] for column in columns] for i in range(len(firsts))])
+
+    @classmethod
+    def from_json(cls, o: Mapping[str, Any]) -> 'KerningClasses':
+        """Returns KerningClasses for the JSON object returned by to_json."""
+        return cls(o['first-classes'], o['second-classes'], o['kernings'])
+
+    def to_json(self) -> Dict[str, Any]:
+        """Returns the classes as an object that can be serialized as JSON."""
+        return {
+            'first-classes': list(self._first_classes),
+            'second-classes': list(self._second_classes),
+            'kernings': [list(row) for row in self._kernings],
+        }
+
+    def get(self, pair, default=None):
+        if not isinstance(pair, str) or len(pair) != 2:
+            return default
+        row = self._rows.get(pair[0])
+        if row is None:
+            return default
+        second = self._second.get(pair[1])
+        if second is None:
+            return default
+        return row[second] or default
+
+    def __getitem__(self, pair: str) -> float:
+        kerning = self.get(pair)
+        if kerning is None:
+            raise KeyError(pair)
+        return kerning
+
+    def __iter__(self) -> Iterator[str]:
+        for firsts, row in zip(self._first_classes, self._kernings):
+            for seconds, kerning in zip(self._second_classes, row):
+                if kerning:
+                    for a in firsts:
+                        for b in seconds:
+                            yield a + b
+
+    def __len__(self) -> int:
+        return self._len
+
+
+def json_kerning(o: Mapping[str, Any]) -> Mapping[str, float]:
+    """Returns the kerning in a JSON object written by precalculate_text.py.
+
+    The kerning is stored either as "kerning-pairs", a mapping between pairs
+    of characters and their kerning, or as "kerning-classes" (see
+    KerningClasses.to_json).
+    """
+    if 'kerning-classes' in o:
+        return KerningClasses.from_json(o['kerning-classes'])
+    return o['kerning-pairs']
+
+
+def quantize(value: float, units_per_pixel: int) -> int:
+    """Returns `value` pixels as the nearest whole number of units."""
+    return round(value * units_per_pixel)
+
+
+def quantize_json(o: Mapping[str, Any], units_per_pixel: int) -> Dict[str, Any]:
+    """Returns a quantized copy of a JSON object written by precalculate_text.
+
+    Every width and kerning distance is converted to a whole number of units
+    of 1/units_per_pixel pixels (see PrecalculatedTextMeasurer). Kerning
+    that rounds to zero units is dropped.
+    """
+    if 'units-per-pixel' in o:
+        raise ValueError('the table is already quantized')
+    q = dict(o)
+    q['units-per-pixel'] = units_per_pixel
+    q['mean-character-length'] = quantize(o['mean-character-length'],
+                                          units_per_pixel)
+    q['character-lengths'] = {
+        c: quantize(width, units_per_pixel)
+        for c, width in o['character-lengths'].items()
+    }
+    if 'kerning-classes' in o:
+        classes = o['kerning-classes']
+        q['kerning-classes'] = dict(
+            classes,
+            kernings=[[quantize(k, units_per_pixel)
+                       for k in row]
+                      for row in classes['kernings']])
+    else:
+        q['kerning-pairs'] = {
+            pair: quantize(kerning, units_per_pixel)
+            for pair, kerning in o['kerning-pairs'].items()
+            if quantize(kerning, units_per_pixel)
+        }
+    return q
+
+
+class WidthTable(NamedTuple):
+    """The tables needed to construct a PrecalculatedTextMeasurer."""
+    default_character_width: float
+    char_to_width: Mapping[str, float]
+    pair_to_kern: Mapping[str, float]
+    units_per_pixel: Optional[int] = None
+
+
+def _padding(offset: int) -> int:
+    return -offset % 8
+
+
+def _write_section(f: BinaryIO, section: array.array) -> None:
+    if sys.byteorder != 'little':
+        section.byteswap()
+    f.write(section.tobytes())
+
+
+class TableWriter:
+    """Writes a width table to a seekable binary stream incrementally.
+
+    The character widths are written by `begin` and then kerning pairs are
+    written one at a time by `add`, so the kerning pairs never need to be held
+    in memory. The kernings are kept in `kernings_file` until `close` appends
+    them to the table.
+
+    `state` and `resume` allow a write that was interrupted to be continued,
+    even by another process, if `f` and `kernings_file` are real files.
+    """
+
+    # The number of kerning pairs buffered before they are written.
+    _BUFFER_SIZE = 4096
+
+    def __init__(self, f: BinaryIO, kernings_file: Optional[BinaryIO] = None):
+        """Initializer for TableWriter.
+
+        Args:
+            f: The stream to write the table to.
+            kernings_file: A stream to keep the kernings in until the table
+                is closed. Defaults to a temporary file.
+        """
+        self._f = f
+        self._kernings_file = (kernings_file if kernings_file is not None else
+                               tempfile.TemporaryFile())
+        self._keys = array.array('Q')
+        self._kernings = array.array('d')
+        self._start = 0
+        self._default_character_width = 0.0
+        self._units_per_pixel = 0
+        self._char_count = 0
+        self._pair_count = 0
+        self._last_key = -1
+
+    def _write_header(self) -> None:
+        self._f.write(
+            _HEADER.pack(_MAGIC, _VERSION, self._default_character_width,
+                         self._char_count, self._pair_count,
+                         self._units_per_pixel))
+
+    def _pad(self) -> None:
+        self._f.write(b'\0' * _padding(self._f.tell() - self._start))
+
+    def begin(self,
+              default_character_width: float,
+              char_to_width: Mapping[str, float],
+              units_per_pixel: Optional[int] = None) -> None:
+        """Write the character widths. Must be called before `add`.
+
+        Args:
+            default_character_width: The width of characters that are not in
+                char_to_width.
+            char_to_width: A mapping between characters and their width.
+            units_per_pixel: If set then the table is quantized and every
+                width and kerning distance is a whole number of units of
+                1/units_per_pixel pixels.
+        """
+        chars = sorted(char_to_width, key=ord)
+        self._start = self._f.tell()
+        self._default_character_width = default_character_width
+        self._units_per_pixel = units_per_pixel or 0
+        self._char_count = len(chars)
+        self._write_header()
+        _write_section(self._f, array.array('I', (ord(c) for c in chars)))
+        self._pad()
+        _write_section(self._f,
+                       array.array('d', (char_to_width[c] for c in chars)))
+        self._pad()
+
+    def add(self, pair: str, kerning: float) -> None:
+        """Write the kerning of a pair of characters.
+
+        Raises:
+            ValueError: The pair does not come after the previous pair when
+                sorted by codepoint.
+        """
+        key = _pair_key(pair)
+        if key <= self._last_key:
+            raise ValueError(
+                'kerning pairs must be added in increasing order: {0!r}'.format(
+                    pair))
+        self._last_key = key
+        self._keys.append(key)
+        self._kernings.append(kerning)
+        self._pair_count += 1
+        if len(self._keys) >= self._BUFFER_SIZE:
+            self._flush_buffers()
+
+    def _flush_buffers(self) -> None:
+        _write_section(self._f, self._keys)
+        _write_section(self._kernings_file, self._kernings)
+        self._keys = array.array('Q')
+        self._kernings = array.array('d')
+
+    def state(self) -> Dict[str, Any]:
+        """Flushes the written data and returns the progress of the write.
+
+        The returned dict can be serialized as JSON and passed to `resume`.
+        """
+        self._flush_buffers()
+        self._f.flush()
+        self._kernings_file.flush()
+        return {
+            'start': self._start,
+            'offset': self._f.tell(),
+            'kernings-offset': self._kernings_file.tell(),
+            'default-character-width': self._default_character_width,
+            'units-per-pixel': self._units_per_pixel,
+            'character-count': self._char_count,
+            'pair-count': self._pair_count,
+            'last-key': self._last_key,
+        }
+
+    def resume(self, state: Mapping[str, Any]) -> None:
+        """Continue a write from a state returned by `state`.
+
+        Anything written to the streams after the state was returned is
+        discarded. Used instead of `begin`.
+        """
+        for f, offset in [(self._f, state['offset']),
+                          (self._kernings_file, state['kernings-offset'])]:
+            f.seek(offset)
+            f.truncate()
+        self._start = state['start']
+        self._default_character_width = state['default-character-width']
+        self._units_per_pixel = state.get('units-per-pixel', 0)
+        self._char_count = state['character-count']
+        self._pair_count = state['pair-count']
+        self._last_key = state['last-key']
+
+    def close(self) -> None:
+        """Append the kernings and complete the table's header.
+
+        Neither stream is closed.
+        """
+        self._flush_buffers()
+        self._pad()
+        self._kernings_file.flush()
+        self._kernings_file.seek(0)
+        while True:
+            data = self._kernings_file.read(1 << 20)
+            if not data:
+                break
+            self._f.write(data)
+        self._pad()
+        end = self._f.tell()
+        self._f.seek(self._start)
+        self._write_header()
+        self._f.seek(end)
+
+
+def write_table(f: BinaryIO,
+                default_character_width: float,
+                char_to_width: Mapping[str, float],
+                pair_to_kern: Mapping[str, float],
+                units_per_pixel: Optional[int] = None) -> None:
+    """Write width tables to a binary stream in the memory-mappable format.
+
+    If units_per_pixel is set then the tables are quantized (see
+    TableWriter.begin).
+    """
+    writer = TableWriter(f, io.BytesIO())
+    writer.begin(default_character_width, char_to_width, units_per_pixel)
+    for pair in sorted(pair_to_kern, key=_pair_key):
+        writer.add(pair, pair_to_kern[pair])
+    writer.close()
+
+
+def _sections(buffer: memoryview, offset: int, char_count: int,
+              pair_count: int) -> Tuple[memoryview, ...]:
+    sections = []
+    for fmt, count in [('I', char_count), ('d', char_count), ('Q', pair_count),
+                       ('d', pair_count)]:
+        size = struct.calcsize(fmt) * count
+        if offset + size > len(buffer):
+            raise ValueError('truncated width table')
+        sections.append(buffer[offset:offset + size].cast(fmt))
+        offset += size
+        offset += _padding(offset)
+    return tuple(sections)
+
+
+def load_table(path: str) -> WidthTable:
+    """Memory-map the width table file at the given path.
+
+    The returned mappings read directly from the mapped file, so the table data
+    is shared between all processes that load the same file.
+    """
+    with open(path, 'rb') as f:
+        buffer = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    if len(buffer) < _MAGIC_AND_VERSION.size:
+        raise ValueError('truncated width table')
+    magic, version = _MAGIC_AND_VERSION.unpack_from(buffer)
+    if magic != _MAGIC:
+        raise ValueError('not a width table: {0!r}'.format(path))
+    if version == _VERSION:
+        header = _HEADER
+    elif version == 1:
+        header = _VERSION_1_HEADER
+    else:
+        raise ValueError('unsupported width table version {0}'.format(version))
+    if len(buffer) < header.size:
+        raise ValueError('truncated width table')
+    _, _, default_character_width, char_count, pair_count, *rest = (
+        header.unpack_from(buffer))
+    units_per_pixel = rest[0] if rest else 0
+
+    codepoints, widths, keys, kernings = _sections(buffer, header.size,
+                                                   char_count, pair_count)
+    if sys.byteorder != 'little':
+        # The data must be swapped so it can't be shared on this platform.
+        codepoints, widths, keys, kernings = [
+            _swapped(section)
+            for section in (codepoints, widths, keys, kernings)
+        ]
+
+    return WidthTable(default_character_width,
+                      CharacterWidths(codepoints, widths),
+                      KerningPairs(keys, kernings), units_per_pixel or None)
+
+
+def _swapped(section: memoryview) -> array.array:
+    a = array.array(section.format, section.tobytes())
+    a.byteswap()
+    return a
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='convert a JSON width table into a memory-mappable table')
+
+    parser.add_argument(
+        '--input-json-file',
+        required=True,
+        help='the path to a JSON file generated by precalculate_text.py')
+
+    parser.add_argument('--output-table-file',
+                        required=True,
+                        help='the path where the binary table will be placed')
+
+    args = parser.parse_args()
+
+    with open(args.input_json_file, 'rt', encoding='utf-8') as f:
+        o = json.load(f)
+
+    with open(args.output_table_file, 'wb') as f:
+        write_table(f, o['mean-character-length'], o['character-lengths'],
+                    json_kerning(o), o.get('units-per-pixel'))
+
+
+if __name__ == '__main__':
+    main()
@@ -13,10 +13,53 @@
 # limitations under the License.
 """ Example Flask server that serves badges."""
 
+import functools
+import urllib.parse
+
 import flask
 import pybadges
+import requests
+from pybadges import coalesce
+from pybadges import colors
+from pybadges import dynamic
+from pybadges import embedding
+from pybadges import logos
+from pybadges import singleflight
 
 app = flask.Flask(__name__)
+pybadges.warmup()
+# Logos are fetched from URLs chosen by clients, so don't allow them to read
+# files on the server and shed load rather than queueing fetches.
+_embedder = embedding.Embedder(allow_files=False,
+                               max_in_flight=16,
+                               max_per_host=4,
+                               timeout=5)
+_logo_fetches = singleflight.Group()
+# JSON documents for dynamic badges are only fetched from these hosts, so that
+# clients can't use the server to reach internal hosts.
+_DYNAMIC_BADGE_HOSTS = [
+    'pypi.org', 'api.github.com', 'raw.githubusercontent.com'
+]
+_dynamic_embedder = embedding.Embedder(allowed_hosts=_DYNAMIC_BADGE_HOSTS,
+                                       allow_files=False,
+                                       max_in_flight=16,
+                                       max_per_host=4,
+                                       timeout=5)
+_dynamic_badges = dynamic.DynamicBadges(ttl=300, embedder=_dynamic_embedder)
+
+
+@functools.lru_cache(maxsize=1024)
+def _render(spec: pybadges.BadgeSpec) -> bytes:
+    """Render a badge as UTF-8 encoded bytes, caching popular badges."""
+    # Concurrent requests for a badge that isn't cached yet share one render.
+    return coalesce.badge_bytes(spec)
+
+
+@functools.lru_cache(maxsize=256)
+def _embedded_logo(url: str) -> str:
+    """Fetch a logo as a data URL, caching popular logos."""
+    # Concurrent requests for a logo that isn't cached yet share one fetch.
+    return _logo_fetches.do(url, lambda: _embedder.embed(url))
 
 
 @app.route('/')
@@ -57,15 +100,67 @@ def index():
 @app.route('/img')
 def serve_badge():
     """Serve a badge image based on the request query string."""
-    badge = pybadges.badge(left_text=flask.request.args.get('left_text'),
-                           right_text=flask.request.args.get('right_text'),
-                           left_color=flask.request.args.get('left_color'),
-                           right_color=flask.request.args.get('right_color'),
-                           logo=flask.request.args.get('logo'))
-
-    response = flask.make_response(badge)
-    response.content_type = 'image/svg+xml'
-    return response
+    left_color = flask.request.args.get('left_color', '#555')
+    right_color = flask.request.args.get('right_color', '#007ec6')
+    for color in [left_color, right_color]:
+        if not colors.is_valid(color):
+            flask.abort(400, 'invalid color "{0}"'.format(color))
+
+    logo = flask.request.args.get('logo')
+    try:
+        # Logos are embedded using the app's embedder, rather than by
+        # pybadges, so that its limits apply. Registered logos are always
+        # embedded.
+        if (logo and flask.request.args.get('embed_logo') == 'true' and
+                logos.get(logo) is None):
+            logo = _embedded_logo(logo)
+        spec = pybadges.BadgeSpec(
+            left_text=flask.request.args.get('left_text', ''),
+            right_text=flask.request.args.get('right_text'),
+            left_color=left_color,
+            right_color=right_color,
+            logo=logo)
+        badge = _render(spec)
+    except embedding.Overloaded as e:
+        flask.abort(503, str(e))
+    except requests.RequestException as e:
+        flask.abort(502, str(e))
+    except ValueError as e:
+        flask.abort(400, str(e))
+
+    return flask.Response(badge, mimetype='image/svg+xml')
+
+
+@app.route('/dynamic')
+def serve_dynamic_badge():
+    """Serve a badge showing a value from a JSON document.
+
+    e.g. /dynamic?url=https://pypi.org/pypi/pybadges/json&query=$.info.version
+    """
+    url = flask.request.args.get('url', '')
+    # Don't allow clients to read files on the server.
+    if urllib.parse.urlparse(url).scheme not in ('http', 'https'):
+        flask.abort(400, 'url must be a HTTP or HTTPS URL')
+    right_color = flask.request.args.get('right_color', '#007ec6')
+    if not colors.is_valid(right_color):
+        flask.abort(400, 'invalid color "{0}"'.format(right_color))
+
+    try:
+        badge = _dynamic_badges.badge(
+            url,
+            path=flask.request.args.get('query', '$'),
+            prefix=flask.request.args.get('prefix', ''),
+            suffix=flask.request.args.get('suffix', ''),
+            left_text=flask.request.args.get('left_text', ''),
+            right_color=right_color)
+    except embedding.Overloaded as e:
+        flask.abort(503, str(e))
+    except requests.RequestException as e:
+        flask.abort(502, str(e))
+    except ValueError as e:
+        flask.abort(400, str(e))
+
+    return flask.Response(badge, mimetype='image/svg+xml')
 
 
 if __name__ == '__main__':
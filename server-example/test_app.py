@@ -14,7 +14,9 @@
 "Tests for app"
 
 import pytest
+import requests
 
+from pybadges import embedding
 import app
 
 
@@ -28,3 +30,74 @@ def test_image(client):
     rv = client.get("/img?left_text=build&right_text=passing")
     assert b'build' in rv.data
     assert b'passing' in rv.data
+
+
+def test_image_default_colors(client):
+    rv = client.get("/img?left_text=build&right_text=passing")
+    assert b'fill="#555"' in rv.data
+    assert b'fill="#007ec6"' in rv.data
+
+
+def test_image_invalid_color(client):
+    rv = client.get("/img?left_text=build&right_text=passing&left_color=bad")
+    assert rv.status_code == 400
+
+
+def test_image_content_type(client):
+    rv = client.get("/img?left_text=build&right_text=passing")
+    assert rv.content_type == 'image/svg+xml; charset=utf-8'
+    assert rv.data.startswith(b'<svg')
+
+
+def test_image_embed_file_rejected(client):
+    rv = client.get("/img?left_text=build&logo=/etc/passwd&embed_logo=true")
+    assert rv.status_code == 400
+
+
+def test_image_embed_overloaded(client, monkeypatch):
+
+    def embed(url):
+        raise embedding.Overloaded('too many images are being fetched')
+
+    monkeypatch.setattr(app._embedder, 'embed', embed)
+    rv = client.get("/img?left_text=build&logo=https://example.com/logo.png"
+                    "&embed_logo=true")
+    assert rv.status_code == 503
+
+
+def test_image_embed_does_not_change_default_embedder(client):
+    assert embedding.default_embedder() is not app._embedder
+
+
+def test_dynamic_file_url_rejected(client):
+    rv = client.get("/dynamic?url=/etc/passwd&query=$")
+    assert rv.status_code == 400
+
+
+def test_dynamic_host_not_allowed(client, monkeypatch):
+    fetched = []
+    monkeypatch.setattr(requests, 'get',
+                        lambda *args, **kwargs: fetched.append(args))
+    rv = client.get("/dynamic?url=http://169.254.169.254/latest&query=$")
+    assert rv.status_code == 400
+    assert not fetched
+
+
+def test_dynamic(client, monkeypatch):
+    monkeypatch.setattr(app._dynamic_badges, 'fetch',
+                        lambda url: {'info': {
+                            'version': '1.2'
+                        }})
+    rv = client.get("/dynamic?url=https://example.com/&query=$.info.version"
+                    "&left_text=pypi&prefix=v")
+    assert rv.status_code == 200
+    assert b'v1.2' in rv.data
+
+
+def test_dynamic_bad_query(client, monkeypatch):
+    monkeypatch.setattr(app._dynamic_badges, 'fetch',
+                        lambda url: {'info': {
+                            'version': '1.2'
+                        }})
+    rv = client.get("/dynamic?url=https://example.com/&query=$.missing")
+    assert rv.status_code == 400
@@ -62,7 +62,8 @@ setup(
     keywords="github gh-badges badge shield status",
     package_data={
         'pybadges': [
-            'badge-template-full.svg', 'default-widths.json', 'py.typed'
+            'badge-template-full.svg', 'badge-template-optimized.svg',
+            'default-widths.json', 'py.typed'
         ]
     },
     long_description=get_long_description(),
@@ -71,13 +72,14 @@ setup(
     install_requires=['Jinja2>=3,<4', 'requests>=2.22.0,<3'],
     extras_require={
         'pil-measurement': ['Pillow>=6,<10'],
+        'harfbuzz-measurement': ['uharfbuzz>=0.9'],
         'dev': [
             'Flask>=2.0',  # For server tests. 
             'fonttools>=3.26',
             'nox',
             'Pillow>=5',
             'pytest>=3.6',
-            'xmldiff>=2.4'
+            'uharfbuzz>=0.9',
         ],
     },
     license='Apache-2.0',
@@ -0,0 +1,299 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Render golden-image test cases in parallel and compare them structurally.
+
+Each case in tests/test-badges.json is rendered in a pool of worker processes
+and compared with the SVG image of the same name in tests/golden-images.
+Images are compared as XML, ignoring whitespace between elements and allowing
+numbers to differ by a small tolerance, so that harmless changes (e.g. float
+formatting) are not reported but every real difference is reported with the
+path of the element that differs. The time taken to render each case is also
+reported, so that performance regressions show up with correctness
+regressions.
+
+To check every case from the command line, run:
+$ python3 -m tests.golden --help
+"""
+
+import argparse
+import concurrent.futures
+import json
+import math
+import os.path
+import re
+import sys
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+from xml.dom import minidom
+
+import pybadges
+
+TEST_DIR = os.path.dirname(__file__)
+CASES_PATH = os.path.join(TEST_DIR, 'test-badges.json')
+GOLDEN_DIR = os.path.join(TEST_DIR, 'golden-images')
+
+DEFAULT_TOLERANCE = 1e-6
+
+_NUMBER = re.compile(r'(-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)')
+
+
+class GoldenCase(NamedTuple):
+    """A badge to render and the name of its golden image."""
+    file_name: str
+    kwargs: Dict[str, Any]
+
+
+class CaseResult(NamedTuple):
+    """The result of rendering and comparing a GoldenCase."""
+    file_name: str
+    # The mean time taken to render the badge, in seconds.
+    render_seconds: float
+    svg: Optional[str]
+    differences: List[str]
+    error: Optional[str] = None
+
+    @property
+    def passed(self) -> bool:
+        return self.error is None and not self.differences
+
+
+def load_cases(path: str = CASES_PATH) -> List[GoldenCase]:
+    """Loads the cases from a JSON file like tests/test-badges.json."""
+    with open(path, encoding='utf-8') as f:
+        examples = json.load(f)
+    cases = []
+    for example in examples:
+        file_name = example.pop('file_name')
+        cases.append(GoldenCase(file_name, example))
+    return cases
+
+
+def _values_equal(expected: str, actual: str, tolerance: float) -> bool:
+    if expected == actual:
+        return True
+    expected_parts = _NUMBER.split(expected)
+    actual_parts = _NUMBER.split(actual)
+    if len(expected_parts) != len(actual_parts):
+        return False
+    # split() puts the numbers at the odd indices.
+    for i, (e, a) in enumerate(zip(expected_parts, actual_parts)):
+        if i % 2 == 0:
+            if e != a:
+                return False
+        elif not math.isclose(
+                float(e), float(a), rel_tol=tolerance, abs_tol=tolerance):
+            return False
+    return True
+
+
+def _children(node: minidom.Node) -> List[minidom.Node]:
+    children = []
+    for child in node.childNodes:
+        if child.nodeType == minidom.Node.ELEMENT_NODE:
+            children.append(child)
+        elif child.nodeType == minidom.Node.TEXT_NODE and child.data.strip():
+            children.append(child)
+    return children
+
+
+def _compare_nodes(expected: minidom.Node, actual: minidom.Node, path: str,
+                   tolerance: float, differences: List[str]) -> None:
+    if expected.nodeType != actual.nodeType:
+        differences.append('{0}: expected {1!r}, got {2!r}'.format(
+            path,
+            expected.toxml()[:40],
+            actual.toxml()[:40]))
+        return
+    if expected.nodeType == minidom.Node.TEXT_NODE:
+        if expected.data.strip() != actual.data.strip():
+            differences.append('{0}: expected text {1!r}, got {2!r}'.format(
+                path, expected.data.strip(), actual.data.strip()))
+        return
+    if expected.tagName != actual.tagName:
+        differences.append('{0}: expected <{1}>, got <{2}>'.format(
+            path, expected.tagName, actual.tagName))
+        return
+
+    expected_attributes = dict(expected.attributes.items())
+    actual_attributes = dict(actual.attributes.items())
+    for name in sorted(set(expected_attributes) | set(actual_attributes)):
+        e = expected_attributes.get(name)
+        a = actual_attributes.get(name)
+        if e is None or a is None or not _values_equal(e, a, tolerance):
+            differences.append('{0}/@{1}: expected {2!r}, got {3!r}'.format(
+                path, name, e, a))
+
+    expected_children = _children(expected)
+    actual_children = _children(actual)
+    if len(expected_children) != len(actual_children):
+        differences.append(
+            '{0}: expected {1} children, got {2}: [{3}] vs [{4}]'.format(
+                path, len(expected_children), len(actual_children),
+                ', '.join(_node_name(c) for c in expected_children),
+                ', '.join(_node_name(c) for c in actual_children)))
+        return
+    for i, (e, a) in enumerate(zip(expected_children, actual_children)):
+        _compare_nodes(e, a, '{0}/{1}[{2}]'.format(path, _node_name(e), i),
+                       tolerance, differences)
+
+
+def _node_name(node: minidom.Node) -> str:
+    if node.nodeType == minidom.Node.TEXT_NODE:
+        return 'text()'
+    return node.tagName
+
+
+def compare_svg(expected: str,
+                actual: str,
+                tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """Compares two SVG images structurally.
+
+    Args:
+        expected: The expected SVG image.
+        actual: The SVG image to check.
+        tolerance: The relative and absolute difference allowed between
+            numbers in attribute values.
+
+    Returns:
+        A description of each difference. Empty if the images are the same.
+    """
+    expected_root = minidom.parseString(expected).documentElement
+    actual_root = minidom.parseString(actual).documentElement
+    differences = []  # type: List[str]
+    _compare_nodes(expected_root, actual_root, '/' + expected_root.tagName,
+                   tolerance, differences)
+    return differences
+
+
+def run_case(case: GoldenCase,
+             golden_dir: str = GOLDEN_DIR,
+             tolerance: float = DEFAULT_TOLERANCE,
+             repeat: int = 1) -> CaseResult:
+    """Renders a case and compares it with its golden image."""
+    try:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            svg = pybadges.badge(**case.kwargs)
+        render_seconds = (time.perf_counter() - start) / repeat
+    except Exception as e:  # pylint: disable=broad-except
+        return CaseResult(case.file_name, 0, None, [],
+                          '{0}: {1}'.format(type(e).__name__, e))
+
+    golden_path = os.path.join(golden_dir, case.file_name)
+    try:
+        with open(golden_path, encoding='utf-8') as f:
+            golden_image = f.read()
+    except OSError as e:
+        return CaseResult(case.file_name, render_seconds, svg, [], str(e))
+    return CaseResult(case.file_name, render_seconds, svg,
+                      compare_svg(golden_image, svg, tolerance))
+
+
+def run(cases: Sequence[GoldenCase],
+        golden_dir: str = GOLDEN_DIR,
+        tolerance: float = DEFAULT_TOLERANCE,
+        repeat: int = 1,
+        workers: Optional[int] = None) -> List[CaseResult]:
+    """Renders cases in parallel and compares them with their golden images.
+
+    Args:
+        cases: The cases to run.
+        golden_dir: The directory containing the golden images.
+        tolerance: The difference allowed between numbers in attributes.
+        repeat: The number of times to render each case when timing it.
+        workers: The number of worker processes. Defaults to the number of
+            CPUs. If 1 then the cases are run in this process.
+
+    Returns:
+        The result of each case, in the same order as `cases`.
+    """
+    if workers == 1:
+        pybadges.warmup()
+        return [run_case(c, golden_dir, tolerance, repeat) for c in cases]
+
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=pybadges.warmup) as executor:
+        futures = [
+            executor.submit(run_case, c, golden_dir, tolerance, repeat)
+            for c in cases
+        ]
+        return [f.result() for f in futures]
+
+
+def format_report(results: Sequence[CaseResult]) -> str:
+    """Returns a human-readable table of results, slowest first."""
+    lines = []
+    width = max([len(r.file_name) for r in results] + [4])
+    for r in sorted(results, key=lambda r: r.render_seconds, reverse=True):
+        status = 'ok' if r.passed else 'FAIL'
+        lines.append('{0:<{1}}  {2:9.3f}ms  {3}'.format(r.file_name, width,
+                                                        r.render_seconds * 1000,
+                                                        status))
+        if r.error:
+            lines.append('    ' + r.error)
+        lines.extend('    ' + d for d in r.differences)
+    total = sum(r.render_seconds for r in results)
+    failed = sum(1 for r in results if not r.passed)
+    lines.append('{0} cases, {1} failed, {2:.3f}ms total render time'.format(
+        len(results), failed, total * 1000))
+    return '\n'.join(lines)
+
+
+def main():
+    from tests import image_server
+    from tests import test_pybadges
+
+    parser = argparse.ArgumentParser(
+        description='render golden-image test cases in parallel and compare '
+        'them with their golden images')
+    parser.add_argument('--source-path',
+                        default=CASES_PATH,
+                        help='the JSON file containing the test cases')
+    parser.add_argument('--golden-dir',
+                        default=GOLDEN_DIR,
+                        help='the directory containing the golden images')
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help='the difference allowed between numbers in attribute values')
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=1,
+        help='the number of times to render each case when timing it')
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='the number of worker processes (defaults to the number of CPUs)')
+    args = parser.parse_args()
+
+    srv = image_server.ImageServer(test_pybadges.PNG_IMAGE)
+    srv.start_server()
+    try:
+        cases = load_cases(args.source_path)
+        for case in cases:
+            srv.fix_embedded_url_reference(case.kwargs)
+        results = run(cases, args.golden_dir, args.tolerance, args.repeat,
+                      args.workers)
+    finally:
+        srv.stop_server()
+
+    print(format_report(results))
+    sys.exit(0 if all(r.passed for r in results) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -14,33 +14,77 @@
 """An HTTP image server that can be used to set logo embedding.
 
 The server will respond to any request with the image data provided in the
-constructor.
+constructor, except that requests for "/redirect?to=<url>" are redirected to
+<url>.
 """
 
 from http import server
 import threading
+import time
+import urllib.parse
 
 
 class ImageServer:
 
-    def __init__(self, image_data):
+    def __init__(self,
+                 image_data,
+                 content_type='image/png',
+                 delay=0,
+                 gate=None,
+                 drip_interval=0):
+        """Initializer for ImageServer.
+
+        Args:
+            image_data: The bytes sent in response to every request.
+            content_type: The Content-Type of the response.
+            delay: The number of seconds to wait before responding.
+            gate: If set, a threading.Event that must be set before the
+                server responds.
+            drip_interval: If set, the image data is sent one byte at a time
+                with this number of seconds between bytes.
+        """
         self._image_data = image_data
+        self._content_type = content_type
+        self._delay = delay
+        self._gate = gate
+        self._drip_interval = drip_interval
 
     def start_server(self):
         srv = self
 
         class Handler(server.BaseHTTPRequestHandler):
 
+            def log_message(self, format, *args):
+                pass
+
             def do_GET(self):
+                url = urllib.parse.urlparse(self.path)
+                if url.path == '/redirect':
+                    self.send_response(302)
+                    self.send_header('Location',
+                                     urllib.parse.parse_qs(url.query)['to'][0])
+                    self.end_headers()
+                    return
+                if srv._gate is not None:
+                    srv._gate.wait()
+                time.sleep(srv._delay)
                 self.send_response(200)
-                self.send_header('Content-Type', 'image/png')
+                self.send_header('Content-Type', srv._content_type)
                 self.end_headers()
-                self.wfile.write(srv._image_data)
+                if not srv._drip_interval:
+                    self.wfile.write(srv._image_data)
+                    return
+                for i in range(len(srv._image_data)):
+                    self.wfile.write(srv._image_data[i:i + 1])
+                    self.wfile.flush()
+                    time.sleep(srv._drip_interval)
 
-        self._httpd = server.HTTPServer(('localhost', 0), Handler)
+        self._httpd = server.ThreadingHTTPServer(('localhost', 0), Handler)
+        self._httpd.daemon_threads = True
         self.logo_url = "http://localhost:{0}".format(self._httpd.server_port)
 
-        thread = threading.Thread(target=self._httpd.serve_forever)
+        thread = threading.Thread(target=self._httpd.serve_forever,
+                                  kwargs={"poll_interval": 0.05})
         thread.start()
 
     def fix_embedded_url_reference(self, example):
@@ -48,4 +92,7 @@ class ImageServer:
             example["logo"] = self.logo_url
 
     def stop_server(self):
+        if self._gate is not None:
+            self._gate.set()
         self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,65 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""An HTTP server that can be used to test fetching JSON documents.
+
+The server responds to any request with the current value of `document`,
+after waiting `delay` seconds, and counts the requests that it receives.
+"""
+
+from http import server
+import json
+import threading
+import time
+
+
+class JsonServer:
+
+    def __init__(self, document, delay=0):
+        self._lock = threading.Lock()
+        self.reset(document, delay)
+
+    def reset(self, document, delay=0):
+        self.document = document
+        self.delay = delay
+        self.status = 200
+        self.request_count = 0
+
+    def start_server(self):
+        srv = self
+
+        class Handler(server.BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                with srv._lock:
+                    srv.request_count += 1
+                time.sleep(srv.delay)
+                body = json.dumps(srv.document).encode('utf-8')
+                self.send_response(srv.status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = server.ThreadingHTTPServer(('localhost', 0), Handler)
+        self.url = "http://localhost:{0}/".format(self._httpd.server_port)
+
+        thread = threading.Thread(target=self._httpd.serve_forever)
+        thread.start()
+
+    def stop_server(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,129 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for BadgeSpec."""
+
+import doctest
+import pickle
+import unittest
+
+import pybadges
+from pybadges import badge_spec
+from pybadges import precalculated_text_measurer
+from pybadges.badge_spec import BadgeSpec
+
+
+class TestBadgeSpec(unittest.TestCase):
+
+    def test_docs(self):
+        self.assertEqual(doctest.testmod(badge_spec).failed, 0)
+
+    def test_defaults_and_resolved_colors(self):
+        spec = BadgeSpec(left_text='build', right_color='green')
+        self.assertEqual(spec.left_color, '#555')
+        self.assertEqual(spec.right_color, '#97CA00')
+        self.assertEqual(spec.font, 'DejaVu Sans')
+        self.assertFalse(spec.embed_logo)
+
+    def test_equal_colors(self):
+        specs = {
+            BadgeSpec(left_text='build', right_color=color)
+            for color in ['green', '#97CA00', '#97ca00', 'rgb(151, 202, 0)']
+        }
+        self.assertEqual(len(specs), 1)
+
+    def test_colors_rendered_as_given(self):
+        # Only the key is normalized; colors are rendered as resolved, so
+        # that e.g. "transparent" is not rendered as an 8 digit hex color.
+        for color in ['transparent', 'rgba(0, 0, 0, 0.5)', '#555']:
+            with self.subTest(color=color):
+                self.assertIn(
+                    'fill="{0}"'.format(color),
+                    pybadges.badge(left_text='build', right_color=color))
+
+    def test_invalid_color_kept(self):
+        self.assertEqual(
+            BadgeSpec(left_text='build', right_color='not a color').right_color,
+            'not a color')
+
+    def test_not_equal(self):
+        self.assertNotEqual(BadgeSpec(left_text='build'),
+                            BadgeSpec(left_text='build', right_text='passing'))
+        self.assertNotEqual(BadgeSpec(left_text='build', right_color='green'),
+                            BadgeSpec(left_text='build', right_color='Green'))
+
+    def test_immutable(self):
+        spec = BadgeSpec(left_text='build')
+        with self.assertRaises(AttributeError):
+            spec.left_text = 'test'
+        with self.assertRaises(AttributeError):
+            spec.extra = 'test'
+
+    def test_validated(self):
+        with self.assertRaises(ValueError):
+            BadgeSpec(left_text='build',
+                      left_link='http://example.com/',
+                      whole_link='http://example.com/')
+        with self.assertRaises(ValueError):
+            BadgeSpec(left_text='build', center_image='image.png')
+        with self.assertRaises(ValueError):
+            BadgeSpec(left_text='build', font='Unknown Font')
+
+    def test_replace(self):
+        spec = BadgeSpec(left_text='coverage', right_text='83%')
+        replaced = spec.replace(right_text='84%')
+        self.assertEqual(replaced.right_text, '84%')
+        self.assertEqual(replaced.left_text, 'coverage')
+        self.assertEqual(spec.right_text, '83%')
+
+    def test_fingerprint(self):
+        a = BadgeSpec(left_text='build', right_color='green')
+        b = BadgeSpec(left_text='build', right_color='#97ca00')
+        c = BadgeSpec(left_text='build', right_color='red')
+        self.assertEqual(a.fingerprint(), b.fingerprint())
+        self.assertNotEqual(a.fingerprint(), c.fingerprint())
+
+    def test_pickle(self):
+        spec = BadgeSpec(left_text='build', right_text='passing')
+        self.assertEqual(pickle.loads(pickle.dumps(spec)), spec)
+
+    def test_badge(self):
+        spec = BadgeSpec(left_text='build',
+                         right_text='passing',
+                         right_color='green')
+        self.assertEqual(
+            pybadges.badge(spec),
+            pybadges.badge(left_text='build',
+                           right_text='passing',
+                           right_color='green'))
+
+    def test_badge_with_other_arguments(self):
+        spec = BadgeSpec(left_text='build', right_text='passing')
+        with self.assertRaisesRegex(TypeError, 'right_color'):
+            pybadges.badge(spec, right_color='red')
+        with self.assertRaisesRegex(TypeError, 'logo, right_text'):
+            pybadges.badge(spec, 'failing', logo='python')
+        # Arguments are rejected even if they have their default value.
+        with self.assertRaisesRegex(TypeError, 'style'):
+            pybadges.badge(spec, style='flat')
+        with self.assertRaisesRegex(TypeError, 'font_size'):
+            pybadges.badge_bytes(left_text=spec, font_size=110)
+        self.assertEqual(
+            pybadges.badge(spec,
+                           measurer=precalculated_text_measurer.
+                           PrecalculatedTextMeasurer.default()),
+            pybadges.badge(spec))
+
+
+if __name__ == '__main__':
+    unittest.main()
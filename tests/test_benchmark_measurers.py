@@ -0,0 +1,103 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Smoke tests for benchmark_measurers."""
+
+import json
+import os.path
+import tempfile
+import unittest
+
+import benchmark_measurers
+from pybadges import precalculated_text_measurer
+from pybadges import text_measurer
+from pybadges import width_table
+
+_CORPUS = {'ascii': ['build', 'AVAWAY'], 'non-latin': ['Пример']}
+
+
+class _CachingMeasurer(text_measurer.TextMeasurer):
+    """Counts the strings that it measures without a cache hit."""
+
+    def __init__(self):
+        self.cache = {}
+        self.misses = 0
+
+    def text_width(self, text: str) -> float:
+        if text not in self.cache:
+            self.misses += 1
+            self.cache[text] = len(text)
+        return self.cache[text]
+
+
+class TestBenchmarkMeasurers(unittest.TestCase):
+
+    def test_benchmark(self):
+        create = precalculated_text_measurer.PrecalculatedTextMeasurer.default
+        results = benchmark_measurers.benchmark(
+            {
+                'precalculated': create,
+                'fixed': lambda: _CachingMeasurer()
+            }, 'precalculated', _CORPUS, 0.001)
+        self.assertEqual(set(results), {'precalculated', 'fixed'})
+        for result in results.values():
+            self.assertEqual(set(result['corpus']), set(_CORPUS))
+            for r in result['corpus'].values():
+                self.assertGreater(r['cold_strings_per_second'], 0)
+                self.assertGreater(r['warm_strings_per_second'], 0)
+        self.assertEqual(
+            results['precalculated']['corpus']['ascii']['error_px']['max'], 0)
+        benchmark_measurers.print_report(results)
+
+    def test_cold_throughput_uses_new_measurers(self):
+        measurers = []
+
+        def create():
+            measurers.append(_CachingMeasurer())
+            return measurers[-1]
+
+        benchmark_measurers.throughput(create, ['a', 'b'], 0.001, warm=False)
+        self.assertTrue(all(m.misses == 2 for m in measurers))
+
+        measurers.clear()
+        benchmark_measurers.throughput(create, ['a', 'b'], 0.001, warm=True)
+        self.assertEqual(len(measurers), 1)
+        self.assertEqual(measurers[0].misses, 2)
+
+    def test_write_table_file_kerning_classes(self):
+        pair_to_kern = {'AV': -1.5, 'AW': -1.5, 'VA': -1.0}
+        with tempfile.TemporaryDirectory() as d:
+            json_path = os.path.join(d, 'widths.json')
+            table_path = os.path.join(d, 'widths.bin')
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {
+                        'mean-character-length':
+                            60.0,
+                        'character-lengths': {
+                            'A': 70.0,
+                            'V': 65.0,
+                            'W': 90.0
+                        },
+                        'kerning-classes':
+                            width_table.KerningClasses.from_mapping(pair_to_kern
+                                                                   ).to_json(),
+                    }, f)
+            benchmark_measurers.write_table_file(json_path, table_path)
+            table = width_table.load_table(table_path)
+            self.assertEqual(dict(table.pair_to_kern), pair_to_kern)
+            self.assertEqual(table.char_to_width['W'], 90.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,229 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for coalesce and singleflight."""
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+import unittest
+from unittest import mock
+
+import pybadges
+from pybadges import coalesce
+from pybadges import singleflight
+
+
+class TestGroup(unittest.TestCase):
+
+    def test_concurrent_calls_coalesced(self):
+        group = singleflight.Group()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return object()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(
+                executor.map(lambda _: group.do('key', compute), range(8)))
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertFalse(group.in_flight('key'))
+
+    def test_exception_shared(self):
+        group = singleflight.Group()
+        started = threading.Event()
+        release = threading.Event()
+
+        def fail():
+            started.set()
+            release.wait()
+            raise ValueError('failed')
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(group.do, 'key', fail)
+            started.wait()
+            follower = executor.submit(group.do, 'key', lambda: 'unused')
+            # Give the follower time to start waiting for the leader.
+            time.sleep(0.1)
+            release.set()
+            with self.assertRaisesRegex(ValueError, 'failed'):
+                leader.result()
+            with self.assertRaisesRegex(ValueError, 'failed'):
+                follower.result()
+        # Later calls are not affected by the failure.
+        self.assertEqual(group.do('key', lambda: 'ok'), 'ok')
+
+
+class TestAsyncGroup(unittest.TestCase):
+
+    def test_concurrent_calls_coalesced(self):
+        group = singleflight.AsyncGroup()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return object()
+
+        async def main():
+            return await asyncio.gather(
+                *[group.do('key', compute) for _ in range(8)])
+
+        results = asyncio.run(main())
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(r is results[0] for r in results))
+
+    def test_exception_shared(self):
+        group = singleflight.AsyncGroup()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError('failed')
+
+        async def main():
+            return await asyncio.gather(
+                *[group.do('key', fail) for _ in range(3)],
+                return_exceptions=True)
+
+        for result in asyncio.run(main()):
+            self.assertIsInstance(result, ValueError)
+
+    def test_cancelled_waiter_does_not_cancel_call(self):
+        group = singleflight.AsyncGroup()
+
+        async def compute():
+            await asyncio.sleep(0.05)
+            return 'done'
+
+        async def main():
+            leader = asyncio.ensure_future(group.do('key', compute))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(group.do('key', compute))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            return await leader
+
+        self.assertEqual(asyncio.run(main()), 'done')
+
+    def test_cancelled_leader_does_not_cancel_call(self):
+        group = singleflight.AsyncGroup()
+
+        async def compute():
+            await asyncio.sleep(0.05)
+            return 'done'
+
+        async def main():
+            leader = asyncio.ensure_future(group.do('key', compute))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(group.do('key', compute))
+            await asyncio.sleep(0)
+            leader.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await leader
+            return await waiter
+
+        self.assertEqual(asyncio.run(main()), 'done')
+
+    def test_call_cancelled_when_every_caller_is_cancelled(self):
+        group = singleflight.AsyncGroup()
+        cancelled = []
+
+        async def compute():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def main():
+            callers = [
+                asyncio.ensure_future(group.do('key', compute))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0)
+            for caller in callers:
+                caller.cancel()
+            await asyncio.gather(*callers, return_exceptions=True)
+            await asyncio.sleep(0)
+            self.assertFalse(group.in_flight('key'))
+
+        asyncio.run(main())
+        self.assertEqual(cancelled, [True])
+
+
+class TestCoalesce(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._render_count = 0
+        render_element = pybadges._render_element
+
+        def slow_render_element(*args, **kwargs):
+            self._render_count += 1
+            time.sleep(0.1)
+            return render_element(*args, **kwargs)
+
+        patcher = mock.patch.object(pybadges, '_render_element',
+                                    slow_render_element)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_badge(self):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(
+                executor.map(
+                    lambda _: coalesce.badge(left_text='build',
+                                             right_text='passing'), range(8)))
+        self.assertEqual(self._render_count, 1)
+        self.assertEqual(
+            results,
+            [pybadges.badge(left_text='build', right_text='passing')] * 8)
+
+    def test_badge_bytes(self):
+        spec = pybadges.BadgeSpec(left_text='build', right_text='passing')
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(
+                executor.map(lambda _: coalesce.badge_bytes(spec), range(8)))
+        self.assertEqual(self._render_count, 1)
+        self.assertEqual(results, [pybadges.badge_bytes(spec)] * 8)
+
+    def test_different_badges_not_coalesced(self):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            list(
+                executor.map(lambda text: coalesce.badge(left_text=text),
+                             ['build', 'test']))
+        self.assertEqual(self._render_count, 2)
+
+    def test_badge_async(self):
+
+        async def main():
+            return await asyncio.gather(*[
+                coalesce.badge_async(left_text='build', right_text='passing')
+                for _ in range(8)
+            ] + [
+                coalesce.badge_bytes_async(left_text='build',
+                                           right_text='passing')
+            ])
+
+        results = asyncio.run(main())
+        self.assertEqual(self._render_count, 2)
+        expected = pybadges.badge(left_text='build', right_text='passing')
+        self.assertEqual(results, [expected] * 8 + [expected.encode('utf-8')])
+
+
+if __name__ == '__main__':
+    unittest.main()
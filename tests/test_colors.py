@@ -0,0 +1,69 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for colors."""
+
+import doctest
+import unittest
+
+from pybadges import colors
+
+
+class TestNormalize(unittest.TestCase):
+
+    def test_docs(self):
+        self.assertEqual(doctest.testmod(colors).failed, 0)
+
+    def test_valid(self):
+        for color, expected in [
+            ('green', '#97ca00'),
+            ('#97CA00', '#97ca00'),
+            ('#4c1', '#44cc11'),
+            ('#4c1f', '#44cc11'),
+            ('#44cc1180', '#44cc1180'),
+            ('Green', '#008000'),
+            ('rebeccapurple', '#663399'),
+            ('rgb(1, 2, 3)', '#010203'),
+            ('rgba(255,0,0,0.5)', '#ff000080'),
+            ('rgb(100% 0% 0% / 50%)', '#ff000080'),
+            ('rgb(300, -1, 0)', '#ff0000'),
+            ('hsl(120, 100%, 50%)', '#00ff00'),
+            ('hsla(240deg 100% 50% / 1)', '#0000ff'),
+            ('hsl(0.5turn, 50%, 50%)', '#40bfbf'),
+            ('transparent', '#00000000'),
+            ('currentColor', 'currentcolor'),
+            ('none', 'none'),
+        ]:
+            with self.subTest(color=color):
+                self.assertEqual(colors.normalize(color), expected)
+                self.assertTrue(colors.is_valid(color))
+
+    def test_invalid(self):
+        for color in [
+                None, '', '#', '#12', '#12345', '#ggg', 'bogus', 'rgb(1, 2)',
+                'rgb(1, 2, 3, 4, 5)', 'hsl(10%, 50%, 50%)', 'rgb(1deg, 2, 3)',
+                'url(#foo)'
+        ]:
+            with self.subTest(color=color):
+                with self.assertRaises(ValueError):
+                    colors.normalize(color)
+                self.assertFalse(colors.is_valid(color))
+
+    def test_resolve(self):
+        self.assertEqual(colors.resolve('green'), '#97CA00')
+        self.assertEqual(colors.resolve('#97ca00'), '#97ca00')
+        self.assertEqual(colors.resolve('Green'), 'Green')
+
+
+if __name__ == '__main__':
+    unittest.main()
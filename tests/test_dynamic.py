@@ -0,0 +1,240 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for dynamic."""
+
+import concurrent.futures
+import doctest
+import json
+import os.path
+import tempfile
+import time
+import unittest
+import unittest.mock
+
+import requests
+
+import pybadges
+from pybadges import dynamic
+from pybadges import embedding
+from pybadges import singleflight
+from tests import json_server
+
+DOCUMENT = {
+    'info': {
+        'version': '3.0.1',
+        'downloads': 1234,
+        'stable': True
+    },
+    'releases': [{
+        'version': '2.0'
+    }, {
+        'version': '3.0'
+    }],
+    'odd key': 'odd value',
+}
+
+
+class TestQuery(unittest.TestCase):
+
+    def test_docs(self):
+        self.assertEqual(doctest.testmod(dynamic).failed, 0)
+        self.assertEqual(doctest.testmod(singleflight).failed, 0)
+
+    def test_query(self):
+        for q, expected in [
+            ('$', [DOCUMENT]),
+            ('$.info.version', ['3.0.1']),
+            ('$.info["downloads"]', [1234]),
+            ("$['odd key']", ['odd value']),
+            ('$.releases[0].version', ['2.0']),
+            ('$.releases[-1].version', ['3.0']),
+            ('$.releases[*].version', ['2.0', '3.0']),
+            ('$.info.*', ['3.0.1', 1234, True]),
+            ('$.releases[2]', []),
+            ('$.missing.version', []),
+        ]:
+            with self.subTest(query=q):
+                self.assertEqual(dynamic.query(DOCUMENT, q), expected)
+
+    def test_invalid_query(self):
+        for q in ['info.version', '$.', '$[0', '$..version', '$[foo]']:
+            with self.subTest(query=q):
+                with self.assertRaises(ValueError):
+                    dynamic.query(DOCUMENT, q)
+
+
+class TestDynamicBadges(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._server = json_server.JsonServer(DOCUMENT)
+        cls._server.start_server()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls._server.stop_server()
+
+    def setUp(self):
+        super().setUp()
+        self._server.reset(DOCUMENT)
+        self._now = 1000.0
+
+    def _dynamic_badges(self, **kwargs):
+        return dynamic.DynamicBadges(clock=lambda: self._now, **kwargs)
+
+    def test_value(self):
+        badges = self._dynamic_badges()
+        self.assertEqual(badges.value(self._server.url, '$.info.version'),
+                         '3.0.1')
+        self.assertEqual(badges.value(self._server.url, '$.info.stable'),
+                         'true')
+        self.assertEqual(
+            badges.value(self._server.url, '$.releases[*].version'), '2.0, 3.0')
+        with self.assertRaises(ValueError):
+            badges.value(self._server.url, '$.info.missing')
+
+    def test_badge(self):
+        badges = self._dynamic_badges()
+        self.assertEqual(
+            badges.badge(self._server.url,
+                         '$.info.version',
+                         left_text='pypi',
+                         prefix='v',
+                         right_color='green'),
+            pybadges.badge(left_text='pypi',
+                           right_text='v3.0.1',
+                           right_color='green'))
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'document.json')
+            with open(path, 'w') as f:
+                json.dump(DOCUMENT, f)
+            badges = self._dynamic_badges()
+            self.assertEqual(badges.value(path, '$.info.downloads'), '1234')
+            self.assertEqual(badges.value('file://' + path, '$.info.version'),
+                             '3.0.1')
+
+    def test_keyword_arguments(self):
+        badges = self._dynamic_badges()
+        self.assertEqual(
+            badges.badge(url=self._server.url,
+                         path='$.info.version',
+                         left_text='pypi'),
+            pybadges.badge(left_text='pypi', right_text='3.0.1'))
+
+    def test_too_large(self):
+        badges = self._dynamic_badges(embedder=embedding.Embedder(max_bytes=10))
+        with self.assertRaises(embedding.TooLarge):
+            badges.fetch(self._server.url)
+
+    def test_host_not_allowed(self):
+        badges = self._dynamic_badges(embedder=embedding.Embedder(
+            allowed_hosts=['example.com']))
+        with self.assertRaises(embedding.NotAllowed):
+            badges.fetch(self._server.url)
+        self.assertEqual(self._server.request_count, 0)
+
+    def test_files_not_allowed(self):
+        badges = self._dynamic_badges(embedder=embedding.Embedder(
+            allow_files=False))
+        for url in [__file__, 'file://' + __file__]:
+            with self.subTest(url=url):
+                with self.assertRaises(embedding.NotAllowed):
+                    badges.fetch(url)
+
+    def test_unsupported_scheme(self):
+        with self.assertRaisesRegex(ValueError, 'unsupported scheme'):
+            self._dynamic_badges().fetch('ftp://example.com/document.json')
+
+    def test_http_error(self):
+        self._server.status = 404
+        with self.assertRaises(requests.HTTPError):
+            self._dynamic_badges().fetch(self._server.url)
+
+    def test_cached_until_ttl(self):
+        badges = self._dynamic_badges(ttl=60, stale_ttl=0)
+        badges.fetch(self._server.url)
+        self._server.document = {'info': {'version': '4.0'}}
+        self._now += 59
+        self.assertEqual(badges.value(self._server.url, '$.info.version'),
+                         '3.0.1')
+        self._now += 1
+        self.assertEqual(badges.value(self._server.url, '$.info.version'),
+                         '4.0')
+        self.assertEqual(self._server.request_count, 2)
+
+    def test_stale_while_revalidate(self):
+        badges = self._dynamic_badges(ttl=60, stale_ttl=600)
+        badges.fetch(self._server.url)
+        self._server.document = {'info': {'version': '4.0'}}
+        self._now += 120
+        # The stale document is returned immediately and refreshed in the
+        # background.
+        self.assertEqual(badges.value(self._server.url, '$.info.version'),
+                         '3.0.1')
+        deadline = time.monotonic() + 10
+        while (badges.value(self._server.url, '$.info.version') != '4.0' and
+               time.monotonic() < deadline):
+            time.sleep(0.01)
+        self.assertEqual(badges.value(self._server.url, '$.info.version'),
+                         '4.0')
+        self.assertEqual(self._server.request_count, 2)
+
+    def test_stale_revalidated_once(self):
+        badges = self._dynamic_badges(ttl=60, stale_ttl=600)
+        badges.fetch(self._server.url)
+        self._now += 120
+        # The threads are never started, so the revalidation never finishes
+        # or is seen by the singleflight.Group.
+        with unittest.mock.patch.object(dynamic, 'threading') as threading:
+            for _ in range(8):
+                badges.fetch(self._server.url)
+        threading.Thread.assert_called_once()
+
+    def test_stale_kept_if_revalidation_fails(self):
+        badges = self._dynamic_badges(ttl=60, stale_ttl=600)
+        badges.fetch(self._server.url)
+        self._server.status = 500
+        self._now += 120
+        for _ in range(3):
+            self.assertEqual(badges.value(self._server.url, '$.info.version'),
+                             '3.0.1')
+        self._now += 600
+        with self.assertRaises(requests.HTTPError):
+            badges.fetch(self._server.url)
+
+    def test_concurrent_fetches_coalesced(self):
+        self._server.delay = 0.2
+        badges = self._dynamic_badges()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            values = list(
+                executor.map(
+                    lambda _: badges.value(self._server.url, '$.info.version'),
+                    range(8)))
+        self.assertEqual(values, ['3.0.1'] * 8)
+        self.assertEqual(self._server.request_count, 1)
+
+    def test_max_entries(self):
+        badges = self._dynamic_badges(max_entries=1)
+        badges.fetch(self._server.url + 'a')
+        badges.fetch(self._server.url + 'b')
+        badges.fetch(self._server.url + 'a')
+        self.assertEqual(self._server.request_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
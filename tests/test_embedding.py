@@ -0,0 +1,208 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for embedding."""
+
+import os.path
+import threading
+import time
+import unittest
+import urllib.parse
+
+import requests
+
+import pybadges
+from pybadges import embedding
+from tests import image_server
+from tests import test_pybadges
+
+PNG_DATA_URL = 'data:image/png;base64,' + test_pybadges.PNG_IMAGE_B64
+
+
+class TestEmbedder(unittest.TestCase):
+
+    def _start_server(self, image_data=test_pybadges.PNG_IMAGE, **kwargs):
+        srv = image_server.ImageServer(image_data, **kwargs)
+        srv.start_server()
+        self.addCleanup(srv.stop_server)
+        return srv
+
+    def _start_blocked_fetch(self, embedder, url):
+        """Starts fetching url in a thread, which waits until unblocked."""
+        results = []
+        in_flight = embedder.in_flight()
+        thread = threading.Thread(
+            target=lambda: results.append(embedder.embed(url)))
+        thread.start()
+        deadline = time.monotonic() + 5
+        while (embedder.in_flight() == in_flight and
+               time.monotonic() < deadline):
+            time.sleep(0.01)
+        return thread, results
+
+    def test_data_url(self):
+        self.assertEqual(embedding.Embedder().embed(PNG_DATA_URL), PNG_DATA_URL)
+
+    def test_http_url(self):
+        srv = self._start_server()
+        embedder = embedding.Embedder()
+        self.assertEqual(embedder.embed(srv.logo_url), PNG_DATA_URL)
+        self.assertEqual(embedder.in_flight(), 0)
+
+    def test_not_image(self):
+        srv = self._start_server(b'<html/>', content_type='text/html')
+        with self.assertRaisesRegex(ValueError,
+                                    'expected an image, got "text"'):
+            embedding.Embedder().embed(srv.logo_url)
+
+    def test_too_large(self):
+        srv = self._start_server(b'\0' * 100000)
+        embedder = embedding.Embedder(max_bytes=1000)
+        with self.assertRaisesRegex(embedding.TooLarge, '1000 bytes'):
+            embedder.embed(srv.logo_url)
+        self.assertEqual(embedder.in_flight(), 0)
+
+    def test_timeout(self):
+        srv = self._start_server(delay=1)
+        start = time.monotonic()
+        with self.assertRaises(requests.Timeout):
+            embedding.Embedder(timeout=0.2).embed(srv.logo_url)
+        self.assertLess(time.monotonic() - start, 0.9)
+
+    def test_timeout_while_reading(self):
+        # Each byte arrives well within the timeout, but the whole image
+        # would take 5 seconds.
+        srv = self._start_server(b'\0' * 100, drip_interval=0.05)
+        start = time.monotonic()
+        with self.assertRaises(requests.Timeout):
+            embedding.Embedder(timeout=0.5).embed(srv.logo_url)
+        self.assertLess(time.monotonic() - start, 1.5)
+
+    def test_unlimited_by_default(self):
+        gate = threading.Event()
+        srv = self._start_server(gate=gate)
+        embedder = embedding.Embedder()
+        fetches = [
+            self._start_blocked_fetch(embedder, srv.logo_url) for _ in range(8)
+        ]
+        self.assertEqual(embedder.in_flight(), 8)
+        gate.set()
+        for thread, results in fetches:
+            thread.join()
+            self.assertEqual(results, [PNG_DATA_URL])
+
+    def test_global_budget_fails_fast(self):
+        gate = threading.Event()
+        srv = self._start_server(gate=gate)
+        embedder = embedding.Embedder(max_in_flight=1)
+        thread, results = self._start_blocked_fetch(embedder, srv.logo_url)
+
+        other_srv = self._start_server()
+        start = time.monotonic()
+        with self.assertRaises(embedding.Overloaded):
+            embedder.embed(other_srv.logo_url)
+        self.assertLess(time.monotonic() - start, 0.5)
+
+        gate.set()
+        thread.join()
+        self.assertEqual(results, [PNG_DATA_URL])
+        self.assertEqual(embedder.embed(other_srv.logo_url), PNG_DATA_URL)
+
+    def test_per_host_limit(self):
+        gate = threading.Event()
+        srv = self._start_server(gate=gate)
+        embedder = embedding.Embedder(max_per_host=1)
+        thread, _ = self._start_blocked_fetch(embedder, srv.logo_url)
+
+        with self.assertRaisesRegex(embedding.Overloaded, '"localhost"'):
+            embedder.embed(srv.logo_url)
+        # The same server, but a different host name.
+        other_host_url = srv.logo_url.replace('localhost', '127.0.0.1')
+        other_thread, _ = self._start_blocked_fetch(embedder, other_host_url)
+        self.assertEqual(embedder.in_flight(), 2)
+
+        gate.set()
+        thread.join()
+        other_thread.join()
+        self.assertEqual(embedder.in_flight(), 0)
+
+    def test_hosts(self):
+        srv = self._start_server()
+        for kwargs in [{
+                'allowed_hosts': ['example.com']
+        }, {
+                'denied_hosts': ['localhost']
+        }, {
+                'allowed_hosts': ['localhost'],
+                'denied_hosts': ['LOCALHOST']
+        }]:
+            with self.subTest(**kwargs):
+                with self.assertRaisesRegex(embedding.NotAllowed,
+                                            'host "localhost"'):
+                    embedding.Embedder(**kwargs).embed(srv.logo_url)
+        self.assertEqual(
+            embedding.Embedder(allowed_hosts=['localhost']).embed(srv.logo_url),
+            PNG_DATA_URL)
+        self.assertTrue(
+            embedding._host_matches('img.example.com', ['example.com']))
+        self.assertFalse(
+            embedding._host_matches('badexample.com', ['example.com']))
+
+    def test_schemes(self):
+        with self.assertRaisesRegex(embedding.NotAllowed,
+                                    'scheme "http" is not allowed'):
+            embedding.Embedder(
+                allowed_schemes=['https']).embed('http://example.com/')
+        with self.assertRaisesRegex(embedding.NotAllowed,
+                                    'unsupported scheme "ftp"'):
+            embedding.Embedder().embed('ftp://example.com/logo.png')
+        with self.assertRaisesRegex(ValueError, 'unsupported scheme "ftp"'):
+            embedding.Embedder(allowed_schemes=['ftp'])
+
+    def test_redirects_are_checked(self):
+        srv = self._start_server()
+        target = srv.logo_url.replace('localhost', '127.0.0.1') + '/logo.png'
+        redirect_url = '{0}/redirect?to={1}'.format(
+            srv.logo_url, urllib.parse.quote(target, safe=''))
+
+        self.assertEqual(embedding.Embedder().embed(redirect_url), PNG_DATA_URL)
+        with self.assertRaisesRegex(embedding.NotAllowed, 'host "127.0.0.1"'):
+            embedding.Embedder(denied_hosts=['127.0.0.1']).embed(redirect_url)
+        with self.assertRaises(requests.TooManyRedirects):
+            embedding.Embedder(max_redirects=0).embed(redirect_url)
+
+    def test_files(self):
+        path = os.path.join(test_pybadges.TEST_DIR, 'golden-images',
+                            'build-failure.svg')
+        self.assertRegex(embedding.Embedder().embed(path),
+                         r'^data:image/svg(\+xml)?;base64,')
+        with self.assertRaisesRegex(embedding.NotAllowed, 'files'):
+            embedding.Embedder(allow_files=False).embed(path)
+
+    def test_default_embedder(self):
+        srv = self._start_server()
+        self.addCleanup(embedding.set_default_embedder,
+                        embedding.default_embedder())
+        embedding.set_default_embedder(
+            embedding.Embedder(denied_hosts=['localhost']))
+        with self.assertRaises(embedding.NotAllowed):
+            pybadges.badge(left_text='build',
+                           logo=srv.logo_url,
+                           embed_logo=True)
+        # Images that are not embedded are not fetched.
+        self.assertIn(srv.logo_url,
+                      pybadges.badge(left_text='build', logo=srv.logo_url))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for fonts."""
+
+import json
+import os.path
+import re
+import tempfile
+import unittest
+import unittest.mock
+
+import pybadges
+from pybadges import fonts
+from pybadges import precalculated_text_measurer
+
+
+class TestFonts(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Fonts registered by the tests don't leak into other tests.
+        for name in ['_fonts', '_measurers']:
+            patcher = unittest.mock.patch.object(fonts, name,
+                                                 dict(getattr(fonts, name)))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self._loads = 0
+
+    def _load_test_font(self):
+        self._loads += 1
+        return precalculated_text_measurer.PrecalculatedTextMeasurer(
+            10, {'i': 4}, {})
+
+    def test_default_font(self):
+        self.assertIs(
+            fonts.measurer(),
+            precalculated_text_measurer.PrecalculatedTextMeasurer.default())
+
+    def test_lazy_and_cached(self):
+        fonts.register_font('Lazy', 'Lazy,sans-serif',
+                            {110: self._load_test_font})
+        self.assertEqual(self._loads, 0)
+        self.assertIs(fonts.measurer('Lazy'), fonts.measurer('Lazy'))
+        self.assertEqual(self._loads, 1)
+
+    def test_scaled(self):
+        fonts.register_font('Scaled', 'Scaled,sans-serif',
+                            {110: self._load_test_font})
+        self.assertEqual(fonts.measurer('Scaled', 55).text_width('ix'), 7)
+        self.assertEqual(fonts.measurer('Scaled', 220).text_width('ix'), 28)
+        self.assertEqual(self._loads, 1)
+
+    def test_scaled_sizes_not_cached(self):
+        fonts.register_font('Scaled', 'Scaled,sans-serif',
+                            {110: self._load_test_font})
+        for size in range(1, 200):
+            fonts.measurer('Scaled', size)
+        self.assertEqual(
+            [key for key in fonts._measurers if key[0] == 'Scaled'],
+            [('Scaled', 110)])
+        self.assertEqual(self._loads, 1)
+
+    def test_scaled_cumulative_widths(self):
+        fonts.register_font('Scaled', 'Scaled,sans-serif',
+                            {110: self._load_test_font})
+        measurer = fonts.measurer('Scaled', 55)
+        with unittest.mock.patch.object(
+                precalculated_text_measurer.PrecalculatedTextMeasurer,
+                'cumulative_widths',
+                return_value=[2, 7]) as cumulative_widths:
+            self.assertEqual(measurer.cumulative_widths('ix'), [1, 3.5])
+        cumulative_widths.assert_called_once_with('ix')
+        self.assertEqual(
+            fonts.measurer('Scaled', 220).cumulative_widths('iix'), [8, 16, 36])
+
+    def test_closest_size(self):
+        small = precalculated_text_measurer.PrecalculatedTextMeasurer(9, {}, {})
+        fonts.register_font('Sizes', 'Sizes,sans-serif', {
+            90: lambda: small,
+            110: self._load_test_font
+        })
+        self.assertEqual(fonts.measurer('Sizes', 95).text_width('x'), 9.5)
+        self.assertEqual(self._loads, 0)
+
+    def test_table_file(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'widths.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {
+                        'mean-character-length': 50,
+                        'character-lengths': {},
+                        'kerning-pairs': {}
+                    }, f)
+            fonts.register_font('File', 'File,sans-serif', {110: path})
+            self.assertEqual(fonts.measurer('File').text_width('ab'), 100)
+
+    def test_unknown_font(self):
+        with self.assertRaisesRegex(ValueError, 'unknown font "Missing"'):
+            fonts.measurer('Missing')
+
+    def test_badge_font(self):
+        fonts.register_font('Badge', 'Badge,sans-serif',
+                            {110: self._load_test_font})
+        svg = pybadges.badge(left_text='ii', right_text='xx', font='Badge')
+        self.assertIn('font-family="Badge,sans-serif"', svg)
+        self.assertIn('width="22.8"', svg)
+
+    def test_badge_font_size(self):
+        fonts.register_font('Badge', 'Badge,sans-serif',
+                            {110: self._load_test_font})
+        svg = pybadges.badge(left_text='ii',
+                             right_text='xx',
+                             font='Badge',
+                             font_size=220)
+        self.assertIn('font-size="220"', svg)
+        self.assertIn('width="25.6"', svg)
+        self.assertEqual(
+            pybadges.badge_size(left_text='ii',
+                                right_text='xx',
+                                font='Badge',
+                                font_size=220).width, 25.6)
+
+    def test_badge_font_size_shrunk(self):
+        svg = pybadges.badge(left_text='build',
+                             right_text='a very long right-hand text',
+                             font_size=55,
+                             max_right_text_width=20,
+                             text_overflow='shrink')
+        shrunk = [
+            float(size)
+            for size in re.findall(r'<text[^>]* font-size="([^"]*)"', svg)
+        ]
+        self.assertTrue(shrunk)
+        self.assertTrue(all(size < 55 for size in shrunk))
+
+    def test_invalid_font_size(self):
+        with self.assertRaisesRegex(ValueError, 'font_size'):
+            pybadges.badge(left_text='build', font_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the golden-image test runner."""
+
+import os.path
+import tempfile
+import unittest
+
+import pybadges
+from tests import golden
+
+SVG = ('<svg xmlns="http://www.w3.org/2000/svg" width="82.3" height="20">'
+       '<g transform="scale(0.1)"><text x="315.0">build</text></g></svg>')
+
+
+class TestCompareSvg(unittest.TestCase):
+
+    def test_same(self):
+        self.assertEqual(golden.compare_svg(SVG, SVG), [])
+
+    def test_whitespace_ignored(self):
+        self.assertEqual(
+            golden.compare_svg(
+                SVG,
+                SVG.replace('<g', '\n  <g').replace('</g>', '</g>\n')), [])
+
+    def test_numbers_within_tolerance(self):
+        self.assertEqual(
+            golden.compare_svg(
+                SVG,
+                SVG.replace('82.3', '82.30000000000001').replace(
+                    '315.0', '315').replace('0.1', '.1')), [])
+
+    def test_numbers_outside_tolerance(self):
+        differences = golden.compare_svg(SVG, SVG.replace('315.0', '315.5'))
+        self.assertEqual(
+            differences,
+            ["/svg/g[0]/text[0]/@x: expected '315.0', got '315.5'"])
+        self.assertEqual(
+            golden.compare_svg(SVG, SVG.replace('315.0', '315.5'), tolerance=1),
+            [])
+
+    def test_attribute_differences(self):
+        differences = golden.compare_svg(
+            SVG,
+            SVG.replace('width="82.3"',
+                        'fill="#fff"').replace('scale(0.1)', 'rotate(0.1)'))
+        self.assertEqual(differences, [
+            "/svg/@fill: expected None, got '#fff'",
+            "/svg/@width: expected '82.3', got None",
+            "/svg/g[0]/@transform: expected 'scale(0.1)', got 'rotate(0.1)'",
+        ])
+
+    def test_structure_differences(self):
+        self.assertEqual(
+            golden.compare_svg(SVG, SVG.replace('build', 'passing')), [
+                "/svg/g[0]/text[0]/text()[0]: expected text 'build', got "
+                "'passing'"
+            ])
+        self.assertEqual(
+            golden.compare_svg(SVG,
+                               SVG.replace('<g', '<a').replace('</g>', '</a>')),
+            ['/svg/g[0]: expected <g>, got <a>'])
+        self.assertEqual(
+            golden.compare_svg(SVG, SVG.replace('</g>', '</g><g/>')),
+            ['/svg: expected 1 children, got 2: [g] vs [g, g]'])
+
+
+class TestRun(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self._golden_dir = temp_dir.name
+        with open(os.path.join(self._golden_dir, 'build.svg'), 'w') as f:
+            f.write(pybadges.badge(left_text='build', right_text='passing'))
+        self._cases = [
+            golden.GoldenCase('build.svg',
+                              dict(left_text='build', right_text='passing')),
+            golden.GoldenCase('build.svg',
+                              dict(left_text='build', right_text='failing')),
+            golden.GoldenCase('missing.svg', dict(left_text='build')),
+            golden.GoldenCase(
+                'build.svg',
+                dict(left_text='build',
+                     whole_link='http://example',
+                     left_link='http://example')),
+        ]
+
+    def _check(self, results):
+        self.assertEqual([r.file_name for r in results],
+                         [c.file_name for c in self._cases])
+        self.assertTrue(results[0].passed)
+        self.assertGreater(results[0].render_seconds, 0)
+        self.assertFalse(results[1].passed)
+        self.assertIn("expected text 'passing', got 'failing'",
+                      results[1].differences[-1])
+        self.assertIn('No such file', results[2].error)
+        self.assertIn('ValueError', results[3].error)
+        self.assertIn('4 cases, 3 failed', golden.format_report(results))
+
+    def test_run_in_process(self):
+        self._check(golden.run(self._cases, self._golden_dir, workers=1))
+
+    def test_run_in_parallel(self):
+        self._check(
+            golden.run(self._cases, self._golden_dir, workers=2, repeat=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
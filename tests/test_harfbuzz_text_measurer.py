@@ -0,0 +1,118 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for HarfBuzzMeasurer."""
+
+import os
+import os.path
+import tempfile
+import unittest
+
+import pybadges
+from pybadges import precalculated_text_measurer
+from pybadges import render_cache
+
+try:
+    from pybadges import harfbuzz_text_measurer
+except ImportError:
+    harfbuzz_text_measurer = None
+
+DEJA_VU_SANS_PATH = os.environ.get(
+    'DEJA_VU_SANS_PATH', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf')
+
+
+@unittest.skipIf(harfbuzz_text_measurer is None, 'uharfbuzz not installed')
+@unittest.skipUnless(os.path.exists(DEJA_VU_SANS_PATH),
+                     'DejaVu Sans not found, set DEJA_VU_SANS_PATH')
+class TestHarfBuzzMeasurer(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._measurer = harfbuzz_text_measurer.HarfBuzzMeasurer(
+            DEJA_VU_SANS_PATH)
+
+    def test_empty(self):
+        self.assertEqual(self._measurer.text_width(''), 0)
+
+    def test_close_to_precalculated(self):
+        precalculated = (
+            precalculated_text_measurer.PrecalculatedTextMeasurer.default())
+        for text in ['build', 'passing', 'coverage', '3.2, 3.3, 3.4']:
+            with self.subTest(text=text):
+                self.assertAlmostEqual(self._measurer.text_width(text),
+                                       precalculated.text_width(text),
+                                       delta=len(text) * 2)
+
+    def test_arabic_shaped(self):
+        # Arabic letters take contextual forms so the shaped width of a word
+        # is not the sum of the widths of its isolated letters.
+        word = 'علم'
+        self.assertNotAlmostEqual(
+            self._measurer.text_width(word),
+            sum(self._measurer.text_width(c) for c in word))
+
+    def test_font_size(self):
+        small = harfbuzz_text_measurer.HarfBuzzMeasurer(DEJA_VU_SANS_PATH,
+                                                        font_size=11)
+        self.assertAlmostEqual(
+            small.text_width('build') * 10, self._measurer.text_width('build'))
+
+    def test_cumulative_widths(self):
+        self.assertEqual(self._measurer.cumulative_widths(''), [])
+        for text in ['build', 'AVAV', 'علم']:
+            with self.subTest(text=text):
+                widths = self._measurer.cumulative_widths(text)
+                self.assertEqual(len(widths), len(text))
+                self.assertAlmostEqual(widths[-1],
+                                       self._measurer.text_width(text))
+        # Without contextual shaping, every prefix is measured exactly.
+        text = 'passing'
+        self.assertEqual(
+            [round(w, 6) for w in self._measurer.cumulative_widths(text)], [
+                round(self._measurer.text_width(text[:i + 1]), 6)
+                for i in range(len(text))
+            ])
+
+    def test_fingerprint(self):
+        self.assertEqual(
+            self._measurer.fingerprint(),
+            harfbuzz_text_measurer.HarfBuzzMeasurer(
+                DEJA_VU_SANS_PATH).fingerprint())
+        self.assertNotEqual(
+            self._measurer.fingerprint(),
+            harfbuzz_text_measurer.HarfBuzzMeasurer(DEJA_VU_SANS_PATH,
+                                                    font_size=11).fingerprint())
+
+    def test_render_cache(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        cache = render_cache.RenderCache(os.path.join(temp_dir.name,
+                                                      'cache.sqlite'),
+                                         measurer=self._measurer)
+        self.addCleanup(cache.close)
+        self.assertEqual(
+            cache.badge(left_text='build', right_text='passing'),
+            pybadges.badge(left_text='build',
+                           right_text='passing',
+                           measurer=self._measurer))
+
+    def test_cached(self):
+        self._measurer.text_width('cached')
+        self._measurer.text_width('cached')
+        info = self._measurer._cached_text_width.cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for layout and pybadges.badge_size."""
+
+import json
+import os.path
+import unittest
+from xml.dom import minidom
+
+import pybadges
+from pybadges import layout
+
+TEST_DIR = os.path.dirname(__file__)
+
+
+class TestLayout(unittest.TestCase):
+
+    def test_left_only(self):
+        l = layout.compute(20, None)
+        self.assertEqual(l.width, 30)
+        self.assertEqual(l.right_width, 0)
+        self.assertIsNone(l.right_text_x)
+
+    def test_geometry(self):
+        geometry = layout.Geometry(height=28, text_margin=24)
+        l = layout.compute(20, 30, has_logo=True, geometry=geometry)
+        self.assertEqual(l.height, 28)
+        self.assertEqual(l.left_width, 20 + 24 + 14 + 3)
+        self.assertEqual(l.width, 61 + 54)
+        self.assertEqual(l.left_text_length, 200)
+        self.assertEqual(l.right_text_length, 300)
+        self.assertEqual(geometry.image_y, 7)
+
+    def test_logo(self):
+        l = layout.compute(20, 30, has_logo=True)
+        self.assertEqual(l.left_width, 20 + 10 + 14 + 3)
+        self.assertEqual(l.right_x, l.left_width)
+        self.assertEqual(l.width, 47 + 40)
+
+    def test_center_image(self):
+        l = layout.compute(20, 30, has_center_image=True)
+        self.assertEqual(l.center_x, 30)
+        self.assertEqual(l.center_width, 117)
+        self.assertEqual(l.right_width, 117 + 30 + 10)
+        self.assertEqual(l.right_text_length, 300)
+
+
+class TestBadgeSize(unittest.TestCase):
+
+    def test_matches_rendered_badges(self):
+        with open(os.path.join(TEST_DIR, 'test-badges.json'), 'r') as f:
+            examples = json.load(f)
+
+        for example in examples:
+            example.pop('file_name')
+            with self.subTest(example=example):
+                size = pybadges.badge_size(**example)
+                example['embed_logo'] = False
+                svg = minidom.parseString(pybadges.badge(**example))
+                self.assertEqual(svg.documentElement.getAttribute('width'),
+                                 str(size.width))
+
+    def test_spec(self):
+        spec = pybadges.BadgeSpec(left_text='coverage', right_text='23%')
+        self.assertEqual(
+            pybadges.badge_size(spec),
+            pybadges.badge_size(left_text='coverage', right_text='23%'))
+
+    def test_unknown_argument(self):
+        with self.assertRaisesRegex(TypeError, 'right_txt'):
+            pybadges.badge_size(left_text='coverage', right_txt='23%')
+
+    def test_spec_with_other_arguments(self):
+        spec = pybadges.BadgeSpec(left_text='coverage', right_text='23%')
+        with self.assertRaises(TypeError):
+            pybadges.badge_size(spec, right_text='24%')
+
+    def test_invalid_badge(self):
+        for kwargs in [{
+                'whole_link': 'https://example.com/',
+                'left_link': 'https://example.com/'
+        }, {
+                'center_image': 'python'
+        }, {
+                'text_overflow': 'wrap'
+        }, {
+                'style': 'unknown'
+        }]:
+            with self.subTest(**kwargs):
+                with self.assertRaises(ValueError):
+                    pybadges.badge_size(left_text='coverage',
+                                        right_text='23%',
+                                        **kwargs)
+                with self.assertRaises(ValueError):
+                    pybadges.badge(left_text='coverage',
+                                   right_text='23%',
+                                   **kwargs)
+
+
+if __name__ == '__main__':
+    unittest.main()
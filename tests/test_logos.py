@@ -0,0 +1,151 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for logos."""
+
+import base64
+import io
+import lzma
+import os.path
+import tempfile
+import unittest
+import unittest.mock
+
+import pybadges
+from pybadges import logos
+from tests import test_pybadges
+
+PNG_DATA_URL = 'data:image/png;base64,' + test_pybadges.PNG_IMAGE_B64
+SVG_IMAGE = b'<svg xmlns="http://www.w3.org/2000/svg"/>'
+SVG_DATA_URL = ('data:image/svg+xml;base64,' +
+                base64.b64encode(SVG_IMAGE).decode('ascii'))
+
+
+class TestLogos(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        for name, value in [('_logos', {}), ('_pending', [])]:
+            patcher = unittest.mock.patch.object(logos, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self._dir = os.path.join(temp_dir.name, 'logos')
+        os.mkdir(self._dir)
+        os.mkdir(os.path.join(self._dir, 'subdirectory'))
+        for file_name, data in [('Python.png', test_pybadges.PNG_IMAGE),
+                                ('github.svg', SVG_IMAGE),
+                                ('README.txt', b'not an image')]:
+            with open(os.path.join(self._dir, file_name), 'wb') as f:
+                f.write(data)
+        self._bundle_path = os.path.join(temp_dir.name, 'logos.json.xz')
+
+    def test_directory(self):
+        logos.register_directory(self._dir)
+        self.assertEqual(logos.names(), ['github', 'python'])
+        self.assertEqual(logos.get('python'), PNG_DATA_URL)
+        self.assertEqual(logos.data_url('github'), SVG_DATA_URL)
+        self.assertIsNone(logos.get('readme'))
+        with self.assertRaisesRegex(ValueError, 'unknown logo "gitlab"'):
+            logos.data_url('gitlab')
+
+    def test_loaded_lazily_and_once(self):
+        logos.register_directory(self._dir)
+        with unittest.mock.patch.object(logos,
+                                        'encode_file',
+                                        wraps=logos.encode_file) as encode:
+            encode.assert_not_called()
+            self.assertEqual(logos.get('python'), PNG_DATA_URL)
+            self.assertEqual(encode.call_count, 3)
+            for _ in range(10):
+                pybadges.badge(left_text='python', logo='python')
+            self.assertEqual(encode.call_count, 3)
+
+    def test_missing_directory(self):
+        logos.register_directory(os.path.join(self._dir, 'missing'))
+        with self.assertRaises(FileNotFoundError):
+            logos.get('python')
+
+    def test_failed_source_only_raises_once(self):
+        logos.register_directory(os.path.join(self._dir, 'missing'))
+        logos.register_directory(self._dir)
+        with self.assertRaises(FileNotFoundError):
+            logos.get('python')
+        self.assertEqual(logos.get('python'), PNG_DATA_URL)
+
+    def test_urls_are_not_looked_up(self):
+        logos.register_directory(os.path.join(self._dir, 'missing'))
+        for url in [
+                PNG_DATA_URL, 'https://example.com/python.png',
+                '/path/to/python.png'
+        ]:
+            self.assertIsNone(logos.get(url))
+        self.assertIn(
+            'xlink:href="https://example.com/python.png"',
+            pybadges.badge(left_text='python',
+                           logo='https://example.com/python.png'))
+        with self.assertRaises(FileNotFoundError):
+            logos.get('python')
+
+    def test_invalid_name(self):
+        with self.assertRaisesRegex(ValueError, 'invalid logo name'):
+            logos.register_logo('http://example.com/', PNG_DATA_URL)
+
+    def test_image_types(self):
+        for data, image_type in [(test_pybadges.PNG_IMAGE, 'png'),
+                                 (b'\xff\xd8\xff\xe0\0\x10JFIF', 'jpeg'),
+                                 (b'GIF89a\1\0', 'gif'),
+                                 (b'RIFF\0\0\0\0WEBPVP8 ', 'webp'),
+                                 (SVG_IMAGE, None)]:
+            self.assertEqual(logos._image_type(data), image_type)
+
+    def test_bundle(self):
+        with lzma.open(self._bundle_path, 'wt', encoding='utf-8') as f:
+            self.assertEqual(logos.write_bundle(f, self._dir),
+                             ['github', 'python'])
+        logos.register_bundle(self._bundle_path)
+        self.assertEqual(logos.get('python'), PNG_DATA_URL)
+        self.assertEqual(logos.get('github'), SVG_DATA_URL)
+
+    def test_later_registrations_replace_earlier(self):
+        logos.register_directory(self._dir)
+        self.assertEqual(logos.get('python'), PNG_DATA_URL)
+        logos.register_logo('python', SVG_DATA_URL)
+        self.assertEqual(logos.get('python'), SVG_DATA_URL)
+
+    def test_badge(self):
+        logos.register_directory(self._dir)
+        self.assertEqual(pybadges.badge(left_text='python', logo='python'),
+                         pybadges.badge(left_text='python', logo=PNG_DATA_URL))
+        self.assertEqual(
+            pybadges.badge(left_text='python', logo='python', embed_logo=True),
+            pybadges.badge(left_text='python', logo=PNG_DATA_URL))
+
+    def test_badge_unregistered_name(self):
+        # Logos that aren't registered names are used as URLs.
+        self.assertIn('xlink:href="gitlab"',
+                      pybadges.badge(left_text='gitlab', logo='gitlab'))
+
+    def test_write_bundle_json(self):
+        f = io.StringIO()
+        logos.write_bundle(f, self._dir)
+        self.assertEqual(
+            f.getvalue(),
+            '{{"github":"{0}","python":"{1}"}}'.format(SVG_DATA_URL,
+                                                       PNG_DATA_URL))
+
+
+if __name__ == '__main__':
+    unittest.main()
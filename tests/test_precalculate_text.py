@@ -0,0 +1,233 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for precalculate_text."""
+
+import io
+import json
+import os.path
+import tempfile
+import unittest
+import unittest.mock
+
+from fontTools import ttLib
+
+from pybadges import pil_text_measurer
+from pybadges import precalculate_text
+from pybadges import precalculated_text_measurer
+from pybadges import text_measurer
+from pybadges import width_table
+
+_CHARACTERS = 'AVTabcoé'
+
+DEJA_VU_SANS_PATH = os.environ.get(
+    'DEJA_VU_SANS_PATH', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf')
+
+
+class _FakeMeasurer(text_measurer.TextMeasurer):
+    """Measures each character as its codepoint, with "A" and "V" kerned."""
+
+    def __init__(self, fail_after=None):
+        self.calls = 0
+        self._fail_after = fail_after
+
+    def text_width(self, text):
+        self.calls += 1
+        if self.calls == self._fail_after:
+            raise KeyboardInterrupt()
+        width = sum(ord(c) for c in text)
+        if len(text) == 2 and set(text) == {'A', 'V'}:
+            width -= 1.5
+        return width
+
+
+class TestPrecalculateText(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Duplicated, as fonts with several Unicode cmaps are.
+        patcher = unittest.mock.patch.object(
+            precalculate_text,
+            'generate_supported_characters',
+            return_value=list(reversed(_CHARACTERS)) + list(_CHARACTERS))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self._dir = temp_dir.name
+        self._checkpoint = precalculate_text.Checkpoint(os.path.join(
+            self._dir, 'checkpoint.json'),
+                                                        interval=5)
+
+    def _write_json(self, measurer, **kwargs):
+        f = io.StringIO()
+        precalculate_text.write_json(f, 'font.ttf', measurer, ['ascii'],
+                                     **kwargs)
+        return f.getvalue()
+
+    def test_compact_json(self):
+        output = self._write_json(_FakeMeasurer())
+        self.assertNotIn(' ', output)
+        self.assertNotIn('\n', output)
+        self.assertEqual(
+            json.loads(output), {
+                'mean-character-length':
+                    sum(ord(c) for c in _CHARACTERS) / len(_CHARACTERS),
+                'character-lengths': {
+                    c: ord(c) for c in _CHARACTERS
+                },
+                'kerning-characters':
+                    'ATVabco',
+                'kerning-pairs': {
+                    'AV': 1.5,
+                    'VA': 1.5
+                },
+            })
+
+        measurer = precalculated_text_measurer.PrecalculatedTextMeasurer.from_json(
+            io.StringIO(output))
+        self.assertEqual(measurer.text_width('VAT'),
+                         ord('V') + ord('A') + ord('T') - 1.5)
+
+    def test_quantized(self):
+        o = json.loads(self._write_json(_FakeMeasurer(), units_per_pixel=64))
+        self.assertEqual(o['units-per-pixel'], 64)
+        self.assertEqual(o['character-lengths']['A'], ord('A') * 64)
+        self.assertEqual(o['kerning-pairs'], {'AV': 96, 'VA': 96})
+        self.assertIsInstance(o['mean-character-length'], int)
+
+    def test_kerning_classes(self):
+        o = json.loads(self._write_json(_FakeMeasurer(), kerning_classes=True))
+        self.assertEqual(
+            dict(width_table.KerningClasses.from_json(o['kerning-classes'])), {
+                'AV': 1.5,
+                'VA': 1.5
+            })
+        with self.assertRaisesRegex(ValueError, 'kerning classes'):
+            self._write_json(_FakeMeasurer(),
+                             kerning_classes=True,
+                             checkpoint=self._checkpoint)
+
+    def test_resume_json(self):
+        expected = self._write_json(_FakeMeasurer())
+        path = os.path.join(self._dir, 'widths.json')
+        with open(path, 'w+t', encoding='utf-8') as f:
+            with self.assertRaises(KeyboardInterrupt):
+                precalculate_text.write_json(f,
+                                             'font.ttf',
+                                             _FakeMeasurer(fail_after=30),
+                                             ['ascii'],
+                                             checkpoint=self._checkpoint)
+        self.assertTrue(self._checkpoint.exists())
+
+        measurer = _FakeMeasurer()
+        with open(path, 'r+t', encoding='utf-8') as f:
+            precalculate_text.write_json(f,
+                                         'font.ttf',
+                                         measurer, ['ascii'],
+                                         checkpoint=self._checkpoint)
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), expected)
+        self.assertFalse(self._checkpoint.exists())
+        # The characters and the unmeasured pairs were measured again.
+        self.assertLess(measurer.calls, len(_CHARACTERS) + 7 * 7)
+
+    def test_resume_table(self):
+        expected = io.BytesIO()
+        precalculate_text.write_table(expected, 'font.ttf', _FakeMeasurer(),
+                                      ['ascii'])
+
+        path = os.path.join(self._dir, 'widths.bin')
+        kernings_path = path + '.kernings'
+        for mode, measurer in [('w+b', _FakeMeasurer(fail_after=40)),
+                               ('r+b', _FakeMeasurer())]:
+            with open(path, mode) as f, open(kernings_path,
+                                             mode) as kernings_file:
+                try:
+                    precalculate_text.write_table(f,
+                                                  'font.ttf',
+                                                  measurer, ['ascii'],
+                                                  kernings_file=kernings_file,
+                                                  checkpoint=self._checkpoint)
+                except KeyboardInterrupt:
+                    pass
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), expected.getvalue())
+
+        table = width_table.load_table(path)
+        self.assertEqual(dict(table.pair_to_kern), {'AV': 1.5, 'VA': 1.5})
+        self.assertEqual(table.char_to_width['é'], ord('é'))
+
+    def test_checkpoint_from_different_run(self):
+        with self.assertRaises(KeyboardInterrupt):
+            self._write_json(_FakeMeasurer(fail_after=30),
+                             checkpoint=self._checkpoint)
+        with self.assertRaisesRegex(ValueError, 'different run'):
+            precalculate_text.write_json(io.StringIO(),
+                                         'font.ttf',
+                                         _FakeMeasurer(), ['cp1252'],
+                                         checkpoint=self._checkpoint)
+
+
+@unittest.skipUnless(os.path.exists(DEJA_VU_SANS_PATH),
+                     'DejaVu Sans not found, set DEJA_VU_SANS_PATH')
+class TestFontKerning(unittest.TestCase):
+
+    def test_glyph_pair_classes(self):
+        classes = [(list(first), list(second))
+                   for first, second in precalculate_text._glyph_pair_classes(
+                       ttLib.TTFont(DEJA_VU_SANS_PATH))]
+        self.assertIn((['A'], ['V']), classes)
+        # A GPOS class pair, kerning every "D"-like glyph with every "A"-like
+        # glyph.
+        self.assertIn(
+            (['D', 'Eth', 'Dcaron'],
+             ['A', 'Agrave', 'Aacute', 'Acircumflex', 'Atilde', 'Adieresis']),
+            classes)
+
+    def test_generate_kerning_pairs(self):
+        pairs = list(
+            precalculate_text.generate_kerning_pairs(
+                DEJA_VU_SANS_PATH,
+                precalculate_text.generate_supported_characters(
+                    DEJA_VU_SANS_PATH)))
+        self.assertEqual(len(pairs), 2727)
+        self.assertEqual(pairs, sorted(set(pairs)))
+        for pair in ['AV', 'VA', 'To', 'LT', 'Av', '-A']:
+            self.assertIn(pair, pairs)
+        # Expanded from classes.
+        for pair in ['DA', 'ÐÁ', 'ĎÄ', '-Ä']:
+            self.assertIn(pair, pairs)
+        for pair in ['HH', 'ab', 'AH']:
+            self.assertNotIn(pair, pairs)
+
+    def test_generate_kerning_pairs_of_characters(self):
+        self.assertEqual(
+            list(
+                precalculate_text.generate_kerning_pairs(
+                    DEJA_VU_SANS_PATH, 'DÐAHV')),
+            ['AA', 'AV', 'DA', 'DV', 'VA', 'ÐA', 'ÐV'])
+
+    def test_generate_overhanging_characters(self):
+        measurer = pil_text_measurer.PilMeasurer(DEJA_VU_SANS_PATH)
+        characters = 'Hao_í'
+        char_to_length = {c: measurer.text_width(c) for c in characters}
+        self.assertEqual(
+            list(
+                precalculate_text.generate_overhanging_characters(
+                    measurer, char_to_length, characters)), ['_', 'í'])
+
+
+if __name__ == '__main__':
+    unittest.main()
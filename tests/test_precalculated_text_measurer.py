@@ -13,9 +13,19 @@
 # limitations under the License.
 """Tests for PrecalculatedTextMeasurer."""
 
+import io
+import json
+import os
+import os.path
+import threading
 import unittest
+from unittest import mock
 
 from pybadges import precalculated_text_measurer
+from pybadges import width_table
+
+DEFAULT_WIDTHS_PATH = os.path.join(os.path.dirname(__file__), os.pardir,
+                                   'pybadges', 'default-widths.json')
 
 
 class TestPrecalculatedTextMeasurer(unittest.TestCase):
@@ -69,11 +79,116 @@ class TestPrecalculatedTextMeasurer(unittest.TestCase):
         text_width = measurer.text_width('Hello')
         self.assertAlmostEqual(text_width, 5 * 5 - 3.3)
 
+    def test_cumulative_widths(self):
+        measurer = precalculated_text_measurer.PrecalculatedTextMeasurer(
+            default_character_width=5,
+            char_to_width={'H': 1.2},
+            pair_to_kern={
+                'He': 3.3,
+                'll': 4.4
+            })
+
+        text = 'Hello'
+        self.assertEqual(measurer.cumulative_widths(text),
+                         [measurer.text_width(text[:i + 1]) for i in range(5)])
+        self.assertEqual(measurer.cumulative_widths(''), [])
+
+    def test_default_cumulative_widths(self):
+        measurer = (
+            precalculated_text_measurer.PrecalculatedTextMeasurer.default())
+        text = 'AVAWAY Всё прекрасно'
+        self.assertEqual(
+            measurer.cumulative_widths(text),
+            [measurer.text_width(text[:i + 1]) for i in range(len(text))])
+
+    def test_quantized(self):
+        measurer = precalculated_text_measurer.PrecalculatedTextMeasurer(
+            default_character_width=320,
+            char_to_width={'H': 77},
+            pair_to_kern={'He': 211},
+            units_per_pixel=64)
+        self.assertEqual(measurer.text_width('Hello'),
+                         (77 + 320 * 4 - 211) / 64)
+        self.assertEqual(measurer.cumulative_widths('He'),
+                         [77 / 64, (77 + 320 - 211) / 64])
+        self.assertNotEqual(
+            measurer.fingerprint(),
+            precalculated_text_measurer.PrecalculatedTextMeasurer(
+                320, {
+                    'H': 77
+                }, {
+                    'He': 211
+                }).fingerprint())
+
+    def test_quantized_default_within_bound(self):
+        with open(DEFAULT_WIDTHS_PATH, encoding='utf-8') as f:
+            o = json.load(f)
+        default = (
+            precalculated_text_measurer.PrecalculatedTextMeasurer.default())
+        for units_per_pixel in (16, 64, 256):
+            quantized_json = json.dumps(
+                width_table.quantize_json(o, units_per_pixel))
+            for compact in (False, True):
+                quantized = (precalculated_text_measurer.
+                             PrecalculatedTextMeasurer.from_json(
+                                 io.StringIO(quantized_json), compact))
+                for text in [
+                        'build', 'Hello World!', 'AVAWAY', 'v1.2.3-rc.4',
+                        'Всё прекрасно', '你好，世界',
+                        ''.join(o['character-lengths']),
+                        ''.join(o['kerning-pairs'])
+                ]:
+                    with self.subTest(units_per_pixel=units_per_pixel,
+                                      compact=compact,
+                                      text=text[:20]):
+                        # Each width and kerning is rounded by at most half a
+                        # unit.
+                        self.assertLessEqual(
+                            abs(
+                                quantized.text_width(text) -
+                                default.text_width(text)),
+                            len(text) / units_per_pixel)
+                        self.assertTrue((quantized.text_width(text) *
+                                         units_per_pixel).is_integer())
+
     def test_default_usable(self):
         measurer = (
             precalculated_text_measurer.PrecalculatedTextMeasurer.default())
         measurer.text_width('This is a long string of text')
 
+    def test_default_compact(self):
+        measurer_class = precalculated_text_measurer.PrecalculatedTextMeasurer
+        self.assertIsInstance(measurer_class.default()._char_to_width, dict)
+        with mock.patch.object(measurer_class, '_default_cache', None), \
+                mock.patch.dict(os.environ, {'PYBADGES_COMPACT_WIDTHS': '1'}):
+            compact = measurer_class.default()
+        self.assertIsInstance(compact._char_to_width,
+                              width_table.CharacterWidthRanges)
+        self.assertEqual(compact.fingerprint(),
+                         measurer_class.default().fingerprint())
+
+    def test_default_loaded_once(self):
+        measurer_class = precalculated_text_measurer.PrecalculatedTextMeasurer
+        barrier = threading.Barrier(8)
+        results = []
+
+        def load():
+            barrier.wait()
+            results.append(measurer_class.default())
+
+        with mock.patch.object(measurer_class, '_default_cache', None), \
+                mock.patch.object(measurer_class, '_load_default',
+                                  wraps=measurer_class._load_default) as m:
+            threads = [threading.Thread(target=load) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(r is results[0] for r in results))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,196 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for prepared."""
+
+import unittest
+import unittest.mock
+from xml.parsers import expat
+
+import pybadges
+from pybadges import prepared
+from pybadges import styles
+from pybadges.badge_spec import BadgeSpec
+from tests import test_pybadges
+
+PNG_DATA_URL = 'data:image/png;base64,' + test_pybadges.PNG_IMAGE_B64
+
+_RIGHT_TEXTS = [
+    '5', '1.2M', 'passing', 'a much longer right-hand text', '  padded  ',
+    'a < b & "c" \'d\'', 'tab\tand\r\nnewline', 'ünïcödé ✓'
+]
+_RIGHT_COLORS = ['green', '#e05d44', 'rgb(0, 128, 255)']
+
+
+class TestPreparedBadge(unittest.TestCase):
+
+    def assertRendersLikeBadge(self, spec):
+        prepared_badge = prepared.PreparedBadge(spec)
+        for right_text in _RIGHT_TEXTS:
+            for right_color in _RIGHT_COLORS:
+                with self.subTest(right_text=right_text,
+                                  right_color=right_color):
+                    self.assertEqual(
+                        prepared_badge.render(right_text=right_text,
+                                              right_color=right_color),
+                        pybadges.badge(
+                            spec.replace(right_text=right_text,
+                                         right_color=right_color)))
+
+    def test_same_as_badge(self):
+        for kwargs in [{}, {
+                'optimize': True
+        }, {
+                'logo': PNG_DATA_URL,
+                'left_link': 'https://example.com/?a=1&b=2',
+                'right_title': 'downloads this month'
+        }, {
+                'right_image': PNG_DATA_URL,
+                'whole_link': 'https://example.com/'
+        }, {
+                'center_image': PNG_DATA_URL,
+                'center_color': 'blue'
+        }, {
+                'max_right_text_width': 30
+        }, {
+                'max_right_text_width': 30,
+                'text_overflow': 'shrink'
+        }, {
+                'id_suffix': '-1'
+        }, {
+                'font_size': 90,
+                'max_right_text_width': 30,
+                'text_overflow': 'shrink'
+        }]:
+            for style in styles.names():
+                with self.subTest(style=style, **kwargs):
+                    self.assertRendersLikeBadge(
+                        BadgeSpec(left_text='downloads',
+                                  right_text='0',
+                                  style=style,
+                                  **kwargs))
+
+    def test_defaults(self):
+        spec = BadgeSpec(left_text='build',
+                         right_text='passing',
+                         right_color='green')
+        prepared_badge = prepared.PreparedBadge(spec)
+        self.assertIs(prepared_badge.spec, spec)
+        self.assertEqual(prepared_badge.render(), pybadges.badge(spec))
+        self.assertEqual(prepared_badge.render(right_text='failing'),
+                         pybadges.badge(spec.replace(right_text='failing')))
+        self.assertEqual(prepared_badge.render(right_color='red'),
+                         pybadges.badge(spec.replace(right_color='red')))
+
+    def test_no_right_text(self):
+        spec = BadgeSpec(left_text='build', right_text='passing')
+        prepared_badge = prepared.PreparedBadge(spec)
+        self.assertEqual(prepared_badge.render(right_text=''),
+                         pybadges.badge(spec.replace(right_text='')))
+        self.assertEqual(
+            prepared.PreparedBadge(spec.replace(right_text=None)).render(),
+            pybadges.badge(left_text='build'))
+
+    def test_whitespace_right_text(self):
+        for style in styles.names():
+            for optimize in (False, True):
+                spec = BadgeSpec(left_text='build',
+                                 right_text='passing',
+                                 style=style,
+                                 optimize=optimize)
+                prepared_badge = prepared.PreparedBadge(spec)
+                for right_text in [' ', '\n', '\t', ' \r\n ']:
+                    with self.subTest(style=style,
+                                      optimize=optimize,
+                                      right_text=right_text):
+                        self.assertEqual(
+                            prepared_badge.render(right_text=right_text),
+                            pybadges.badge(spec.replace(right_text=right_text)))
+
+    def test_invalid_right_text(self):
+        prepared_badge = prepared.PreparedBadge(
+            BadgeSpec(left_text='build', right_text='passing'))
+        # Rendered in full, which fails in the same way as badge().
+        with self.assertRaises(expat.ExpatError):
+            prepared_badge.render(right_text='\0')
+
+    def test_images_embedded_once(self):
+        spec = BadgeSpec(left_text='build',
+                         right_text='passing',
+                         logo='https://example.com/logo.png',
+                         embed_logo=True)
+        with unittest.mock.patch.object(pybadges,
+                                        '_embed_image',
+                                        return_value=PNG_DATA_URL) as embed:
+            prepared_badge = prepared.PreparedBadge(spec)
+            for right_text in _RIGHT_TEXTS:
+                self.assertEqual(
+                    prepared_badge.render(right_text=right_text),
+                    pybadges.badge(left_text='build',
+                                   right_text=right_text,
+                                   logo=PNG_DATA_URL))
+            # Templates that can't be prepared don't embed images again.
+            prepared_badge.render(right_text='')
+        embed.assert_called_once_with('https://example.com/logo.png')
+
+    def test_template_substituted(self):
+        prepared_badge = prepared.PreparedBadge(
+            BadgeSpec(left_text='build', right_text='passing'))
+        prepared_badge.render()
+        template = prepared_badge._templates[False]
+        self.assertIsNotNone(template)
+        self.assertEqual({slot.value for slot in template.slots},
+                         set(range(prepared._RIGHT_FONT_SIZE)) |
+                         {prepared._RIGHT_TEXT, prepared._RIGHT_COLOR})
+
+
+class TestUnpreparableTemplates(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(styles._styles.pop, 'custom', None)
+        self.addCleanup(styles._template_sources.pop, 'custom.svg', None)
+
+    def _register(self, source):
+        styles.register_style(styles.Style(name='custom',
+                                           template='custom.svg'),
+                              template_sources={'custom.svg': source})
+
+    def test_arithmetic(self):
+        self._register('<svg xmlns="http://www.w3.org/2000/svg" '
+                       'width="{{ layout.width + 1 }}">'
+                       '<text>{{ right_text }}</text></svg>')
+        spec = BadgeSpec(left_text='build',
+                         right_text='passing',
+                         style='custom')
+        prepared_badge = prepared.PreparedBadge(spec)
+        for right_text in _RIGHT_TEXTS:
+            self.assertEqual(
+                prepared_badge.render(right_text=right_text),
+                pybadges.badge(spec.replace(right_text=right_text)))
+        self.assertIsNone(prepared_badge._templates[False])
+
+    def test_partial_text(self):
+        self._register('<svg xmlns="http://www.w3.org/2000/svg">'
+                       '<text>{{ left_text }}: {{ right_text }}</text></svg>')
+        spec = BadgeSpec(left_text='build',
+                         right_text='passing',
+                         style='custom')
+        prepared_badge = prepared.PreparedBadge(spec)
+        self.assertEqual(prepared_badge.render(right_text=' failing '),
+                         pybadges.badge(spec.replace(right_text=' failing ')))
+        self.assertIsNone(prepared_badge._templates[False])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for profiling."""
+
+import os.path
+import pstats
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import pybadges
+from pybadges import profiling
+
+
+class TestPhaseTimer(unittest.TestCase):
+
+    def test_phases_accumulated(self):
+        now = [0.0]
+        timer = profiling.PhaseTimer(clock=lambda: now[0])
+        for _ in range(2):
+            with timer.phase(profiling.MEASURE):
+                now[0] += 1
+            with timer.phase(profiling.EMBED):
+                now[0] += 0.5
+        timer.renders = 2
+        self.assertEqual(timer.seconds, {
+            profiling.MEASURE: 2,
+            profiling.EMBED: 1
+        })
+
+        lines = timer.report().splitlines()
+        self.assertIn('2 render(s)', lines[0])
+        self.assertEqual(lines[2].split(),
+                         ['embed', '1000.000', '500.0000', '33.3'])
+        self.assertEqual(lines[3].split(),
+                         ['measure', '2000.000', '1000.0000', '66.7'])
+        self.assertEqual(lines[4].split(),
+                         ['total', '3000.000', '1500.0000', '100.0'])
+
+
+class TestRender(unittest.TestCase):
+
+    def test_render(self):
+        spec = pybadges.BadgeSpec(left_text='build', right_text='passing')
+        timer = profiling.PhaseTimer()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            profile_path = os.path.join(temp_dir, 'badge.prof')
+            svg = profiling.render(spec,
+                                   timer=timer,
+                                   repeat=3,
+                                   profile_path=profile_path)
+            stats = pstats.Stats(profile_path)
+        self.assertEqual(svg, pybadges.badge(spec))
+        self.assertEqual(timer.renders, 3)
+        self.assertEqual(set(timer.seconds), set(profiling.PHASES))
+        self.assertTrue(
+            any(function == '_render_element'
+                for _, _, function in stats.stats))
+
+    def test_cli(self):
+        result = subprocess.run([
+            sys.executable, '-m', 'pybadges', '--left-text=build',
+            '--right-text=passing', '--repeat=2', '--profile'
+        ],
+                                capture_output=True,
+                                check=True,
+                                encoding='utf-8')
+        self.assertEqual(
+            result.stdout,
+            pybadges.badge(left_text='build', right_text='passing'))
+        self.assertIn('2 render(s)', result.stderr)
+        for phase in profiling.PHASES:
+            self.assertIn(phase, result.stderr)
+
+    def test_cli_profile_output_without_profile(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            profile_path = os.path.join(temp_dir, 'badge.prof')
+            result = subprocess.run([
+                sys.executable, '-m', 'pybadges', '--left-text=build',
+                '--profile-output=' + profile_path
+            ],
+                                    capture_output=True,
+                                    encoding='utf-8')
+            self.assertEqual(result.returncode, 1)
+            self.assertIn('--profile-output', result.stderr)
+            self.assertFalse(os.path.exists(profile_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
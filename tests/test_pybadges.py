@@ -15,15 +15,19 @@
 
 import base64
 import doctest
+import io
 import json
 import os.path
 import pathlib
 import sys
 import tempfile
 import unittest
-import xmldiff.main
+import unittest.mock
+from xml.dom import minidom
 
 import pybadges
+from pybadges import styles
+from tests import golden
 from tests import image_server
 
 TEST_DIR = os.path.dirname(__file__)
@@ -34,6 +38,87 @@ PNG_IMAGE_B64 = (
 PNG_IMAGE = base64.b64decode(PNG_IMAGE_B64)
 
 
+def _painted_elements(svg):
+    """Returns what an SVG image paints, ignoring how the SVG expresses it.
+
+    Inherited attributes, scale() transforms and <use> references are
+    resolved and numbers are rounded so that two images that render
+    identically return the same (sorted) list of elements.
+    """
+    document = minidom.parseString(svg)
+    ids = {
+        e.getAttribute('id'): e
+        for e in document.getElementsByTagName('*')
+        if e.hasAttribute('id')
+    }
+
+    def canonical(element):
+        attributes = []
+        for name, value in sorted(element.attributes.items()):
+            if name != 'id':
+                try:
+                    value = round(float(value), 1)
+                except ValueError:
+                    pass
+                attributes.append((name, value))
+        return (element.tagName, tuple(attributes),
+                tuple(
+                    canonical(child)
+                    for child in element.childNodes
+                    if child.nodeType == minidom.Node.ELEMENT_NODE))
+
+    def definition(value):
+        if not value.startswith('url(#'):
+            return value
+        return repr(canonical(ids[value[len('url(#'):-1]]))
+
+    def text(element):
+        return ''.join(n.data
+                       for n in element.childNodes
+                       if n.nodeType == minidom.Node.TEXT_NODE)
+
+    painted = []
+
+    def visit(element, style, scale, dy, link):
+        tag = element.tagName
+        if tag in ('linearGradient', 'clipPath'):
+            return
+        style = dict(style)
+        for name in ('fill', 'fill-opacity', 'text-anchor', 'font-family',
+                     'font-size', 'clip-path'):
+            if element.hasAttribute(name):
+                style[name] = definition(element.getAttribute(name))
+        transform = element.getAttribute('transform')
+        if transform:
+            scale *= float(transform[len('scale('):-1])
+        if tag == 'a':
+            link = element.getAttribute('xlink:href')
+        if tag == 'use':
+            visit(ids[element.getAttribute('xlink:href')[1:]], style, scale,
+                  dy + float(element.getAttribute('y')), link)
+        elif tag in ('svg', 'g', 'a'):
+            for child in element.childNodes:
+                if child.nodeType == minidom.Node.ELEMENT_NODE:
+                    visit(child, style, scale, dy, link)
+        else:
+            description = dict(style, tag=tag, link=link)
+            description['font-size'] = round(
+                float(style.get('font-size', 0)) * scale, 1)
+            for name in ('x', 'y', 'width', 'height', 'textLength'):
+                value = float(element.getAttribute(name) or 0)
+                if name == 'y':
+                    value += dy
+                description[name] = round(value * scale, 1)
+            description['href'] = element.getAttribute('xlink:href')
+            description['text'] = text(element)
+            for title in element.getElementsByTagName('title'):
+                description['title'] = text(title)
+            painted.append(tuple(sorted(description.items())))
+
+    visit(document.documentElement, {}, 1, 0, None)
+    return sorted(painted, key=repr)
+
+
 class TestPybadgesBadge(unittest.TestCase):
     """Tests for pybadges.badge."""
 
@@ -49,6 +134,19 @@ class TestPybadgesBadge(unittest.TestCase):
     def test_docs(self):
         doctest.testmod(pybadges, optionflags=doctest.ELLIPSIS)
 
+    def test_warmup(self):
+        environment = pybadges._JINJA2_ENVIRONMENT
+        environment.cache.clear()
+        pybadges.warmup()
+        with unittest.mock.patch.object(environment.loader,
+                                        'load',
+                                        wraps=environment.loader.load) as load:
+            for name in styles.names():
+                style = styles.get(name)
+                for optimize in (False, True):
+                    environment.get_template(style.template_name(optimize))
+        load.assert_not_called()
+
     def test_whole_link_and_left_link(self):
         with self.assertRaises(ValueError):
             pybadges.badge(left_text='foo',
@@ -57,26 +155,22 @@ class TestPybadgesBadge(unittest.TestCase):
                            whole_link='http://example.com/')
 
     def test_changes(self):
-        with open(os.path.join(TEST_DIR, 'test-badges.json'), 'r') as f:
-            examples = json.load(f)
-
-        for example in examples:
-            self._image_server.fix_embedded_url_reference(example)
-            file_name = example.pop('file_name')
-            with self.subTest(example=file_name):
-                goldenpath = os.path.join(TEST_DIR, 'golden-images', file_name)
+        cases = golden.load_cases()
+        for case in cases:
+            self._image_server.fix_embedded_url_reference(case.kwargs)
 
-                with open(goldenpath, mode="r", encoding="utf-8") as f:
-                    golden_image = f.read()
-                pybadge_image = pybadges.badge(**example)
-
-                diff = xmldiff.main.diff_texts(golden_image, pybadge_image)
-                if diff:
+        for result in golden.run(cases):
+            with self.subTest(example=result.file_name):
+                if result.error:
+                    self.fail(result.error)
+                if result.differences:
+                    goldenpath = os.path.join(golden.GOLDEN_DIR,
+                                              result.file_name)
                     with tempfile.NamedTemporaryFile(mode="w+t",
                                                      encoding="utf-8",
                                                      delete=False,
                                                      suffix=".svg") as actual:
-                        actual.write(pybadge_image)
+                        actual.write(result.svg)
 
                     with tempfile.NamedTemporaryFile(mode="w+t",
                                                      delete=False,
@@ -90,7 +184,93 @@ class TestPybadgesBadge(unittest.TestCase):
                         </html>""" % (goldenpath, actual.name))
                     self.fail(
                         "images for %s differ:\n%s\nview with:\npython -m webbrowser %s"
-                        % (file_name, diff, html.name))
+                        % (result.file_name, '\n'.join(
+                            result.differences), html.name))
+
+    def test_optimize(self):
+        with open(os.path.join(TEST_DIR, 'test-badges.json'), 'r') as f:
+            examples = json.load(f)
+        examples.append(
+            dict(left_text='shrunk',
+                 right_text='a' * 50,
+                 max_right_text_width=40,
+                 text_overflow='shrink',
+                 id_suffix='-1'))
+
+        for example in examples:
+            file_name = example.pop('file_name', None)
+            if example.get('embed_logo'):
+                continue
+            with self.subTest(example=file_name or example):
+                image = pybadges.badge(**example)
+                optimized = pybadges.badge(optimize=True, **example)
+                self.assertEqual(_painted_elements(optimized),
+                                 _painted_elements(image))
+                self.assertLess(len(optimized), len(image) - 200)
+
+
+class TestBadgeBytes(unittest.TestCase):
+    """Tests for pybadges.badge_bytes and pybadges.write_badge."""
+
+    KWARGS = dict(left_text='Iñtërnâtiônàlizætiøn',
+                  right_text='<&>',
+                  right_color='green',
+                  whole_title='☃')
+
+    def test_badge_bytes(self):
+        self.assertEqual(pybadges.badge_bytes(**self.KWARGS),
+                         pybadges.badge(**self.KWARGS).encode('utf-8'))
+
+    def test_badge_bytes_spec(self):
+        spec = pybadges.BadgeSpec(**self.KWARGS)
+        self.assertEqual(pybadges.badge_bytes(spec),
+                         pybadges.badge(spec).encode('utf-8'))
+
+    def test_badge_bytes_invalid_arguments(self):
+        with self.assertRaises(TypeError):
+            pybadges.badge_bytes(left_text='build', right_txt='passing')
+        with self.assertRaises(TypeError):
+            pybadges.badge_bytes(pybadges.BadgeSpec(**self.KWARGS),
+                                 right_text='passing')
+
+    def test_write_badge(self):
+        f = io.BytesIO()
+        f.write(b'prefix')
+        pybadges.write_badge(f, **self.KWARGS)
+        self.assertFalse(f.closed)
+        self.assertEqual(f.getvalue(),
+                         b'prefix' + pybadges.badge_bytes(**self.KWARGS))
+
+    def test_write_badge_file(self):
+        with tempfile.TemporaryFile() as f:
+            pybadges.write_badge(f, **self.KWARGS)
+            f.seek(0)
+            self.assertEqual(f.read(), pybadges.badge_bytes(**self.KWARGS))
+
+
+class TestTemplateCache(unittest.TestCase):
+    """Tests for pybadges.set_template_cache_dir."""
+
+    def setUp(self):
+        super().setUp()
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self._cache_dir = os.path.join(temp_dir.name, 'cache')
+        pybadges._JINJA2_ENVIRONMENT.cache.clear()
+        self.addCleanup(pybadges._JINJA2_ENVIRONMENT.cache.clear)
+        self.addCleanup(pybadges.set_template_cache_dir, None)
+
+    def test_cache_written_and_reused(self):
+        pybadges.set_template_cache_dir(self._cache_dir)
+        expected = pybadges.badge(left_text='foo', right_text='bar')
+        self.assertEqual(len(os.listdir(self._cache_dir)), 1)
+
+        pybadges._JINJA2_ENVIRONMENT.cache.clear()
+        with unittest.mock.patch.object(pybadges._JINJA2_ENVIRONMENT,
+                                        'compile') as compile:
+            self.assertEqual(pybadges.badge(left_text='foo', right_text='bar'),
+                             expected)
+        compile.assert_not_called()
 
 
 class TestEmbedImage(unittest.TestCase):
@@ -0,0 +1,237 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for render_cache."""
+
+import os.path
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import pybadges
+from pybadges import precalculated_text_measurer
+from pybadges import logos
+from pybadges import render_cache
+from pybadges import styles
+from pybadges.badge_spec import BadgeSpec
+
+
+class TestRenderCache(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self._path = os.path.join(temp_dir.name, 'cache.sqlite')
+
+    def _cache(self, **kwargs):
+        cache = render_cache.RenderCache(self._path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_badge_cached(self):
+        cache = self._cache()
+        expected = pybadges.badge(left_text='build', right_text='passing')
+        with mock.patch.object(pybadges, 'badge',
+                               wraps=pybadges.badge) as badge:
+            self.assertEqual(
+                cache.badge(left_text='build', right_text='passing'), expected)
+            self.assertEqual(
+                cache.badge(left_text='build', right_text='passing'), expected)
+        self.assertEqual(badge.call_count, 1)
+        self.assertEqual(cache.stats().entries, 1)
+
+    def test_badge_bytes_cached(self):
+        cache = self._cache()
+        spec = BadgeSpec(left_text='bûild', right_text='passing')
+        expected = pybadges.badge(spec)
+        with mock.patch.object(pybadges,
+                               'badge_bytes',
+                               wraps=pybadges.badge_bytes) as badge_bytes:
+            self.assertEqual(cache.badge_bytes(spec), expected.encode('utf-8'))
+            self.assertEqual(cache.badge_bytes(spec), expected.encode('utf-8'))
+        self.assertEqual(badge_bytes.call_count, 1)
+        self.assertEqual(cache.badge(spec), expected)
+
+    def test_invalid_arguments(self):
+        cache = self._cache()
+        spec = BadgeSpec(left_text='build', right_text='passing')
+        for args, kwargs in [((spec,), {
+                'right_text': 'failing'
+        }), ((), {
+                'left_text': 'build',
+                'measurer': None,
+                'colour': 'red'
+        }),
+                             ((spec,), {
+                                 'measurer':
+                                     precalculated_text_measurer.
+                                     PrecalculatedTextMeasurer.default()
+                             })]:
+            with self.subTest(args=args, kwargs=kwargs):
+                with self.assertRaises(TypeError):
+                    cache.badge(*args, **kwargs)
+                with self.assertRaises(TypeError):
+                    cache.badge_bytes(*args, **kwargs)
+        self.assertEqual(cache.stats().entries, 0)
+
+    def test_shared_between_caches(self):
+        spec = BadgeSpec(left_text='build', right_text='passing')
+        self._cache().put(spec, '<svg/>')
+        self.assertEqual(self._cache().get(spec), '<svg/>')
+
+    def test_normalized_key(self):
+        cache = self._cache()
+        cache.put(BadgeSpec(left_text='build', right_color='green'), '<svg/>')
+        self.assertEqual(
+            cache.get(BadgeSpec(left_text='build', right_color='#97ca00')),
+            '<svg/>')
+        self.assertIsNone(
+            cache.get(BadgeSpec(left_text='build', right_color='red')))
+
+    def test_measurer_in_key(self):
+        spec = BadgeSpec(left_text='build')
+        self._cache().put(spec, '<svg/>')
+        measurer = precalculated_text_measurer.PrecalculatedTextMeasurer(
+            5, {}, {})
+        self.assertIsNone(self._cache(measurer=measurer).get(spec))
+
+    def test_version_in_key(self):
+        spec = BadgeSpec(left_text='build')
+        self._cache().put(spec, '<svg/>')
+        with mock.patch.object(render_cache, '__version__', '0.0.0'):
+            self.assertIsNone(self._cache().get(spec))
+
+    def test_template_in_key(self):
+        spec = BadgeSpec(left_text='build')
+        self._cache().put(spec, '<svg/>')
+        with mock.patch.object(pybadges,
+                               '_template_fingerprint',
+                               return_value='changed'):
+            self.assertIsNone(self._cache().get(spec))
+
+    def test_style_in_key(self):
+        spec = BadgeSpec(left_text='build')
+        self._cache().put(spec, '<svg/>')
+        style = styles.get(spec.style)
+        with mock.patch.dict(styles._styles,
+                             {spec.style: style._replace(corner_radius=0)}):
+            self.assertIsNone(self._cache().get(spec))
+
+    def test_logo_in_key(self):
+        self.addCleanup(logos._logos.pop, 'cache-test', None)
+        logos.register_logo('cache-test', 'data:image/png;base64,AAAA')
+        spec = BadgeSpec(left_text='build', logo='cache-test')
+        self._cache().put(spec, '<svg/>')
+        self.assertEqual(self._cache().get(spec), '<svg/>')
+        logos.register_logo('cache-test', 'data:image/png;base64,BBBB')
+        self.assertIsNone(self._cache().get(spec))
+
+    def test_last_used_throttled(self):
+        cache = self._cache(touch_interval=60)
+        spec = BadgeSpec(left_text='build')
+        connection = sqlite3.connect(self._path)
+        self.addCleanup(connection.close)
+
+        def last_used():
+            return connection.execute(
+                'SELECT last_used FROM badges').fetchone()[0]
+
+        with mock.patch('time.time', side_effect=[100, 159, 160]):
+            cache.put(spec, '<svg/>')
+            cache.get(spec)
+            self.assertEqual(last_used(), 100)
+            cache.get(spec)
+            self.assertEqual(last_used(), 160)
+
+    def test_lru_eviction(self):
+        cache = self._cache(max_bytes=30, touch_interval=0)
+        a = BadgeSpec(left_text='a')
+        b = BadgeSpec(left_text='b')
+        c = BadgeSpec(left_text='c')
+        with mock.patch('time.time', side_effect=range(100)):
+            cache.put(a, '<svg>aaaa</svg>')
+            cache.put(b, '<svg>b</svg>')
+            cache.get(a)
+            cache.put(c, '<svg>c</svg>')
+        self.assertIsNotNone(cache.get(a))
+        self.assertIsNone(cache.get(b))
+        self.assertIsNotNone(cache.get(c))
+
+    def test_prune_and_clear(self):
+        cache = self._cache()
+        for text in 'abc':
+            cache.put(BadgeSpec(left_text=text), '<svg>' + text + '</svg>')
+        self.assertEqual(cache.stats(), render_cache.CacheStats(3, 36))
+        self.assertEqual(cache.prune(24), 1)
+        self.assertEqual(cache.stats().entries, 2)
+        cache.clear()
+        self.assertEqual(cache.stats(), render_cache.CacheStats(0, 0))
+
+    def test_total_size_tracked(self):
+        cache = self._cache()
+        spec = BadgeSpec(left_text='a')
+        cache.put(spec, '<svg>a</svg>')
+        cache.put(spec, '<svg>aaaa</svg>')
+        cache.put(BadgeSpec(left_text='b'), '<svg>b</svg>')
+        self.assertEqual(cache.stats(), render_cache.CacheStats(2, 27))
+        cache.prune(20)
+        self.assertEqual(cache.stats(), render_cache.CacheStats(1, 12))
+
+    def test_total_size_of_existing_database(self):
+        connection = sqlite3.connect(self._path)
+        connection.executescript("""
+            CREATE TABLE badges (key TEXT PRIMARY KEY, svg BLOB NOT NULL,
+                                 size INTEGER NOT NULL, last_used REAL NOT NULL);
+            INSERT INTO badges VALUES ('a', x'00', 10, 1), ('b', x'00', 20, 2);
+        """)
+        connection.close()
+        self.assertEqual(self._cache().stats(), render_cache.CacheStats(2, 30))
+
+    def test_eviction_in_batches(self):
+        cache = self._cache(max_bytes=12 * 40, touch_interval=0)
+        with mock.patch('time.time', side_effect=range(100)):
+            for i in range(40):
+                cache.put(BadgeSpec(left_text=str(i)), '<svg>x</svg>')
+            self.assertEqual(cache.prune(12 * 5), 35)
+        self.assertEqual(cache.stats(), render_cache.CacheStats(5, 60))
+        for i in range(40):
+            self.assertEqual(
+                cache.get(BadgeSpec(left_text=str(i))) is not None, i >= 35)
+
+    def test_concurrent_writers(self):
+        cache = self._cache()
+        errors = []
+
+        def render(n):
+            try:
+                for i in range(10):
+                    cache.badge(left_text=str(i), right_text=str(n))
+            except Exception as e:  # pylint: disable=broad-except
+                errors.append(e)
+            finally:
+                cache.close()
+
+        threads = [threading.Thread(target=render, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(cache.stats().entries, 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for styles."""
+
+import unittest
+from xml.dom import minidom
+
+import pybadges
+from pybadges import layout
+from pybadges import styles
+from tests import test_pybadges
+
+_BUILT_IN_STYLES = ['flat', 'flat-square', 'for-the-badge', 'plastic']
+
+_CUSTOM_TEMPLATE = ('<svg xmlns="http://www.w3.org/2000/svg" '
+                    'width="{{ layout.width }}" height="{{ layout.height }}">'
+                    '<text>{{ left_text }}|{{ right_text }}</text></svg>')
+
+
+class TestStyles(unittest.TestCase):
+
+    def test_built_in_styles(self):
+        self.assertEqual(styles.names(), _BUILT_IN_STYLES)
+        self.assertEqual(styles.get(styles.DEFAULT_STYLE).name, 'flat')
+
+    def test_unknown_style(self):
+        with self.assertRaisesRegex(ValueError, 'unknown style "fancy"'):
+            styles.get('fancy')
+        with self.assertRaisesRegex(ValueError, 'unknown style "fancy"'):
+            pybadges.badge(left_text='build', style='fancy')
+
+    def test_default_style_is_flat(self):
+        self.assertEqual(
+            pybadges.badge(left_text='build', right_text='passing'),
+            pybadges.badge(left_text='build',
+                           right_text='passing',
+                           style='flat'))
+
+    def test_geometry(self):
+        for name in _BUILT_IN_STYLES:
+            with self.subTest(style=name):
+                style = styles.get(name)
+                svg = pybadges.badge(left_text='build',
+                                     right_text='passing',
+                                     logo='data:image/png;base64,',
+                                     style=name)
+                root = minidom.parseString(svg).documentElement
+                self.assertEqual(root.getAttribute('height'),
+                                 str(style.geometry.height))
+                size = pybadges.badge_size(left_text='build',
+                                           right_text='passing',
+                                           logo='data:image/png;base64,',
+                                           style=name)
+                self.assertEqual(root.getAttribute('width'), str(size.width))
+                image = root.getElementsByTagName('image')[0]
+                self.assertEqual(
+                    int(image.getAttribute('y')) * 2 +
+                    int(image.getAttribute('height')), style.geometry.height)
+
+    def test_for_the_badge(self):
+        svg = pybadges.badge(left_text='build',
+                             right_text='passing',
+                             style='for-the-badge')
+        texts = [
+            t.firstChild.data for t in minidom.parseString(
+                svg).documentElement.getElementsByTagName('text')
+        ]
+        self.assertEqual(texts, ['BUILD', 'PASSING'])
+        self.assertIn('font-weight="bold"', svg)
+        self.assertNotIn('fill-opacity', svg)
+
+        # Letter spacing and margins make the badge wider.
+        self.assertGreater(
+            pybadges.badge_size(left_text='build', style='for-the-badge').width,
+            pybadges.badge_size(left_text='BUILD').width + 5 * 1.25)
+
+    def test_letter_spacing_truncation(self):
+        svg = pybadges.badge(left_text='build',
+                             right_text='a very long description',
+                             max_right_text_width=80,
+                             style='for-the-badge')
+        size = pybadges.badge_size(left_text='build',
+                                   right_text='a very long description',
+                                   max_right_text_width=80,
+                                   style='for-the-badge')
+        self.assertIn('…', svg)
+        self.assertLessEqual(size.right_text_length, 800)
+
+    def test_optimize(self):
+        for name in _BUILT_IN_STYLES:
+            with self.subTest(style=name):
+                kwargs = dict(left_text='build',
+                              right_text='passing',
+                              right_link='https://example.com/',
+                              style=name)
+                self.assertEqual(
+                    test_pybadges._painted_elements(
+                        pybadges.badge(optimize=True, **kwargs)),
+                    test_pybadges._painted_elements(pybadges.badge(**kwargs)))
+
+    def test_spec(self):
+        spec = pybadges.BadgeSpec(left_text='build', style='plastic')
+        self.assertNotEqual(spec, spec.replace(style='flat'))
+        self.assertEqual(pybadges.badge(spec),
+                         pybadges.badge(left_text='build', style='plastic'))
+
+
+class TestRegisterStyle(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(styles._styles.pop, 'tall', None)
+
+    def test_reuse_built_in_template(self):
+        styles.register_style(
+            styles.Style(name='tall',
+                         optimized_template=styles.OPTIMIZED_TEMPLATE,
+                         geometry=layout.Geometry(height=30),
+                         text_y=210))
+        for optimize in (False, True):
+            svg = pybadges.badge(left_text='build',
+                                 right_text='passing',
+                                 style='tall',
+                                 optimize=optimize)
+            self.assertIn('height="30"', svg)
+
+    def test_custom_template(self):
+        self.addCleanup(styles._template_sources.pop, 'tall.svg', None)
+        styles.register_style(styles.Style(name='tall',
+                                           template='tall.svg',
+                                           geometry=layout.Geometry(height=30)),
+                              template_sources={'tall.svg': _CUSTOM_TEMPLATE})
+        size = pybadges.badge_size(left_text='build',
+                                   right_text='passing',
+                                   style='tall')
+        for optimize in (False, True):
+            self.assertEqual(
+                pybadges.badge(left_text='build',
+                               right_text='passing',
+                               style='tall',
+                               optimize=optimize),
+                '<svg xmlns="http://www.w3.org/2000/svg" width="{0}" '
+                'height="30"><text>build|passing</text></svg>'.format(
+                    size.width))
+
+        # Registering the same template again is allowed...
+        styles.register_style(styles.Style(name='tall', template='tall.svg'),
+                              template_sources={'tall.svg': _CUSTOM_TEMPLATE})
+        # ...but changing it is not.
+        with self.assertRaisesRegex(ValueError, 'already registered'):
+            styles.register_style(styles.Style(name='tall',
+                                               template='tall.svg'),
+                                  template_sources={'tall.svg': '<svg/>'})
+        with self.assertRaisesRegex(ValueError, 'already registered'):
+            styles.register_style(
+                styles.Style(name='tall'),
+                template_sources={styles.FULL_TEMPLATE: '<svg/>'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for text_fitting."""
+
+import unittest
+
+import pybadges
+from pybadges import precalculated_text_measurer
+from pybadges import text_fitting
+
+
+class TestTextFitting(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._measurer = precalculated_text_measurer.PrecalculatedTextMeasurer(
+            default_character_width=10,
+            char_to_width={
+                ' ': 5,
+                text_fitting.ELLIPSIS: 8
+            },
+            pair_to_kern={})
+
+    def test_truncate_fits(self):
+        self.assertEqual(text_fitting.truncate(self._measurer, 'abc', 30),
+                         text_fitting.FittedText('abc', 30))
+
+    def test_truncate(self):
+        self.assertEqual(text_fitting.truncate(self._measurer, 'abcdef', 40),
+                         text_fitting.FittedText('abc…', 38))
+
+    def test_truncate_strips_space(self):
+        self.assertEqual(text_fitting.truncate(self._measurer, 'ab cdef', 35),
+                         text_fitting.FittedText('ab…', 28))
+
+    def test_truncate_to_ellipsis(self):
+        self.assertEqual(text_fitting.truncate(self._measurer, 'abcdef', 5),
+                         text_fitting.FittedText('…', 8))
+
+    def test_shrink(self):
+        self.assertEqual(text_fitting.shrink(self._measurer, 'abcd', 20),
+                         text_fitting.FittedText('abcd', 20, 0.5))
+
+    def test_fit_without_max_width(self):
+        self.assertEqual(
+            text_fitting.fit(self._measurer, 'abcdef', None,
+                             text_fitting.TEXT_OVERFLOW_SHRINK),
+            text_fitting.FittedText('abcdef', 60))
+
+    def test_badge_truncated(self):
+        svg = pybadges.badge(left_text='branch',
+                             right_text='feature/some-really-long-branch-name',
+                             max_right_text_width=60)
+        self.assertIn('>feature/…</text>', svg)
+
+    def test_badge_shrunk(self):
+        svg = pybadges.badge(left_text='branch',
+                             right_text='feature/some-really-long-branch-name',
+                             max_right_text_width=60,
+                             text_overflow='shrink')
+        self.assertIn('textLength="600.0"', svg)
+        self.assertIn('font-size="30.9', svg)
+
+    def test_badge_invalid_text_overflow(self):
+        with self.assertRaisesRegex(ValueError, 'text_overflow'):
+            pybadges.badge(left_text='branch', text_overflow='clip')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,259 @@
+# Copyright 2026 The pybadge Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for width_table."""
+
+import io
+import json
+import os.path
+import sys
+import tempfile
+import tracemalloc
+import unittest
+import unittest.mock
+
+from pybadges import precalculated_text_measurer
+from pybadges import width_table
+
+DEFAULT_WIDTHS_PATH = os.path.join(os.path.dirname(__file__), os.pardir,
+                                   'pybadges', 'default-widths.json')
+
+SAMPLE_TEXT = [
+    '', 'build', 'passing', 'Hello World!', 'AVAWAY', 'v1.2.3-rc.4',
+    'Всё прекрасно', 'هذا علم', '你好，世界', '\U0001F600 emoji'
+]
+
+
+class TestWidthTable(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self._table_path = os.path.join(temp_dir.name, 'widths.bin')
+
+    def _write_table(self, default_character_width, char_to_width,
+                     pair_to_kern):
+        with open(self._table_path, 'wb') as f:
+            width_table.write_table(f, default_character_width, char_to_width,
+                                    pair_to_kern)
+
+    def test_round_trip(self):
+        self._write_table(5.5, {'a': 1, 'b': 2.25}, {'ab': 0.5, 'ba': -1})
+        table = width_table.load_table(self._table_path)
+        self.assertEqual(table.default_character_width, 5.5)
+        self.assertEqual(dict(table.char_to_width), {'a': 1, 'b': 2.25})
+        self.assertEqual(dict(table.pair_to_kern), {'ab': 0.5, 'ba': -1})
+
+    def test_missing_keys(self):
+        self._write_table(5, {'b': 1}, {'bc': 2})
+        table = width_table.load_table(self._table_path)
+        self.assertIsNone(table.char_to_width.get('a'))
+        self.assertIsNone(table.char_to_width.get('z'))
+        self.assertIsNone(table.char_to_width.get('bb'))
+        self.assertIsNone(table.pair_to_kern.get('c'))
+        self.assertIsNone(table.pair_to_kern.get('cb'))
+
+    def test_empty(self):
+        self._write_table(5, {}, {})
+        measurer = (precalculated_text_measurer.PrecalculatedTextMeasurer.
+                    from_table_file(self._table_path))
+        self.assertEqual(measurer.text_width('abc'), 15)
+
+    def test_not_a_table(self):
+        with open(self._table_path, 'wb') as f:
+            f.write(b'{"character-lengths": {}}')
+        with self.assertRaisesRegex(ValueError, 'not a width table'):
+            width_table.load_table(self._table_path)
+
+    def test_quantized_json_converted(self):
+        with open(DEFAULT_WIDTHS_PATH, encoding='utf-8') as f:
+            o = json.load(f)
+        json_path = os.path.join(os.path.dirname(self._table_path),
+                                 'widths.json')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(width_table.quantize_json(o, 64), f)
+        with unittest.mock.patch.object(sys, 'argv', [
+                'width_table', '--input-json-file', json_path,
+                '--output-table-file', self._table_path
+        ]):
+            width_table.main()
+
+        self.assertEqual(
+            width_table.load_table(self._table_path).units_per_pixel, 64)
+        mapped = (precalculated_text_measurer.PrecalculatedTextMeasurer.
+                  from_table_file(self._table_path))
+        with open(json_path, encoding='utf-8') as f:
+            quantized = (precalculated_text_measurer.PrecalculatedTextMeasurer.
+                         from_json(f))
+        for text in SAMPLE_TEXT:
+            self.assertEqual(mapped.text_width(text),
+                             quantized.text_width(text))
+        self.assertAlmostEqual(
+            mapped.text_width('build'),
+            precalculated_text_measurer.PrecalculatedTextMeasurer.default(
+            ).text_width('build'),
+            delta=5 / 64)
+
+    def test_version_1(self):
+        with open(self._table_path, 'wb') as f:
+            f.write(
+                width_table._VERSION_1_HEADER.pack(width_table._MAGIC, 1, 5.5,
+                                                   0, 0))
+        table = width_table.load_table(self._table_path)
+        self.assertEqual(table.default_character_width, 5.5)
+        self.assertIsNone(table.units_per_pixel)
+
+    def test_table_writer_resume(self):
+        kernings_path = self._table_path + '.kernings'
+        with open(self._table_path, 'w+b') as f, \
+                open(kernings_path, 'w+b') as kernings_file:
+            writer = width_table.TableWriter(f, kernings_file)
+            writer.begin(5, {'b': 2, 'a': 1})
+            writer.add('ab', 0.5)
+            state = writer.state()
+            # Written after the state, so discarded when resumed.
+            writer.add('ba', 7)
+        with open(self._table_path, 'r+b') as f, \
+                open(kernings_path, 'r+b') as kernings_file:
+            writer = width_table.TableWriter(f, kernings_file)
+            writer.resume(json.loads(json.dumps(state)))
+            with self.assertRaisesRegex(ValueError, 'increasing order'):
+                writer.add('aa', 1)
+            writer.add('ba', -1)
+            writer.close()
+
+        table = width_table.load_table(self._table_path)
+        self.assertEqual(table.default_character_width, 5)
+        self.assertEqual(dict(table.char_to_width), {'a': 1, 'b': 2})
+        self.assertEqual(dict(table.pair_to_kern), {'ab': 0.5, 'ba': -1})
+
+    def test_matches_json_measurer(self):
+        with open(DEFAULT_WIDTHS_PATH, encoding='utf-8') as f:
+            o = json.load(f)
+        self._write_table(o['mean-character-length'], o['character-lengths'],
+                          o['kerning-pairs'])
+
+        mapped = (precalculated_text_measurer.PrecalculatedTextMeasurer.
+                  from_table_file(self._table_path))
+        default = (
+            precalculated_text_measurer.PrecalculatedTextMeasurer.default())
+        for text in SAMPLE_TEXT + [
+                ''.join(o['character-lengths']), ''.join(o['kerning-pairs'])
+        ]:
+            with self.subTest(text=text[:20]):
+                self.assertEqual(mapped.text_width(text),
+                                 default.text_width(text))
+
+
+class TestCompactTables(unittest.TestCase):
+
+    def test_character_width_ranges(self):
+        char_to_width = {'a': 1, 'b': 1, 'c': 2.5, 'e': 1, 'f': 1.0, 'é': 3}
+        widths = width_table.CharacterWidthRanges(char_to_width)
+        self.assertEqual(dict(widths), char_to_width)
+        self.assertEqual(len(widths), len(char_to_width))
+        self.assertIs(type(widths['f']), float)
+        self.assertIsNone(widths.get('d'))
+        self.assertIsNone(widths.get('ab'))
+        self.assertEqual(widths.get('\u20ac', 7), 7)
+        with self.assertRaises(KeyError):
+            widths['d']  # pylint: disable=pointless-statement
+
+    def test_kerning_pairs_from_mapping(self):
+        pair_to_kern = {'AV': 2, 'ab': -1, 'Ая': 3}
+        pairs = width_table.KerningPairs.from_mapping(pair_to_kern)
+        self.assertEqual(dict(pairs), pair_to_kern)
+        self.assertIsNone(pairs.get('VA'))
+        self.assertIsNone(pairs.get('A'))
+        self.assertEqual(pairs.get('zz', 0), 0)
+
+    def test_kerning_classes_from_mapping(self):
+        pair_to_kern = {
+            'AV': 2,
+            'ÀV': 2,
+            'AW': 2.5,
+            'ÀW': 2.5,
+            'To': 1,
+            'Ая': 3,
+            'Tp': 0
+        }
+        classes = width_table.KerningClasses.from_mapping(pair_to_kern)
+        del pair_to_kern['Tp']
+        self.assertEqual(dict(classes), pair_to_kern)
+        self.assertEqual(len(classes), len(pair_to_kern))
+        o = classes.to_json()
+        self.assertEqual(o['first-classes'], ['AÀ', 'T', 'А'])
+        self.assertEqual(o['second-classes'], ['V', 'W', 'o', 'я'])
+        self.assertIsNone(classes.get('Tp'))
+        self.assertIsNone(classes.get('VA'))
+        self.assertIsNone(classes.get('A'))
+        self.assertEqual(classes.get('zz', 0), 0)
+        with self.assertRaises(KeyError):
+            classes['Ao']  # pylint: disable=pointless-statement
+
+        round_trip = width_table.KerningClasses.from_json(
+            json.loads(json.dumps(o)))
+        self.assertEqual(dict(round_trip), pair_to_kern)
+
+    def test_kerning_classes_shape(self):
+        with self.assertRaisesRegex(ValueError, 'a row for each first class'):
+            width_table.KerningClasses(['A'], ['V', 'W'], [[1]])
+
+    def test_kerning_classes_match_default(self):
+        with open(DEFAULT_WIDTHS_PATH, encoding='utf-8') as f:
+            o = json.load(f)
+        pairs = o.pop('kerning-pairs')
+        classes = width_table.KerningClasses.from_mapping(pairs)
+        self.assertEqual(dict(classes), pairs)
+        self.assertLess(
+            len(json.dumps(classes.to_json())) * 2, len(json.dumps(pairs)))
+
+        o['kerning-classes'] = classes.to_json()
+        measurer_class = precalculated_text_measurer.PrecalculatedTextMeasurer
+        from_classes = measurer_class.from_json(io.StringIO(json.dumps(o)))
+        default = measurer_class.default()
+        self.assertEqual(from_classes.fingerprint(), default.fingerprint())
+        for text in SAMPLE_TEXT + list(pairs):
+            self.assertEqual(from_classes.text_width(text),
+                             default.text_width(text), text)
+
+    def _load_default_json(self, compact):
+        with open(DEFAULT_WIDTHS_PATH, encoding='utf-8') as f:
+            data = f.read()
+        tracemalloc.start()
+        try:
+            measurer = (
+                precalculated_text_measurer.PrecalculatedTextMeasurer.from_json(
+                    io.StringIO(data), compact=compact))
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return measurer, size
+
+    def test_compact_matches_json_measurer(self):
+        with open(DEFAULT_WIDTHS_PATH, encoding='utf-8') as f:
+            o = json.load(f)
+        compact, compact_size = self._load_default_json(compact=True)
+        loose, loose_size = self._load_default_json(compact=False)
+
+        self.assertLess(compact_size * 5, loose_size)
+        self.assertEqual(compact.fingerprint(), loose.fingerprint())
+        for text in SAMPLE_TEXT + list(o['character-lengths']) + list(
+                o['kerning-pairs']):
+            self.assertEqual(compact.text_width(text), loose.text_width(text),
+                             text)
+
+
+if __name__ == '__main__':
+    unittest.main()